@@ -32,9 +32,11 @@ from paasta_tools import kubernetes_tools
 from paasta_tools import yaml_tools as yaml
 from paasta_tools.api import settings
 from paasta_tools.api.tweens import auth
+from paasta_tools.api.tweens import metrics
 from paasta_tools.api.tweens import profiling
 from paasta_tools.api.tweens import request_logger
 from paasta_tools.utils import load_system_paasta_config
+from paasta_tools.utils import watch_system_paasta_config
 
 try:
     import clog
@@ -110,6 +112,8 @@ def make_app(global_config=None):
             "pyramid_swagger.skip_validation": [
                 "/(static)\\b",
                 "/(status)\\b",
+                "/(metrics)\\b",
+                "/(profiling)\\b",
                 "/(swagger.json)\\b",
             ],
             "pyramid_swagger.swagger_versions": ["2.0"],
@@ -119,6 +123,7 @@ def make_app(global_config=None):
     config.include("pyramid_swagger")
     config.include(request_logger)
     config.include(auth)
+    config.include(metrics)
 
     config.add_route(
         "flink.service.instance.jobs", "/v1/flink/{service}/{instance}/jobs"
@@ -160,6 +165,10 @@ def make_app(global_config=None):
         "service.instance.replica.restart",
         "/v1/services/{service}/{instance}/replicas/{replica_name}/restart",
     )
+    config.add_route(
+        "service.instance.replica.container.logs",
+        "/v1/services/{service}/{instance}/replicas/{replica_name}/containers/{container_name}/logs",
+    )
     config.add_route(
         "service.instance.delay", "/v1/services/{service}/{instance}/delay"
     )
@@ -228,6 +237,8 @@ def make_app(global_config=None):
     )
     config.add_route("version", "/v1/version")
     config.add_route("deploy_queue.list", "/v1/deploy_queue")
+    config.add_route("metrics", "/metrics")
+    config.add_route("profiling.stacks", "/profiling/stacks")
     config.scan()
     return CORS(
         config.make_wsgi_app(), headers="*", methods="*", maxage="180", origin="*"
@@ -259,6 +270,7 @@ def setup_paasta_api():
     # pyinotify is a better solution than turning off file caching completely
     service_configuration_lib.disable_yaml_cache()
 
+    watch_system_paasta_config()
     settings.system_paasta_config = load_system_paasta_config()
     if os.environ.get("PAASTA_API_CLUSTER"):
         settings.cluster = os.environ.get("PAASTA_API_CLUSTER")
@@ -267,6 +279,7 @@ def setup_paasta_api():
 
     try:
         settings.kubernetes_client = kubernetes_tools.KubeClient()
+        metrics.instrument_kube_client(settings.kubernetes_client)
     except FileNotFoundError:
         log.info("Kubernetes not found")
         settings.kubernetes_client = None
@@ -15,10 +15,14 @@
 import json
 import logging
 import os
+import threading
+from concurrent.futures import Future
+from typing import Dict
 from typing import NamedTuple
 from typing import Optional
+from typing import Tuple
 
-import cachetools.func
+import cachetools
 import pyramid
 import requests
 from pyramid.config import Configurator
@@ -32,6 +36,9 @@ from paasta_tools.api.tweens import Handler
 logger = logging.getLogger(__name__)
 AUTH_CACHE_SIZE = 50000
 AUTH_CACHE_TTL = 30 * 60
+# denials are cached for less time, so that e.g. someone who was just granted
+# access doesn't have to wait half an hour for it to take effect
+AUTH_NEGATIVE_CACHE_TTL = 60
 
 
 class AuthorizationOutcome(NamedTuple):
@@ -39,6 +46,16 @@ class AuthorizationOutcome(NamedTuple):
     reason: str
 
 
+# (path, token, method, service)
+AuthCacheKey = Tuple[str, str, str, Optional[str]]
+
+
+def _auth_cache_ttu(
+    key: AuthCacheKey, outcome: AuthorizationOutcome, now: float
+) -> float:
+    return now + (AUTH_CACHE_TTL if outcome.authorized else AUTH_NEGATIVE_CACHE_TTL)
+
+
 class AuthTweenFactory:
     def __init__(self, handler: Handler, registry: Registry) -> None:
         self.handler = handler
@@ -47,6 +64,25 @@ class AuthTweenFactory:
         self.endpoint = os.getenv("PAASTA_API_AUTH_ENDPOINT")
         self.session = requests.Session()
 
+        self.cache: cachetools.TLRUCache = cachetools.TLRUCache(
+            maxsize=AUTH_CACHE_SIZE, ttu=_auth_cache_ttu
+        )
+        self.cache_lock = threading.Lock()
+        self.in_flight: Dict[AuthCacheKey, "Future[AuthorizationOutcome]"] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # lookups that waited on an identical in-flight lookup rather than
+        # making their own request to the auth backend
+        self.cache_coalesced = 0
+
+    def cache_info(self) -> Dict[str, int]:
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "coalesced": self.cache_coalesced,
+            "size": len(self.cache),
+        }
+
     def __call__(self, request: Request) -> Response:
         """
         Extracts relevant metadata from request, and checks if it is authorized
@@ -68,7 +104,6 @@ class AuthTweenFactory:
             )
         return self.handler(request)
 
-    @cachetools.func.ttl_cache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
     def is_request_authorized(
         self,
         path: str,
@@ -77,13 +112,59 @@ class AuthTweenFactory:
         service: Optional[str],
     ) -> AuthorizationOutcome:
         """
-        Check if API request is authorized
+        Check if API request is authorized, caching the decision.
+
+        Decisions are cached per path, since that's what the auth backend
+        decides on, and concurrent lookups for the same key share a single
+        backend request.
 
         :param str path: API path
         :param str token: authentication token
         :param str method: http method
         :return: auth outcome
         """
+        key: AuthCacheKey = (path, token, method, service)
+        with self.cache_lock:
+            outcome = self.cache.get(key)
+            if outcome is not None:
+                self.cache_hits += 1
+                return outcome
+            self.cache_misses += 1
+
+            future = self.in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self.in_flight[key] = Future()
+            else:
+                self.cache_coalesced += 1
+
+        if not is_leader:
+            return future.result()
+
+        outcome = AuthorizationOutcome(False, "Auth backend error")
+        decided = False
+        try:
+            outcome, decided = self._query_auth_backend(path, token, method, service)
+        finally:
+            with self.cache_lock:
+                # only cache actual decisions by the auth backend, not our
+                # failures to get one
+                if decided:
+                    self.cache[key] = outcome
+                del self.in_flight[key]
+            future.set_result(outcome)
+        return outcome
+
+    def _query_auth_backend(
+        self,
+        path: str,
+        token: str,
+        method: str,
+        service: Optional[str],
+    ) -> Tuple[AuthorizationOutcome, bool]:
+        """
+        :return: auth outcome, and whether it's a decision made by the auth backend
+        """
         try:
             response = self.session.post(
                 url=self.endpoint,
@@ -100,18 +181,18 @@ class AuthTweenFactory:
             ).json()
         except Exception as e:
             logger.exception(f"Issue communicating with auth endpoint: {e}")
-            return AuthorizationOutcome(False, "Auth backend error")
+            return AuthorizationOutcome(False, "Auth backend error"), False
 
         auth_result_allowed = response.get("result", {}).get("allowed")
         if auth_result_allowed is None:
-            return AuthorizationOutcome(False, "Malformed auth response")
+            return AuthorizationOutcome(False, "Malformed auth response"), False
 
         if not auth_result_allowed:
             reason = response["result"].get("reason", "Denied")
-            return AuthorizationOutcome(False, reason)
+            return AuthorizationOutcome(False, reason), True
 
         reason = response["result"].get("reason", "Ok")
-        return AuthorizationOutcome(True, reason)
+        return AuthorizationOutcome(True, reason), True
 
 
 def includeme(config: Configurator):
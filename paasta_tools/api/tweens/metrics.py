@@ -0,0 +1,146 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Creates a tween that records request latencies and in-flight requests, plus
+hooks for timing the API's requests to Kubernetes. These are served in the
+Prometheus text format by the /metrics view.
+"""
+import functools
+import time
+from typing import Any
+from typing import Callable
+
+import pyramid
+from kubernetes.client.rest import ApiException
+from prometheus_client import CollectorRegistry
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+from pyramid.request import Request
+from pyramid.response import Response
+
+from paasta_tools.kubernetes_tools import KubeClient
+
+# a registry of our own (rather than prometheus_client's global one) so that
+# /metrics only has what we put in it. Note that each gunicorn worker has its
+# own copy of these, so every scrape only sees the worker that served it.
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+# most requests take milliseconds, but status requests for big services can
+# take tens of seconds
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_LATENCY = Histogram(
+    "paasta_api_request_duration_seconds",
+    "Time taken to respond to API requests",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "paasta_api_requests_in_progress",
+    "Number of API requests currently being handled",
+    registry=REGISTRY,
+)
+KUBE_REQUEST_LATENCY = Histogram(
+    "paasta_api_kubernetes_request_duration_seconds",
+    "Time taken by requests from the API to Kubernetes",
+    ["method", "path", "status"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+
+def includeme(config):
+    config.add_tween(
+        "paasta_tools.api.tweens.metrics.metrics_tween_factory",
+        under=pyramid.tweens.INGRESS,
+    )
+
+
+def get_route_label(request: Request) -> str:
+    """The route template a request matched (so that e.g. every
+    /v1/services/{service}/{instance}/status request shares a label)."""
+    route = getattr(request, "matched_route", None)
+    if route is None:
+        return UNMATCHED_ROUTE
+    return route.pattern
+
+
+def metrics_tween_factory(
+    handler: Callable[[Request], Response], registry: Any
+) -> Callable[[Request], Response]:
+    """Tween for recording request latency per route, method and status."""
+
+    def metrics_tween(request: Request) -> Response:
+        start = time.perf_counter()
+        status = "500"
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            response = handler(request)
+            status = str(response.status_int)
+            return response
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            REQUEST_LATENCY.labels(
+                get_route_label(request), request.method, status
+            ).observe(time.perf_counter() - start)
+
+    return metrics_tween
+
+
+def instrument_kube_client(kube_client: KubeClient) -> None:
+    """Times every request that kube_client makes to the Kubernetes API.
+
+    This hooks ApiClient.call_api, which every generated API method goes
+    through, and labels requests with their path template (e.g.
+    /api/v1/namespaces/{namespace}/pods) so that label cardinality stays low.
+    """
+    api_client = kube_client.api_client
+    if getattr(api_client, "_paasta_api_instrumented", False):
+        return
+    call_api = api_client.call_api
+
+    @functools.wraps(call_api)
+    def timed_call_api(resource_path: str, method: str, *args, **kwargs):
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = call_api(resource_path, method, *args, **kwargs)
+            status = "success"
+            return result
+        except ApiException as e:
+            status = str(e.status)
+            raise
+        finally:
+            KUBE_REQUEST_LATENCY.labels(method, resource_path, status).observe(
+                time.perf_counter() - start
+            )
+
+    api_client.call_api = timed_call_api
+    api_client._paasta_api_instrumented = True
@@ -12,8 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """
-Creates a tween that cprofiles requests
+Creates tweens that profile requests: one that cprofiles sampled requests
+(if yelp_profiling is available), and a statistical stack sampler that can
+run continuously and is dumped by the /profiling/stacks view.
 """
+import logging
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Dict
+from typing import Optional
+
 import pyramid
 import pytz
 
@@ -70,12 +80,193 @@ except ImportError:
     yelp_profiling = None
 
 
+log = logging.getLogger(__name__)
+
+DEFAULT_SAMPLING_HZ = 20
+# bounds memory use: once a route has this many distinct stacks, any new ones
+# are counted under TRUNCATED_STACK instead
+DEFAULT_MAX_STACKS_PER_ROUTE = 5000
+TRUNCATED_STACK = "[truncated]"
+# samples from threads that aren't serving a request (e.g. the executor
+# threads that blocking kubernetes calls get run in)
+BACKGROUND_ROUTE = "[background]"
+
+# set by stack_sampler_tween_factory if the sampling profiler is enabled
+sampler: Optional["StackSampler"] = None
+
+
 def includeme(config):
     if yelp_profiling is not None:
         config.add_tween(
             "paasta_tools.api.tweens.profiling.cprofile_tween_factory",
             under=pyramid.tweens.INGRESS,
         )
+    config.add_tween(
+        "paasta_tools.api.tweens.profiling.stack_sampler_tween_factory",
+        under=pyramid.tweens.INGRESS,
+    )
+
+
+def fold_stack(frame: Optional[FrameType]) -> str:
+    """Formats a stack as ;-separated frames, outermost first, which is the
+    "collapsed" format that flamegraph.pl and speedscope understand."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+class StackSampler:
+    """Statistical profiler that samples the stacks of every thread at a
+    fixed rate from a background thread.
+
+    Unlike cProfile this doesn't hook every function call, so it doesn't
+    distort timings and its overhead only depends on the sampling rate.
+    Samples from threads serving a request are attributed to that request's
+    route once it finishes.
+    """
+
+    def __init__(
+        self,
+        hz: float = DEFAULT_SAMPLING_HZ,
+        max_stacks_per_route: int = DEFAULT_MAX_STACKS_PER_ROUTE,
+    ) -> None:
+        self.interval = 1.0 / hz
+        self.max_stacks_per_route = max_stacks_per_route
+        self.lock = threading.Lock()
+        # thread ident -> stacks sampled during that thread's current request
+        self.active: Dict[int, Counter] = {}
+        # route -> stack -> number of samples
+        self.stacks: Dict[str, Counter] = {}
+        self.samples_taken = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:
+                log.exception("Failed to sample stacks")
+
+    def _add(self, route: str, stacks: Counter) -> None:
+        # must be called with self.lock held
+        route_stacks = self.stacks.setdefault(route, Counter())
+        for stack, count in stacks.items():
+            if (
+                stack not in route_stacks
+                and len(route_stacks) >= self.max_stacks_per_route
+            ):
+                stack = TRUNCATED_STACK
+            route_stacks[stack] += count
+
+    def sample(self) -> None:
+        """Takes one sample of the stack of every thread (other than this one)."""
+        own_ident = threading.get_ident()
+        frames = sys._current_frames()
+        folded = {
+            ident: fold_stack(frame)
+            for ident, frame in frames.items()
+            if ident != own_ident
+        }
+        del frames
+
+        background: Counter = Counter()
+        with self.lock:
+            self.samples_taken += 1
+            for ident, stack in folded.items():
+                if ident in self.active:
+                    self.active[ident][stack] += 1
+                else:
+                    background[stack] += 1
+            self._add(BACKGROUND_ROUTE, background)
+
+    def begin_request(self) -> None:
+        with self.lock:
+            self.active[threading.get_ident()] = Counter()
+
+    def end_request(self, route: str) -> None:
+        with self.lock:
+            stacks = self.active.pop(threading.get_ident(), None)
+            if stacks:
+                self._add(route, stacks)
+
+    def collapsed_stacks(self, route: Optional[str] = None, reset: bool = False) -> str:
+        """Returns the samples so far as collapsed stacks (one
+        "route;frame;frame count" line per stack), for flamegraph tools.
+
+        :param route: only include samples from this route
+        :param reset: clear the samples once they've been returned
+        """
+        with self.lock:
+            stacks = {
+                r: Counter(s)
+                for r, s in self.stacks.items()
+                if route is None or r == route
+            }
+            if reset:
+                self.stacks = {}
+        return "".join(
+            f"{r};{stack} {count}\n"
+            for r, route_stacks in sorted(stacks.items())
+            for stack, count in sorted(route_stacks.items())
+        )
+
+
+def get_stack_sampler_config() -> Dict:
+    # not set until setup_paasta_api has run
+    system_paasta_config = getattr(api_settings, "system_paasta_config", None)
+    if system_paasta_config is None:
+        return {}
+    return system_paasta_config.get_api_profiling_config()
+
+
+def stack_sampler_tween_factory(handler, registry):
+    """Tween that attributes samples taken by the stack sampler to the route
+    of the request being served. If the sampler isn't enabled (with
+    stack_sampling_enabled in the api_profiling_config), this does nothing.
+    """
+    global sampler
+
+    config = get_stack_sampler_config()
+    if not config.get("stack_sampling_enabled", False):
+        return handler
+
+    if sampler is None:
+        sampler = StackSampler(
+            hz=config.get("stack_sampling_hz", DEFAULT_SAMPLING_HZ),
+            max_stacks_per_route=config.get(
+                "stack_sampling_max_stacks_per_route", DEFAULT_MAX_STACKS_PER_ROUTE
+            ),
+        )
+        sampler.start()
+    active_sampler = sampler
+
+    def stack_sampler_tween(request):
+        active_sampler.begin_request()
+        try:
+            return handler(request)
+        finally:
+            route = getattr(request, "matched_route", None)
+            active_sampler.end_request(
+                route.pattern if route is not None else request.path
+            )
+
+    return stack_sampler_tween
 
 
 def cprofile_tween_factory(handler, registry):
@@ -14,9 +14,19 @@
 """
 Creates a tween that logs information about requests.
 """
+import atexit
 import json
+import logging
+import os
+import queue
+import threading
+import time
 import traceback
 from datetime import datetime
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
 
 import pyramid
 import pytz
@@ -29,7 +39,16 @@ except ImportError:
     clog = None
 
 
+log = logging.getLogger(__name__)
+
 DEFAULT_REQUEST_LOG_NAME = "tmp_paasta_api_requests"
+DEFAULT_REQUEST_LOG_QUEUE_SIZE = 10000
+DEFAULT_REQUEST_LOG_BATCH_SIZE = 100
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST)
+# how long we're willing to hold up interpreter shutdown to get records out
+DEFAULT_FLUSH_TIMEOUT_S = 5.0
 
 
 def includeme(config):
@@ -40,6 +59,148 @@ def includeme(config):
         )
 
 
+class RequestLogWriter:
+    """Writes request log records to clog from a background thread, so that
+    requests never wait on the log sink.
+
+    Records go onto a bounded queue; when it's full, either the record being
+    logged (drop_newest) or the oldest queued record (drop_oldest) is dropped
+    and counted, rather than blocking the request.
+    """
+
+    def __init__(
+        self,
+        log_name: str,
+        max_queue_size: int = DEFAULT_REQUEST_LOG_QUEUE_SIZE,
+        batch_size: int = DEFAULT_REQUEST_LOG_BATCH_SIZE,
+        overflow_policy: str = DROP_NEWEST,
+    ) -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown request log overflow policy {overflow_policy!r}, "
+                f"expected one of {OVERFLOW_POLICIES}"
+            )
+        self.log_name = log_name
+        self.batch_size = max(1, batch_size)
+        self.overflow_policy = overflow_policy
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue_size)
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+        # records that have been enqueued but not yet written (or dropped),
+        # guarded by `pending_cond` so that flush() can wait for it to hit 0
+        self.pending = 0
+        self.pending_cond = threading.Condition()
+
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        # the thread is started lazily (and restarted in a forked child) since
+        # threads don't survive the fork into gunicorn workers
+        if self._thread is not None and self._thread_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread_pid == os.getpid():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="request-log-writer", daemon=True
+            )
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _record_done(self, count: int = 1, dropped: bool = False) -> None:
+        with self.pending_cond:
+            if dropped:
+                self.dropped += count
+            self.pending -= count
+            if self.pending <= 0:
+                self.pending_cond.notify_all()
+
+    def enqueue(self, record: Dict[str, Any]) -> bool:
+        """Queues a record to be written, without blocking.
+
+        :returns: whether the record was queued (rather than dropped)
+        """
+        self._ensure_started()
+        with self.pending_cond:
+            self.pending += 1
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                break
+            except queue.Full:
+                if self.overflow_policy == DROP_NEWEST:
+                    self._record_done(dropped=True)
+                    return False
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    # the writer got there first, so there's room now
+                    continue
+                self._record_done(dropped=True)
+        with self.pending_cond:
+            self.enqueued += 1
+        return True
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        batch = [self.queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        written = 0
+        for record in batch:
+            try:
+                if clog is not None:
+                    clog.log_line(self.log_name, json.dumps(record, sort_keys=True))
+                written += 1
+            except Exception:
+                log.exception("Failed to write request log record")
+                with self.pending_cond:
+                    self.write_errors += 1
+        with self.pending_cond:
+            self.written += written
+        self._record_done(count=len(batch))
+
+    def _run(self) -> None:
+        while True:
+            self.write_batch(self._next_batch())
+
+    def flush(self, timeout: Optional[float] = DEFAULT_FLUSH_TIMEOUT_S) -> bool:
+        """Waits for every record queued so far to be written.
+
+        :returns: False if that didn't happen within `timeout` seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.pending_cond:
+            while self.pending > 0:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.pending_cond.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        with self.pending_cond:
+            return {
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "write_errors": self.write_errors,
+                "queued": self.queue.qsize(),
+            }
+
+
 class request_logger_tween_factory:
     """Tween that logs information about requests"""
 
@@ -50,6 +211,23 @@ class request_logger_tween_factory:
             "request_log_name",
             DEFAULT_REQUEST_LOG_NAME,
         )
+        self.writer = RequestLogWriter(
+            log_name=self.log_name,
+            max_queue_size=int(
+                registry.settings.get(
+                    "request_log_queue_size", DEFAULT_REQUEST_LOG_QUEUE_SIZE
+                )
+            ),
+            batch_size=int(
+                registry.settings.get(
+                    "request_log_batch_size", DEFAULT_REQUEST_LOG_BATCH_SIZE
+                )
+            ),
+            overflow_policy=registry.settings.get(
+                "request_log_overflow_policy", DROP_NEWEST
+            ),
+        )
+        atexit.register(self.writer.flush)
 
     def _log(
         self,
@@ -70,8 +248,8 @@ class request_logger_tween_factory:
             }
             if additional_fields is not None:
                 dct.update(additional_fields)
-            line = json.dumps(dct, sort_keys=True)
-            clog.log_line(self.log_name, line)
+            # serializing and writing happen on the writer's thread
+            self.writer.enqueue(dct)
 
     def __call__(self, request):
         start_time = datetime.now(pytz.utc)  # start clock for response time
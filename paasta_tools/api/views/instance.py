@@ -16,6 +16,8 @@
 PaaSTA service instance status/start/stop etc.
 """
 import asyncio
+import hashlib
+import json
 import logging
 import re
 import traceback
@@ -24,10 +26,13 @@ from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 
+from pyramid.httpexceptions import HTTPNotModified
 from pyramid.request import Request
 from pyramid.response import Response
 from pyramid.view import view_config
+from webob.etag import ETagMatcher
 
 import paasta_tools.mesos.exceptions as mesos_exceptions
 from paasta_tools import tron_tools
@@ -40,6 +45,7 @@ from paasta_tools.mesos_tools import get_all_frameworks as get_all_mesos_framewo
 from paasta_tools.utils import PAASTA_K8S_INSTANCE_TYPES
 from paasta_tools.utils import DeploymentVersion
 from paasta_tools.utils import NoConfigurationForServiceError
+from paasta_tools.utils import SingleFlightTTLCache
 from paasta_tools.utils import TimeoutError
 from paasta_tools.utils import compose_job_id
 from paasta_tools.utils import validate_service_instance
@@ -137,12 +143,33 @@ def no_configuration_for_service_message(cluster, service, instance):
     )
 
 
+# `paasta status` and dashboards poll instance status, so identical requests
+# within a few seconds share one computation of it, and clients that send back
+# the ETag they were given get a 304 if it hasn't changed.
+INSTANCE_STATUS_CACHE_TTL_S = 5
+instance_status_cache = SingleFlightTTLCache(ttl=INSTANCE_STATUS_CACHE_TTL_S)
+
+
+def get_status_etag(status: Mapping[str, Any]) -> str:
+    """Returns a digest of a status payload that's stable across processes."""
+    return hashlib.sha1(
+        json.dumps(status, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    return etag in ETagMatcher.parse(if_none_match, strong=False)
+
+
 @view_config(
     route_name="service.instance.status", request_method="GET", renderer="json"
 )
 def instance_status(
     request: Request,
-) -> dict[str, Any]:  # godspeed to anyone typing the retval here
+) -> Any:
     # NOTE: swagger_data is populated by pyramid_swagger
     service = request.swagger_data.get("service")
     instance = request.swagger_data.get("instance")
@@ -156,6 +183,35 @@ def instance_status(
     if include_mesos is None:
         include_mesos = True
 
+    def compute() -> Tuple[Dict[str, Any], str]:
+        status = get_instance_status(
+            service=service,
+            instance=instance,
+            verbose=verbose,
+            use_new=use_new,
+            all_namespaces=all_namespaces,
+            include_envoy=include_envoy,
+        )
+        return status, get_status_etag(status)
+
+    instance_status, etag = instance_status_cache.get(
+        (service, instance, verbose, use_new, all_namespaces, include_envoy),
+        compute,
+    )
+    if etag_matches(request, etag):
+        return HTTPNotModified(headers={"ETag": f'"{etag}"'})
+    request.response.etag = etag
+    return instance_status
+
+
+def get_instance_status(
+    service: str,
+    instance: str,
+    verbose: int,
+    use_new: bool,
+    all_namespaces: bool,
+    include_envoy: bool,
+) -> Dict[str, Any]:  # godspeed to anyone typing the retval here
     instance_status: Dict[str, Any] = {}
     instance_status["service"] = service
     instance_status["instance"] = instance
@@ -460,3 +516,58 @@ def instance_replica_restart(
             "support replica restart"
         )
         raise ApiFailure(error_message, 500)
+
+
+@view_config(
+    route_name="service.instance.replica.container.logs",
+    request_method="GET",
+    renderer="json",
+)
+def instance_replica_container_logs(
+    request: Request,
+) -> Mapping[str, Any]:
+    service = request.swagger_data.get("service")
+    instance = request.swagger_data.get("instance")
+    replica_name = request.swagger_data.get("replica_name")
+    container_name = request.swagger_data.get("container_name")
+    tail_lines = request.swagger_data.get("tail_lines", 100)
+    previous = request.swagger_data.get("previous", False)
+    namespace = request.swagger_data.get("namespace")
+
+    try:
+        instance_type = validate_service_instance(
+            service, instance, settings.cluster, settings.soa_dir
+        )
+    except NoConfigurationForServiceError:
+        error_message = no_configuration_for_service_message(
+            settings.cluster,
+            service,
+            instance,
+        )
+        raise ApiFailure(error_message, 404)
+    except Exception:
+        error_message = traceback.format_exc()
+        raise ApiFailure(error_message, 500)
+
+    try:
+        container_tail_lines = pik.get_container_tail_lines(
+            service=service,
+            instance=instance,
+            instance_type=instance_type,
+            replica_name=replica_name,
+            container_name=container_name,
+            settings=settings,
+            num_tail_lines=tail_lines,
+            previous=previous,
+            namespace=namespace,
+        )
+    except RuntimeError as e:
+        raise ApiFailure(str(e), 500)
+
+    if container_tail_lines is None:
+        raise ApiFailure(
+            f"Container {container_name} of replica {replica_name} not found in "
+            f"service {service}.{instance}",
+            404,
+        )
+    return container_tail_lines
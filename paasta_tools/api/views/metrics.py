@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+API server metrics, in the Prometheus text format.
+"""
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import generate_latest
+from pyramid.response import Response
+from pyramid.view import view_config
+
+from paasta_tools.api.tweens.metrics import REGISTRY
+
+
+@view_config(route_name="metrics", request_method="GET")
+def metrics(request):
+    response = Response(body=generate_latest(REGISTRY))
+    response.headers["Content-Type"] = CONTENT_TYPE_LATEST
+    return response
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Dumps the stack sampling profiler's samples, as collapsed stacks that can be
+fed straight into flamegraph.pl or speedscope.
+"""
+from pyramid.response import Response
+from pyramid.view import view_config
+
+from paasta_tools.api.tweens import profiling
+from paasta_tools.api.views.exception import ApiFailure
+
+
+@view_config(route_name="profiling.stacks", request_method="GET")
+def profiling_stacks(request):
+    if profiling.sampler is None:
+        raise ApiFailure("Stack sampling is not enabled", 404)
+
+    route = request.params.get("route")
+    reset = request.params.get("reset", "false").lower() in ("1", "true")
+    return Response(
+        profiling.sampler.collapsed_stacks(route=route, reset=reset),
+        content_type="text/plain",
+    )
@@ -11,15 +11,27 @@ from typing import Awaitable
 from typing import Callable
 from typing import Coroutine
 from typing import Dict
+from typing import Hashable
 from typing import List
+from typing import NamedTuple
 from typing import Optional
 from typing import ParamSpec
+from typing import Tuple
 from typing import TypeVar
 
 P = ParamSpec("P")
 T = TypeVar("T")
 
 
+class AsyncTTLCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    stale_hits: int
+    refreshes: int
+    refresh_failures: int
+    evictions: int
+
+
 # NOTE: this method is not thread-safe due to lack of locking while checking
 # and updating the cache
 def async_ttl_cache(
@@ -27,9 +39,69 @@ def async_ttl_cache(
     cleanup_self: bool = False,
     *,
     cache: Optional[Dict] = None,
+    maxsize: Optional[int] = None,
+    stale_while_revalidate: bool = False,
 ) -> Callable[
     [Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]  # wrapped  # inner
 ]:
+    """Caches the results of a coroutine function for ttl seconds.
+
+    :param maxsize: if set, the least recently used entries are evicted once a
+        cache (with cleanup_self, each instance's cache) has more than this many
+    :param stale_while_revalidate: once an entry has expired, keep returning it
+        while a single refresh runs in the background, rather than making every
+        caller wait for the refresh. Note that the refresh only makes progress
+        while the event loop runs, so with run_sync it may complete during a
+        later call.
+
+    The decorated function gets a cache_stats() method returning the counters in
+    AsyncTTLCacheStats, across all of its caches.
+    """
+    counters: Dict[str, int] = dict.fromkeys(AsyncTTLCacheStats._fields, 0)
+    # in-flight background refreshes, by (id(cache), key)
+    refreshes: Dict[Tuple[int, Hashable], "asyncio.Future[Any]"] = {}
+
+    def touch(cache: Dict, key: Hashable) -> None:
+        # dicts are ordered, so moving an entry to the end keeps them in LRU order
+        if maxsize is not None:
+            cache[key] = cache.pop(key)
+
+    def evict(cache: Dict) -> None:
+        if maxsize is not None:
+            while len(cache) > maxsize:
+                del cache[next(iter(cache))]
+                counters["evictions"] += 1
+
+    def start_refresh(
+        cache: Dict,
+        key: Hashable,
+        stale_entry: Tuple["asyncio.Future[Any]", float],
+        async_func: Callable[..., Awaitable[Any]],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        refresh_key = (id(cache), key)
+        if refresh_key in refreshes:
+            return
+
+        async def refresh() -> None:
+            try:
+                value = await async_func(*args, **kwargs)
+            except Exception:
+                counters["refresh_failures"] += 1
+                return
+            # don't clobber an entry that was invalidated or replaced meanwhile
+            if cache.get(key) == stale_entry:
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(value)
+                cache[key] = (future, time.time())
+                touch(cache, key)
+
+        counters["refreshes"] += 1
+        task = asyncio.ensure_future(refresh())
+        refreshes[refresh_key] = task
+        task.add_done_callback(lambda _: refreshes.pop(refresh_key, None))
+
     async def call_or_get_from_cache(cache, async_func, args_for_key, args, kwargs):
         # Please note that anything which is put into `key` will be in the
         # cache forever, potentially causing memory leaks.  The most common
@@ -40,11 +112,27 @@ def async_ttl_cache(
         try:
             future, last_update = cache[key]
             if ttl is not None and time.time() - last_update > ttl:
+                if (
+                    stale_while_revalidate
+                    and future.done()
+                    and not future.cancelled()
+                    and future.exception() is None
+                ):
+                    counters["stale_hits"] += 1
+                    start_refresh(
+                        cache, key, (future, last_update), async_func, args, kwargs
+                    )
+                    return future.result()
                 raise KeyError
+            counters["hits"] += 1
+            touch(cache, key)
         except KeyError:
+            counters["misses"] += 1
             future = asyncio.ensure_future(async_func(*args, **kwargs))
-            # set the timestamp to +infinity so that we always wait on the in-flight request.
+            # set the timestamp to +infinity so that we always wait on the in-flight request.
             cache[key] = (future, float("Inf"))
+            touch(cache, key)
+            evict(cache)
 
         try:
             value = await future
@@ -61,6 +149,9 @@ def async_ttl_cache(
                 cache[key] = (future, time.time())
             return value
 
+    def cache_stats() -> AsyncTTLCacheStats:
+        return AsyncTTLCacheStats(**counters)
+
     if cleanup_self:
         instance_caches: Dict = cache if cache is not None else defaultdict(dict)
 
@@ -76,6 +167,7 @@ def async_ttl_cache(
                     self_cache, wrapped, args, (self,) + args, kwargs
                 )
 
+            inner.cache_stats = cache_stats
             return inner
 
     else:
@@ -88,6 +180,7 @@ def async_ttl_cache(
             async def inner(*args, **kwargs):
                 return await call_or_get_from_cache(cache2, wrapped, args, args, kwargs)
 
+            inner.cache_stats = cache_stats
             return inner
 
     return outer
@@ -1,3 +1,13 @@
+import itertools
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
 from paasta_tools.autoscaling.utils import get_autoscaling_component
 from paasta_tools.autoscaling.utils import register_autoscaling_component
 from paasta_tools.long_running_service_tools import (
@@ -47,12 +57,9 @@ def moving_average_forecast_policy(
 ):
     """Does a simple average of all historical load data points within the moving average window. Weights all data
     points within the window equally."""
-
-    windowed_data = trailing_window_historical_load(
-        historical_load, moving_average_window_seconds
-    )
-    windowed_values = [value for timestamp, value in windowed_data]
-    return sum(windowed_values) / len(windowed_values)
+    return moving_average_forecast_many(
+        [historical_load], moving_average_window_seconds
+    )[0]
 
 
 @register_autoscaling_component("linreg", FORECAST_POLICY_KEY)
@@ -76,30 +83,144 @@ def linreg_forecast_policy(
                                  0.
 
     """
+    return linreg_forecast_many(
+        [historical_load],
+        linreg_window_seconds,
+        linreg_extrapolation_seconds,
+        linreg_default_slope,
+    )[0]
+
+
+def _concatenate_histories(historical_loads):
+    """Packs a list of historical_loads into contiguous arrays of timestamps
+    and values, along with which history each datapoint came from and the
+    index of each history's last datapoint."""
+    lengths = np.array([len(history) for history in historical_loads], dtype=np.intp)
+    if not lengths.all():
+        raise IndexError("Can't forecast from an empty historical_load")
+    if all(isinstance(history, np.ndarray) for history in historical_loads):
+        datapoints = np.concatenate(historical_loads).astype(float, copy=False)
+    else:
+        datapoints = np.fromiter(
+            itertools.chain.from_iterable(
+                itertools.chain.from_iterable(historical_loads)
+            ),
+            dtype=float,
+            count=2 * lengths.sum(),
+        ).reshape(-1, 2)
+    timestamps = np.ascontiguousarray(datapoints[:, 0])
+    values = np.ascontiguousarray(datapoints[:, 1])
+    history_ids = np.repeat(np.arange(len(lengths)), lengths)
+    last_indices = np.cumsum(lengths) - 1
+    return timestamps, values, history_ids, last_indices
+
+
+def _trailing_window_sums(
+    timestamps, values, history_ids, last_indices, window_size, num_histories
+):
+    """Like trailing_window_historical_load, for every history at once: returns
+    a mask of the datapoints in each history's window, and per history the
+    number of them and their sums of timestamps and values."""
+    window_end = timestamps[last_indices]
+    in_window = (timestamps >= (window_end - window_size)[history_ids]) & (
+        timestamps <= window_end[history_ids]
+    )
+    ids = history_ids[in_window]
+    counts = np.bincount(ids, minlength=num_histories)
+    time_sums = np.bincount(ids, weights=timestamps[in_window], minlength=num_histories)
+    value_sums = np.bincount(ids, weights=values[in_window], minlength=num_histories)
+    return in_window, counts, time_sums, value_sums
 
-    window = trailing_window_historical_load(historical_load, linreg_window_seconds)
-
-    loads = [load for timestamp, load in window]
-    times = [timestamp for timestamp, load in window]
 
-    mean_time = sum(times) / len(times)
-    mean_load = sum(loads) / len(loads)
+def moving_average_forecast_many(
+    historical_loads: Sequence[Sequence[Tuple[float, float]]],
+    moving_average_window_seconds: float = DEFAULT_UWSGI_AUTOSCALING_MOVING_AVERAGE_WINDOW,
+    **kwargs,
+) -> List[float]:
+    """Vectorized moving_average_forecast_policy, over many historical_loads at once."""
+    timestamps, values, history_ids, last_indices = _concatenate_histories(
+        historical_loads
+    )
+    _, counts, _, value_sums = _trailing_window_sums(
+        timestamps,
+        values,
+        history_ids,
+        last_indices,
+        moving_average_window_seconds,
+        len(historical_loads),
+    )
+    return (value_sums / counts).tolist()
 
-    if len(window) > 1:
-        slope = sum((t - mean_time) * (l - mean_load) for t, l in window) / sum(
-            (t - mean_time) ** 2 for t in times
-        )
-    else:
-        slope = linreg_default_slope
 
+def linreg_forecast_many(
+    historical_loads: Sequence[Sequence[Tuple[float, float]]],
+    linreg_window_seconds: float,
+    linreg_extrapolation_seconds: Any,
+    linreg_default_slope: float = 0,
+    **kwargs,
+) -> List[float]:
+    """Vectorized linreg_forecast_policy, over many historical_loads at once."""
+    num_histories = len(historical_loads)
+    timestamps, values, history_ids, last_indices = _concatenate_histories(
+        historical_loads
+    )
+    in_window, counts, time_sums, value_sums = _trailing_window_sums(
+        timestamps,
+        values,
+        history_ids,
+        last_indices,
+        linreg_window_seconds,
+        num_histories,
+    )
+    mean_time = time_sums / counts
+    mean_load = value_sums / counts
+
+    # centre the datapoints before multiplying them: sums of squared unix
+    # timestamps would lose all precision
+    ids = history_ids[in_window]
+    time_deltas = timestamps[in_window] - mean_time[ids]
+    load_deltas = values[in_window] - mean_load[ids]
+    covariance = np.bincount(
+        ids, weights=time_deltas * load_deltas, minlength=num_histories
+    )
+    variance = np.bincount(
+        ids, weights=time_deltas * time_deltas, minlength=num_histories
+    )
+    has_slope = counts > 1
+    if (variance[has_slope] == 0).any():
+        # i.e. several datapoints at the same time, and nothing else
+        raise ZeroDivisionError("float division by zero")
+    slope = np.full(num_histories, linreg_default_slope, dtype=float)
+    slope[has_slope] = covariance[has_slope] / variance[has_slope]
     intercept = mean_load - slope * mean_time
 
-    def predict(timestamp):
-        return slope * timestamp + intercept
-
     if isinstance(linreg_extrapolation_seconds, (int, float)):
         linreg_extrapolation_seconds = [linreg_extrapolation_seconds]
+    now = timestamps[last_indices]
+    forecast_times = now[:, None] + np.asarray(linreg_extrapolation_seconds)[None, :]
+    return (slope[:, None] * forecast_times + intercept[:, None]).max(axis=1).tolist()
 
-    now, _ = historical_load[-1]
-    forecasted_values = [predict(now + delta) for delta in linreg_extrapolation_seconds]
-    return max(forecasted_values)
+
+_VECTORIZED_FORECAST_POLICIES: Dict[str, Callable[..., List[float]]] = {
+    "moving_average": moving_average_forecast_many,
+    "linreg": linreg_forecast_many,
+}
+
+
+def forecast_many(
+    name: str, historical_loads: Sequence[Sequence[Tuple[float, float]]], **kwargs
+) -> List[float]:
+    """Forecasts the load for each of many historical_loads (e.g. one per
+    instance) with the named forecast policy, in one call.
+
+    The moving_average and linreg policies do this in a handful of vectorized
+    operations rather than a Python loop per datapoint - and if the
+    historical_loads are already (n, 2) arrays of (timestamp, value)s, without
+    converting them first.
+    """
+    if not historical_loads:
+        return []
+    if name in _VECTORIZED_FORECAST_POLICIES:
+        return _VECTORIZED_FORECAST_POLICIES[name](historical_loads, **kwargs)
+    policy = get_forecast_policy(name)
+    return [policy(historical_load, **kwargs) for historical_load in historical_loads]
@@ -18,11 +18,13 @@ import argparse
 import logging
 import os
 import pkgutil
-import subprocess
+import shutil
 import sys
 import warnings
 from typing import Any
 from typing import List
+from typing import Optional
+from typing import Set
 from typing import Tuple
 
 import argcomplete
@@ -65,15 +67,41 @@ class PrintsHelpOnErrorArgumentParser(argparse.ArgumentParser):
         sys.exit(1)
 
 
-def list_external_commands():
-    p = subprocess.check_output(["/bin/bash", "-p", "-c", "compgen -A command paasta-"])
-    lines = p.decode("utf-8").strip().split("\n")
-    return {line.replace("paasta-", "", 1) for line in lines}
+EXTERNAL_COMMAND_PREFIX = "paasta-"
+
+
+def find_external_command(command: str) -> Optional[str]:
+    """Returns the path to the paasta-<command> executable on $PATH, if any."""
+    return shutil.which(f"{EXTERNAL_COMMAND_PREFIX}{command}")
+
+
+def list_external_commands() -> Set[str]:
+    """Returns the names of all paasta-* executables on $PATH (minus the prefix)."""
+    commands = set()
+    for path_dir in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        try:
+            entries = list(os.scandir(path_dir or os.curdir))
+        except OSError:
+            continue
+        for entry in entries:
+            if (
+                entry.name.startswith(EXTERNAL_COMMAND_PREFIX)
+                and len(entry.name) > len(EXTERNAL_COMMAND_PREFIX)
+                and os.access(entry.path, os.X_OK)
+                and not entry.is_dir()
+            ):
+                commands.add(entry.name[len(EXTERNAL_COMMAND_PREFIX) :])
+    return commands
 
 
 def calling_external_command():
     if len(sys.argv) > 1:
-        return sys.argv[1] in list_external_commands()
+        command = sys.argv[1]
+        # builtin subcommands take precedence, so there's no need to look at $PATH
+        # for them - which is what nearly every invocation is
+        if command in PAASTA_SUBCOMMANDS or command.startswith("-"):
+            return False
+        return find_external_command(command) is not None
     else:
         return False
 
@@ -187,6 +215,10 @@ def get_argparser(commands: list[str] | None = None) -> argparse.ArgumentParser:
         for command in commands:
             if command not in PAASTA_SUBCOMMANDS:
                 # could be external subcommand
+                if find_external_command(command):
+                    command_choices.append(
+                        (command, (subparsers.add_parser, [command], dict(help="")))
+                    )
                 continue
             command_choices.append(
                 (
@@ -203,10 +235,14 @@ def get_argparser(commands: list[str] | None = None) -> argparse.ArgumentParser:
                 )
             )
 
-    for command in list_external_commands():
-        command_choices.append(
-            (command, (subparsers.add_parser, [command], dict(help="")))
-        )
+    if not commands:
+        # only needed when listing every subcommand (e.g. for --help or completing
+        # the subcommand name itself), as parsers for specific subcommands don't
+        # care about their siblings
+        for command in list_external_commands() - set(PAASTA_SUBCOMMANDS):
+            command_choices.append(
+                (command, (subparsers.add_parser, [command], dict(help="")))
+            )
 
     for (_, (fn, args, kwds)) in sorted(command_choices, key=lambda e: e[0]):
         fn(*args, **kwds)
@@ -237,11 +273,19 @@ def parse_args(argv):
         argcomplete.autocomplete(parser)
         return parser.parse_args(argv), parser
 
-    parser = get_argparser(commands=[])
-
-    args, _ = parser.parse_known_args(argv)
-    if args.command:
-        parser = get_argparser(commands=[args.command])
+    if argv is None:
+        argv = sys.argv[1:]
+    # the first positional argument is the subcommand, as `paasta` itself only
+    # takes flags. Resolving it up front means that we only need to scan $PATH
+    # for every external subcommand when we're going to list them all, e.g.
+    # for `paasta --help` or an unknown subcommand.
+    command = next((arg for arg in argv if not arg.startswith("-")), None)
+    if command is not None and (
+        command in PAASTA_SUBCOMMANDS or find_external_command(command)
+    ):
+        parser = get_argparser(commands=[command])
+    else:
+        parser = get_argparser(commands=[])
 
     return parser.parse_args(argv), parser
 
@@ -17,7 +17,6 @@ passes all the markers required to be considered paasta ready."""
 import os
 import re
 
-from paasta_tools.cli.cmds.validate import paasta_validate_soa_configs
 from paasta_tools.cli.utils import NoSuchService
 from paasta_tools.cli.utils import PaastaCheckMessages
 from paasta_tools.cli.utils import figure_out_service_name
@@ -315,6 +314,10 @@ def smartstack_check(service, service_path, soa_dir):
 def paasta_check(args):
     """Analyze the service in the PWD to determine if it is paasta ready
     :param args: argparse.Namespace obj created from sys.args by cli"""
+    # validate pulls in most of paasta_tools, which nothing else in check needs
+    # (and cook-image imports this module for makefile_responds_to)
+    from paasta_tools.cli.cmds.validate import paasta_validate_soa_configs
+
     soa_dir = args.yelpsoa_config_root
     service = figure_out_service_name(args, soa_dir)
     service_path = os.path.join(soa_dir, service)
@@ -17,7 +17,6 @@ from typing import List
 
 from service_configuration_lib import read_service_configuration
 
-from paasta_tools.cli.cmds.status import get_actual_deployments
 from paasta_tools.cli.utils import figure_out_service_name
 from paasta_tools.cli.utils import lazy_choices_completer
 from paasta_tools.long_running_service_tools import get_all_namespaces_for_service
@@ -89,6 +88,10 @@ def get_smartstack_endpoints(service, soa_dir):
 
 
 def get_deployments_strings(service: str, soa_dir: str) -> List[str]:
+    # status imports every instance type's config class (and so the kubernetes
+    # client), which the rest of info doesn't need
+    from paasta_tools.cli.cmds.status import get_actual_deployments
+
     output = []
     try:
         deployments = get_actual_deployments(service, soa_dir)
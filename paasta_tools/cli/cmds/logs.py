@@ -43,7 +43,6 @@ from typing import Type
 from typing import Union
 
 import isodate
-import nats
 import pytz
 from dateutil import tz
 
@@ -1280,6 +1279,9 @@ class VectorLogsReader(LogReader):
                 "Tailing logs is not supported in this cluster yet, sorry"
             )
 
+        # nats is only needed for tailing, which most invocations don't do
+        import nats
+
         async def tail_logs_from_nats() -> None:
             nc = await nats.connect(f"nats://{endpoint}")
             sub = await nc.subscribe(stream_name)
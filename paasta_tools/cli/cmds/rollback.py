@@ -25,7 +25,6 @@ from humanize import naturaltime
 from paasta_tools.cli.cmds.mark_for_deployment import can_user_deploy_service
 from paasta_tools.cli.cmds.mark_for_deployment import get_deploy_info
 from paasta_tools.cli.cmds.mark_for_deployment import mark_for_deployment
-from paasta_tools.cli.utils import extract_tags
 from paasta_tools.cli.utils import figure_out_service_name
 from paasta_tools.cli.utils import lazy_choices_completer
 from paasta_tools.cli.utils import list_deploy_groups
@@ -37,6 +36,7 @@ from paasta_tools.remote_git import create_rollback_tag
 from paasta_tools.remote_git import list_remote_refs
 from paasta_tools.slack import get_slack_client
 from paasta_tools.utils import DEFAULT_SOA_DIR
+from paasta_tools.utils import DeploymentRefIndex
 from paasta_tools.utils import DeploymentVersion
 from paasta_tools.utils import PaastaColors
 from paasta_tools.utils import RollbackTypes
@@ -181,29 +181,16 @@ def get_versions_for_service(
     all_deploy_groups = list_deploy_groups(service=service, soa_dir=soa_dir)
     deploy_groups, _ = validate_given_deploy_groups(all_deploy_groups, deploy_groups)
     previously_deployed_versions: Dict[DeploymentVersion, Tuple[str, str]] = {}
-    for ref, sha in list_remote_refs(git_url).items():
-        regex_match = extract_tags(ref)
-        try:
-            deploy_group = regex_match["deploy_group"]
-            tstamp = regex_match["tstamp"]
-            image_version = regex_match["image_version"]
-            tag_type = regex_match["tag"]
-        except KeyError:
-            pass
-        else:
-            if tag_type != "deploy":
-                # i.e., we don't care about noise like rollback tags :)
-                continue
-
-            # Now we filter and dedup by picking the most recent sha for a deploy group
-            # Note that all strings are greater than ''
-            if deploy_group in deploy_groups:
-                version = DeploymentVersion(sha=sha, image_version=image_version)
-                tstamp_so_far = previously_deployed_versions.get(version, ("all", ""))[
-                    1
-                ]
-                if tstamp > tstamp_so_far:
-                    previously_deployed_versions[version] = (tstamp, deploy_group)
+    ref_index = DeploymentRefIndex(list_remote_refs(git_url))
+    # rollback tags (and any other noise) are not part of the deploy history
+    for deploy_group in sorted(deploy_groups):
+        for tag in ref_index.get_tag_history(deploy_group):
+            # Dedup by keeping the most recent deploy of each version across
+            # all of the given deploy groups
+            version = DeploymentVersion(sha=tag.sha, image_version=tag.image_version)
+            tstamp_so_far = previously_deployed_versions.get(version, ("", "all"))[0]
+            if tag.timestamp > tstamp_so_far:
+                previously_deployed_versions[version] = (tag.timestamp, deploy_group)
     return previously_deployed_versions
 
 
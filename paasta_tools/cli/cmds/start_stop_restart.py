@@ -206,6 +206,7 @@ def confirm_to_continue(cluster_service_instances, desired_state):
 
 
 REMOTE_REFS: Dict[str, List[str]] = {}
+REMOTE_REF_INDEXES: Dict[str, utils.DeploymentRefIndex] = {}
 
 
 def get_remote_refs(service, soa_dir):
@@ -216,6 +217,14 @@ def get_remote_refs(service, soa_dir):
     return REMOTE_REFS[service]
 
 
+def get_remote_ref_index(service, soa_dir):
+    if service not in REMOTE_REF_INDEXES:
+        REMOTE_REF_INDEXES[service] = utils.DeploymentRefIndex(
+            get_remote_refs(service, soa_dir)
+        )
+    return REMOTE_REF_INDEXES[service]
+
+
 def paasta_start_or_stop(args, desired_state):
     """Requests a change of state to start or stop given branches of a service."""
     soa_dir = args.soa_dir
@@ -281,7 +290,7 @@ def paasta_start_or_stop(args, desired_state):
                     continue
 
                 try:
-                    remote_refs = get_remote_refs(service, soa_dir)
+                    remote_refs = get_remote_ref_index(service, soa_dir)
                 except remote_git.LSRemoteException as e:
                     msg = (
                         "Error talking to the git server: %s\n"
@@ -51,6 +51,7 @@ from paasta_tools.api.client import get_paasta_oapi_client
 from paasta_tools.async_utils import run_sync
 from paasta_tools.cassandracluster_tools import CassandraClusterDeploymentConfig
 from paasta_tools.cassandraclustereks_tools import CassandraClusterEksDeploymentConfig
+from paasta_tools.cli.service_index import ServiceIndex
 from paasta_tools.cli.utils import NoSuchService
 from paasta_tools.cli.utils import figure_out_service_name
 from paasta_tools.cli.utils import get_instance_configs_for_service
@@ -2143,6 +2144,17 @@ def apply_args_filters(
     else:
         instances = None
 
+    if args.owner and args.service is None:
+        # loading the configs of every service just to find the handful owned
+        # by these owners is slow, so narrow the services down with the index
+        service_index = ServiceIndex(soa_dir=args.soa_dir)
+        all_services = service_index.get_services_owned_by(
+            owners=args.owner.split(","),
+            services=all_services,
+            clusters=clusters if args.clusters else None,
+        )
+        service_index.save()
+
     filters = get_filters(args)
 
     i_count = 0
@@ -12,11 +12,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import concurrent.futures
+import contextlib
 import functools
+import io
 import json
 import os
 import pkgutil
 import re
+import traceback
 from collections import Counter
 from datetime import datetime
 from functools import lru_cache
@@ -206,6 +210,10 @@ MAX_ENVOY_NAME_LEN = 118
 # so we may want to adjust this a tad in the future ;)
 MAX_SMARTSTACK_NAME_LEN = 55
 
+# services are validated in separate processes when validating more than one,
+# since nearly all of the work is CPU-bound YAML parsing and schema validation
+DEFAULT_MAX_WORKERS = os.cpu_count() or 1
+
 
 class ConditionConfig(TypedDict, total=False):
     """
@@ -268,8 +276,12 @@ def no_duplicate_instance_names_message(service, cluster):
     return success(f"All {service}'s instance names in cluster {cluster} are unique")
 
 
+@lru_cache()
 def get_schema_validator(file_type: str) -> Draft4Validator:
-    """Get the correct schema to use for validation
+    """Get the correct schema to use for validation.
+
+    Validators are reusable, so each schema is only loaded and compiled once
+    per process.
 
     :param file_type: what schema type should we validate against
     """
@@ -486,6 +498,37 @@ def add_subparser(subparsers):
         required=False,
         help="Path to root of yelpsoa-configs checkout",
     )
+    validate_parser.add_argument(
+        "-a",
+        "--all",
+        dest="all_services",
+        action="store_true",
+        default=False,
+        help="Validate every service in the yelpsoa-configs checkout.",
+    )
+    validate_parser.add_argument(
+        "--changed-paths",
+        dest="changed_paths",
+        nargs="+",
+        metavar="PATH",
+        default=None,
+        help=(
+            "Only validate the services that these files or directories belong to. "
+            "Relative paths are relative to the yelpsoa-configs root, and the root "
+            "itself means every service."
+        ),
+    )
+    validate_parser.add_argument(
+        "-j",
+        "--max-workers",
+        dest="max_workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=(
+            "Number of services to validate in parallel when validating several "
+            "services (default: %(default)s)"
+        ),
+    )
     validate_parser.set_defaults(command=paasta_validate)
 
 
@@ -1460,11 +1503,138 @@ def paasta_validate_soa_configs(
     return all([check(service_path) for check in checks])
 
 
+def is_validatable_service_dir(soa_dir: str, service: str) -> bool:
+    # NOTE: not all directories in soaconfigs are actually services, so (like
+    # check_monitoring_file_exists) we use the presence of a service.yaml to disambiguate
+    return os.path.isfile(os.path.join(soa_dir, service, "service.yaml"))
+
+
+def list_validatable_services(soa_dir: str) -> List[str]:
+    """Returns a sorted list of every service directory in soa_dir."""
+    return [
+        service
+        for service in list_services(soa_dir=soa_dir)
+        if is_validatable_service_dir(soa_dir, service)
+    ]
+
+
+def get_services_for_changed_paths(soa_dir: str, changed_paths: List[str]) -> List[str]:
+    """Maps changed files/directories to the (sorted, deduplicated) services they belong to.
+
+    :param soa_dir: path to the root of the yelpsoa-configs checkout
+    :param changed_paths: paths, either absolute or relative to soa_dir. The
+                          root of the checkout itself means every service.
+    """
+    soa_dir = os.path.abspath(soa_dir)
+    services = set()
+    for path in changed_paths:
+        relative_path = os.path.relpath(os.path.join(soa_dir, path), start=soa_dir)
+        parts = Path(relative_path).parts
+        if not parts:
+            return list_validatable_services(soa_dir)
+        service = parts[0]
+        if service == os.pardir:
+            continue
+        # paths in deleted services (or non-service directories) have nothing to validate
+        if is_validatable_service_dir(soa_dir, service):
+            services.add(service)
+    return sorted(services)
+
+
+def _validate_service_capturing_output(
+    service: str, soa_dir: str, verbose: bool
+) -> Tuple[str, bool, str]:
+    """Validates a single service, returning its output rather than printing it
+    so that results from concurrent workers aren't interleaved."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            is_valid = paasta_validate_soa_configs(
+                service, os.path.join(soa_dir, service), verbose
+            )
+        except Exception:
+            print(
+                failure(
+                    f"Unexpected error while validating {service}:\n{traceback.format_exc()}",
+                    "http://paasta.readthedocs.io/en/latest/yelpsoa_configs.html",
+                )
+            )
+            is_valid = False
+    return service, is_valid, output.getvalue()
+
+
+def paasta_validate_services(
+    services: List[str],
+    soa_dir: str,
+    verbose: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> List[str]:
+    """Validates several services, fanning them out over a pool of processes.
+
+    Output is printed per service, in the order services were given, regardless of
+    the order in which the workers finish.
+
+    :returns: the services that failed validation
+    """
+    validate = partial(
+        _validate_service_capturing_output, soa_dir=soa_dir, verbose=verbose
+    )
+    invalid_services = []
+    with contextlib.ExitStack() as stack:
+        if max_workers > 1 and len(services) > 1:
+            executor = stack.enter_context(
+                concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+            )
+            results = executor.map(validate, services)
+        else:
+            results = map(validate, services)
+
+        for service, is_valid, output in results:
+            print(PaastaColors.bold(f"{service}:"))
+            print(output, end="")
+            if not is_valid:
+                invalid_services.append(service)
+    return invalid_services
+
+
+def paasta_validate_many(args) -> int:
+    soa_dir = args.yelpsoa_config_root
+    if args.all_services:
+        services = list_validatable_services(soa_dir)
+    else:
+        services = get_services_for_changed_paths(soa_dir, args.changed_paths)
+
+    if not services:
+        print(info_message("No services to validate."))
+        return 0
+
+    invalid_services = paasta_validate_services(
+        services=services,
+        soa_dir=soa_dir,
+        verbose=args.verbose,
+        max_workers=args.max_workers,
+    )
+    if invalid_services:
+        print(
+            failure(
+                f"Invalid configs found in {len(invalid_services)} of {len(services)} services: "
+                + ", ".join(invalid_services),
+                "http://paasta.readthedocs.io/en/latest/yelpsoa_configs.html",
+            )
+        )
+        return 1
+    print(success(f"All {len(services)} services are valid"))
+    return 0
+
+
 def paasta_validate(args):
     """Generate a service_path from the provided args and call paasta_validate_soa_configs
 
     :param args: argparse.Namespace obj created from sys.args by cli
     """
+    if args.all_services or args.changed_paths:
+        return paasta_validate_many(args)
+
     service = args.service or guess_service_name()
     service_path = get_service_path(service, args.yelpsoa_config_root)
 
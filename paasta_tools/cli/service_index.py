@@ -0,0 +1,176 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+An on-disk index of which instances each service has and who owns them, so
+that commands filtering on owner don't need to load every service's configs
+on every invocation.
+
+Each service's entry is keyed on the names, sizes and mtimes of the files in
+its soa-configs directory, and is rebuilt (lazily, the next time it's looked
+up) whenever any of those change.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from mypy_extensions import TypedDict
+
+from paasta_tools.cli.utils import get_instance_configs_for_service
+from paasta_tools.monitoring_tools import get_team
+from paasta_tools.utils import DEFAULT_SOA_DIR
+
+log = logging.getLogger(__name__)
+
+# bump this whenever the format of an entry changes
+INDEX_VERSION = 1
+
+
+class IndexedInstance(TypedDict):
+    cluster: str
+    instance: str
+    instance_type: str
+    team: Optional[str]
+    deploy_group: Optional[str]
+
+
+class ServiceIndexEntry(TypedDict):
+    signature: str
+    team: Optional[str]
+    instances: List[IndexedInstance]
+
+
+def get_default_index_path(soa_dir: str) -> str:
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    soa_dir_hash = hashlib.sha1(os.path.abspath(soa_dir).encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, "paasta", f"service_index-{soa_dir_hash}.json")
+
+
+def get_service_dir_signature(service: str, soa_dir: str) -> str:
+    """Hashes the names, sizes and mtimes of the files in a service's
+    directory - this is a lot cheaper than reading (let alone parsing) them."""
+    stats = []
+    with os.scandir(os.path.join(soa_dir, service)) as entries:
+        for entry in entries:
+            stat = entry.stat()
+            stats.append(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha1("\n".join(sorted(stats)).encode()).hexdigest()
+
+
+def build_service_index_entry(
+    service: str, soa_dir: str, signature: str
+) -> ServiceIndexEntry:
+    instances: List[IndexedInstance] = []
+    for instance_config in get_instance_configs_for_service(service, soa_dir=soa_dir):
+        instances.append(
+            {
+                "cluster": instance_config.get_cluster(),
+                "instance": instance_config.get_instance(),
+                "instance_type": instance_config.get_instance_type(),
+                "team": instance_config.get_team(),
+                "deploy_group": instance_config.get_deploy_group(),
+            }
+        )
+    return {
+        "signature": signature,
+        "team": get_team(overrides={}, service=service, soa_dir=soa_dir),
+        "instances": instances,
+    }
+
+
+class ServiceIndex:
+    """Lazily built, on-disk index of service -> owner, instances, clusters and
+    deploy groups. Call save() to persist any entries that had to be (re)built.
+    """
+
+    def __init__(
+        self, soa_dir: str = DEFAULT_SOA_DIR, index_path: Optional[str] = None
+    ) -> None:
+        self.soa_dir = soa_dir
+        self.index_path = index_path or get_default_index_path(soa_dir)
+        self.entries: Dict[str, ServiceIndexEntry] = self._load()
+        self.dirty = False
+
+    def _load(self) -> Dict[str, ServiceIndexEntry]:
+        try:
+            with open(self.index_path) as f:
+                index: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get("version") != INDEX_VERSION:
+            return {}
+        return index.get("services", {})
+
+    def save(self) -> None:
+        """Writes the index back to disk, if anything changed. Failing to write
+        it (e.g. a read-only home directory) isn't an error, just slower."""
+        if not self.dirty:
+            return
+        index = {"version": INDEX_VERSION, "services": self.entries}
+        try:
+            index_dir = os.path.dirname(self.index_path)
+            os.makedirs(index_dir, exist_ok=True)
+            # write-then-rename, so that concurrent invocations never see a
+            # partially written index
+            with tempfile.NamedTemporaryFile(
+                "w", dir=index_dir, delete=False, suffix=".tmp"
+            ) as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(f.name, self.index_path)
+            self.dirty = False
+        except OSError:
+            log.debug(f"Unable to write service index to {self.index_path}")
+
+    def get(self, service: str) -> ServiceIndexEntry:
+        """Returns the entry for a service, rebuilding it if it's missing or if
+        the service's configs have changed since it was built."""
+        signature = get_service_dir_signature(service, self.soa_dir)
+        entry = self.entries.get(service)
+        if entry is None or entry["signature"] != signature:
+            entry = build_service_index_entry(service, self.soa_dir, signature)
+            self.entries[service] = entry
+            self.dirty = True
+        return entry
+
+    def get_services_owned_by(
+        self,
+        owners: Iterable[str],
+        services: Iterable[str],
+        clusters: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        """Returns which of the given services have at least one instance
+        owned by one of the given owners, where an instance without a team of
+        its own is owned by its service's team.
+
+        :param clusters: only consider instances in these clusters
+        """
+        owners = set(owners)
+        owned = []
+        for service in services:
+            entry = self.get(service)
+            for instance in entry["instances"]:
+                if clusters and instance["cluster"] not in clusters:
+                    continue
+                team = instance["team"]
+                if (team if team is not None else entry["team"]) in owners:
+                    owned.append(service)
+                    break
+        return owned
@@ -16,6 +16,7 @@ import difflib
 import fnmatch
 import getpass
 import hashlib
+import importlib
 import json
 import logging
 import os
@@ -27,6 +28,7 @@ import socket
 import subprocess
 from collections import defaultdict
 from shlex import quote
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 from typing import Collection
@@ -39,34 +41,15 @@ from typing import Optional
 from typing import Sequence
 from typing import Set
 from typing import Tuple
+from typing import cast
 
 import ephemeral_port_reserve
 from mypy_extensions import NamedArg
 
-from paasta_tools import remote_git
 from paasta_tools.adhoc_tools import load_adhoc_job_config
-from paasta_tools.api.client import PaastaOApiClient
-from paasta_tools.api.client import get_paasta_oapi_client
-from paasta_tools.cassandracluster_tools import load_cassandracluster_instance_config
-from paasta_tools.cassandraclustereks_tools import (
-    load_cassandraclustereks_instance_config,
-)
 from paasta_tools.cli.authentication import get_sso_auth_token
-from paasta_tools.eks_tools import EksDeploymentConfig
-from paasta_tools.eks_tools import load_eks_service_config
-from paasta_tools.flink_tools import load_flink_instance_config
-from paasta_tools.flinkeks_tools import load_flinkeks_instance_config
-from paasta_tools.kafkacluster_tools import load_kafkacluster_instance_config
-from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
-from paasta_tools.kubernetes_tools import load_kubernetes_service_config
 from paasta_tools.long_running_service_tools import LongRunningServiceConfig
-from paasta_tools.monkrelaycluster_tools import load_monkrelaycluster_instance_config
-from paasta_tools.nrtsearchservice_tools import load_nrtsearchservice_instance_config
-from paasta_tools.nrtsearchserviceeks_tools import (
-    load_nrtsearchserviceeks_instance_config,
-)
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
-from paasta_tools.tron_tools import load_tron_instance_config
 from paasta_tools.utils import DEFAULT_SOA_CONFIGS_GIT_URL
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import INSTANCE_TYPE_TO_K8S_NAMESPACE
@@ -85,6 +68,11 @@ from paasta_tools.utils import list_services
 from paasta_tools.utils import load_system_paasta_config
 from paasta_tools.utils import validate_service_instance
 
+# every CLI invocation imports this module, so anything that (transitively) pulls
+# in the kubernetes client or the generated API client is imported lazily
+if TYPE_CHECKING:
+    from paasta_tools.api.client import PaastaOApiClient
+
 log = logging.getLogger(__name__)
 
 
@@ -655,6 +643,58 @@ LongRunningServiceLoaderSig = Callable[
 ]
 
 
+def _lazy_loader(module_name: str, loader_name: str) -> LongRunningServiceLoaderSig:
+    """Returns a stand-in for module_name.loader_name that only imports module_name
+    when it's first called. Loaders are always called with keyword arguments.
+
+    Every lazily-loaded loader except tron's returns a LongRunningServiceConfig;
+    tron's stand-in is annotated with the wider InstanceLoaderSig below."""
+
+    def loader(**kwargs: Any) -> Any:
+        return getattr(importlib.import_module(module_name), loader_name)(**kwargs)
+
+    loader.__name__ = loader_name
+    loader.__qualname__ = loader_name
+    return cast(LongRunningServiceLoaderSig, loader)
+
+
+load_cassandracluster_instance_config = _lazy_loader(
+    "paasta_tools.cassandracluster_tools", "load_cassandracluster_instance_config"
+)
+load_cassandraclustereks_instance_config = _lazy_loader(
+    "paasta_tools.cassandraclustereks_tools",
+    "load_cassandraclustereks_instance_config",
+)
+load_eks_service_config = _lazy_loader(
+    "paasta_tools.eks_tools", "load_eks_service_config"
+)
+load_flink_instance_config = _lazy_loader(
+    "paasta_tools.flink_tools", "load_flink_instance_config"
+)
+load_flinkeks_instance_config = _lazy_loader(
+    "paasta_tools.flinkeks_tools", "load_flinkeks_instance_config"
+)
+load_kafkacluster_instance_config = _lazy_loader(
+    "paasta_tools.kafkacluster_tools", "load_kafkacluster_instance_config"
+)
+load_kubernetes_service_config = _lazy_loader(
+    "paasta_tools.kubernetes_tools", "load_kubernetes_service_config"
+)
+load_monkrelaycluster_instance_config = _lazy_loader(
+    "paasta_tools.monkrelaycluster_tools", "load_monkrelaycluster_instance_config"
+)
+load_nrtsearchservice_instance_config = _lazy_loader(
+    "paasta_tools.nrtsearchservice_tools", "load_nrtsearchservice_instance_config"
+)
+load_nrtsearchserviceeks_instance_config = _lazy_loader(
+    "paasta_tools.nrtsearchserviceeks_tools",
+    "load_nrtsearchserviceeks_instance_config",
+)
+load_tron_instance_config: InstanceLoaderSig = _lazy_loader(
+    "paasta_tools.tron_tools", "load_tron_instance_config"
+)
+
+
 class InstanceTypeHandler(NamedTuple):
     lister: InstanceListerSig
     loader: InstanceLoaderSig
@@ -768,6 +808,9 @@ def get_instance_config(
 def get_namespaces_for_secret(
     service: str, cluster: str, secret_name: str, soa_dir: str = DEFAULT_SOA_DIR
 ) -> Set[str]:
+    from paasta_tools.eks_tools import EksDeploymentConfig
+    from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
+
     secret_to_k8s_namespace = set()
 
     k8s_instance_type_classes = {
@@ -894,6 +937,8 @@ def validate_git_sha(sha, git_url):
         validate_full_git_sha(sha)
         return sha
     except argparse.ArgumentTypeError:
+        from paasta_tools import remote_git
+
         refs = remote_git.list_remote_refs(git_url)
         commits = short_to_full_git_sha(short=sha, refs=refs)
         if len(commits) != 1:
@@ -1111,7 +1156,9 @@ def get_paasta_oapi_client_with_auth(
     cluster: str = None,
     system_paasta_config: SystemPaastaConfig = None,
     http_res: bool = False,
-) -> Optional[PaastaOApiClient]:
+) -> Optional["PaastaOApiClient"]:
+    from paasta_tools.api.client import get_paasta_oapi_client
+
     return get_paasta_oapi_client(
         cluster=cluster,
         system_paasta_config=system_paasta_config,
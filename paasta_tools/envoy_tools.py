@@ -199,6 +199,15 @@ def get_backends(
     )
 
 
+def resolve_backend_hostname(address: str) -> str:
+    """Returns the short hostname for a backend's address, or the address itself
+    if it can't be looked up."""
+    try:
+        return socket.gethostbyaddr(address)[0].split(".")[0]
+    except socket.herror:
+        return address
+
+
 def get_multiple_backends(
     services: Optional[Sequence[str]],
     envoy_host: str,
@@ -250,13 +259,7 @@ def get_multiple_backends(
 
                         hostname = address
                         if resolve_hostnames:
-                            try:
-                                hostname = socket.gethostbyaddr(address)[0].split(".")[
-                                    0
-                                ]
-                            except socket.herror:
-                                # Default to the raw IP address if we can't lookup the hostname
-                                pass
+                            hostname = resolve_backend_hostname(address)
 
                         cluster_backends.append(
                             (
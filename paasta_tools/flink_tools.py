@@ -13,6 +13,7 @@
 import asyncio
 import json
 import shutil
+import threading
 from datetime import datetime
 from itertools import groupby
 from typing import Any
@@ -20,6 +21,7 @@ from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 from typing import Union
 from urllib.parse import urljoin
 from urllib.parse import urlparse
@@ -49,12 +51,19 @@ from paasta_tools.paastaapi.model.flink_jobs import FlinkJobs
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import BranchDictV2
 from paasta_tools.utils import PaastaColors
+from paasta_tools.utils import SingleFlightTTLCache
 from paasta_tools.utils import deep_merge_dictionaries
 from paasta_tools.utils import load_service_instance_config
 from paasta_tools.utils import load_v2_deployments_json
 
 FLINK_INGRESS_PORT = 31080
 FLINK_DASHBOARD_TIMEOUT_SECONDS = 5
+# the Flink views of paasta-api (and so `paasta status`) tend to ask for the
+# same things about the same cluster several times within a few seconds
+FLINK_DASHBOARD_CACHE_TTL_SECONDS = 5
+FLINK_SESSION_POOL_SIZE = 16
+# how many jobs' details `paasta status` asks paasta-api for at once
+DEFAULT_FLINK_JOB_FETCH_CONCURRENCY = 8
 CONFIG_KEYS = {"flink-version", "flink-revision"}
 OVERVIEW_KEYS = {
     "taskmanagers",
@@ -254,10 +263,32 @@ def get_flink_ingress_url_root(cluster: str) -> str:
     return f"http://flink.eks.{cluster}.paasta:{FLINK_INGRESS_PORT}/"
 
 
+_flink_sessions: Dict[str, requests.Session] = {}
+_flink_sessions_lock = threading.Lock()
+
+
+def get_flink_session(url: str) -> requests.Session:
+    """Returns a keep-alive session for the host serving url, so that
+    consecutive requests to the same jobmanager (or the ingress in front of it)
+    reuse connections."""
+    parsed = urlparse(url)
+    key = f"{parsed.scheme}://{parsed.netloc}"
+    with _flink_sessions_lock:
+        session = _flink_sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=FLINK_SESSION_POOL_SIZE
+            )
+            session.mount(f"{parsed.scheme}://", adapter)
+            _flink_sessions[key] = session
+    return session
+
+
 def _dashboard_get(cr_name: str, cluster: str, path: str) -> str:
     root = get_flink_ingress_url_root(cluster)
     url = f"{root}{cr_name}/{path}"
-    response = requests.get(url, timeout=FLINK_DASHBOARD_TIMEOUT_SECONDS)
+    response = get_flink_session(url).get(url, timeout=FLINK_DASHBOARD_TIMEOUT_SECONDS)
     response.raise_for_status()
     return response.text
 
@@ -300,7 +331,31 @@ def _get_jm_rest_api_base_url(cr: Mapping[str, Any]) -> str:
     return urljoin(base_url, service_cr_name)
 
 
+flink_endpoint_cache = SingleFlightTTLCache(ttl=FLINK_DASHBOARD_CACHE_TTL_SECONDS)
+
+
+class _FlinkErrorResponse(Exception):
+    """Raised for a non-OK response from the jobmanager, so that it isn't cached."""
+
+    def __init__(self, error: Mapping[str, Any]) -> None:
+        super().__init__(error)
+        self.error = error
+
+
 def curl_flink_endpoint(cr_id: Mapping[str, str], endpoint: str) -> Mapping[str, Any]:
+    """Returns the (filtered) response of a read-only Flink REST API endpoint.
+    Successful responses are cached for a few seconds, and concurrent requests
+    for the same one share a single call to the jobmanager."""
+    key: Tuple[Any, ...] = (*sorted(cr_id.items()), endpoint)
+    try:
+        return flink_endpoint_cache.get(
+            key, lambda: _curl_flink_endpoint(cr_id, endpoint)
+        )
+    except _FlinkErrorResponse as e:
+        return e.error
+
+
+def _curl_flink_endpoint(cr_id: Mapping[str, str], endpoint: str) -> Mapping[str, Any]:
     try:
         cr = get_cr(settings.kubernetes_client, cr_id)
         if cr is None:
@@ -310,13 +365,17 @@ def curl_flink_endpoint(cr_id: Mapping[str, str], endpoint: str) -> Mapping[str,
         # Closing 'base_url' with '/' to force urljoin to append 'endpoint' to the path.
         # If not, urljoin replaces the 'base_url' path with 'endpoint'.
         url = urljoin(base_url + "/", endpoint)
-        response = requests.get(url, timeout=FLINK_DASHBOARD_TIMEOUT_SECONDS)
+        response = get_flink_session(url).get(
+            url, timeout=FLINK_DASHBOARD_TIMEOUT_SECONDS
+        )
         if not response.ok:
-            return {
-                "status": response.status_code,
-                "error": response.reason,
-                "text": response.text,
-            }
+            raise _FlinkErrorResponse(
+                {
+                    "status": response.status_code,
+                    "error": response.reason,
+                    "text": response.text,
+                }
+            )
         return _filter_for_endpoint(response.json(), endpoint)
     except requests.RequestException as e:
         url = e.request.url
@@ -377,7 +436,10 @@ async def get_flink_job_details_from_paasta_api_client(
     :param instance: The instance of the service to retrieve
     :param client: The paasta api client
     :returns: Flink jobs in the flink cluster"""
-    return client.service.get_flink_cluster_job_details(
+    # the client is synchronous, so this runs in a thread to let fetch_flink_job_details
+    # actually fetch several jobs at once
+    return await asyncio.to_thread(
+        client.service.get_flink_cluster_job_details,
         service=service,
         instance=instance,
         job_id=job_id,
@@ -395,7 +457,8 @@ async def get_flink_job_checkpoints_from_paasta_api_client(
     :param job_id: The job ID
     :param client: The paasta api client
     :returns: Checkpoint status for the flink job"""
-    return client.service.get_flink_cluster_job_checkpoints(
+    return await asyncio.to_thread(
+        client.service.get_flink_cluster_job_checkpoints,
         service=service,
         instance=instance,
         job_id=job_id,
@@ -683,30 +746,42 @@ def should_job_info_be_shown(cluster_state: str) -> bool:
 
 
 async def fetch_flink_job_details(
-    service: str, instance: str, job_ids: List[str], client: PaastaOApiClient
+    service: str,
+    instance: str,
+    job_ids: List[str],
+    client: PaastaOApiClient,
+    max_concurrency: int = DEFAULT_FLINK_JOB_FETCH_CONCURRENCY,
 ) -> List[FlinkJobDetails]:
-    jobs_details = await asyncio.gather(
-        *[
-            get_flink_job_details_from_paasta_api_client(
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(job_id: str) -> FlinkJobDetails:
+        async with semaphore:
+            return await get_flink_job_details_from_paasta_api_client(
                 service, instance, job_id, client
             )
-            for job_id in job_ids
-        ]
-    )
+
+    jobs_details = await asyncio.gather(*[fetch(job_id) for job_id in job_ids])
     return list(jobs_details)
 
 
 async def fetch_flink_job_checkpoints(
-    service: str, instance: str, job_ids: List[str], client: PaastaOApiClient
+    service: str,
+    instance: str,
+    job_ids: List[str],
+    client: PaastaOApiClient,
+    max_concurrency: int = DEFAULT_FLINK_JOB_FETCH_CONCURRENCY,
 ) -> Dict[str, Union[FlinkCheckpointStatus, BaseException]]:
     """Fetch checkpoint status for all jobs in parallel, return dict keyed by job_id."""
-    results = await asyncio.gather(
-        *[
-            get_flink_job_checkpoints_from_paasta_api_client(
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(job_id: str) -> FlinkCheckpointStatus:
+        async with semaphore:
+            return await get_flink_job_checkpoints_from_paasta_api_client(
                 service, instance, job_id, client
             )
-            for job_id in job_ids
-        ],
+
+    results = await asyncio.gather(
+        *[fetch(job_id) for job_id in job_ids],
         return_exceptions=True,
     )
     return dict(zip(job_ids, results))
@@ -54,6 +54,7 @@ from mypy_extensions import TypedDict
 from paasta_tools import remote_git
 from paasta_tools.cli.utils import get_instance_configs_for_service
 from paasta_tools.utils import DEFAULT_SOA_DIR
+from paasta_tools.utils import DeploymentRefIndex
 from paasta_tools.utils import atomic_file_write
 from paasta_tools.utils import get_git_url
 from paasta_tools.utils import get_latest_deployment_tag
@@ -154,9 +155,10 @@ def get_deploy_group_mappings(
         return mappings, v2_mappings
 
     remote_refs = remote_refs_future.result()
+    ref_index = DeploymentRefIndex(remote_refs)
 
     tag_by_deploy_group = {
-        dg: get_latest_deployment_tag(remote_refs, dg)
+        dg: get_latest_deployment_tag(ref_index, dg)
         for dg in set(deploy_group_branch_mappings.values())
     }
     state_by_branch_and_sha = get_desired_state_by_branch_and_sha(remote_refs)
@@ -19,6 +19,7 @@ from typing import Union
 import pytz
 import requests.exceptions
 from kubernetes.client import V1Container
+from kubernetes.client import V1ContainerStatus
 from kubernetes.client import V1ControllerRevision
 from kubernetes.client import V1Pod
 from kubernetes.client import V1Probe
@@ -49,8 +50,10 @@ from paasta_tools.long_running_service_tools import ServiceNamespaceConfig
 from paasta_tools.long_running_service_tools import (
     get_expected_instance_count_for_namespace,
 )
+from paasta_tools.smartstack_tools import HaproxyBackend
 from paasta_tools.smartstack_tools import KubeSmartstackEnvoyReplicationChecker
 from paasta_tools.smartstack_tools import match_backends_and_pods
+from paasta_tools.utils import SingleFlightTTLCache
 from paasta_tools.utils import calculate_tail_lines
 
 INSTANCE_TYPES_CR = {
@@ -204,6 +207,63 @@ def restart_replica_by_name(
     )
 
 
+@to_blocking
+async def get_container_tail_lines(
+    service: str,
+    instance: str,
+    instance_type: str,
+    replica_name: str,
+    container_name: str,
+    settings: Any,
+    num_tail_lines: int,
+    previous: bool = False,
+    namespace: Optional[str] = None,
+) -> Optional[MutableMapping[str, Any]]:
+    """Returns the tail of a single container's logs, for containers whose logs
+    weren't fetched as part of instance status.
+
+    :returns: None if there is no such replica or container
+    """
+    if not can_restart_replica(instance_type):
+        raise RuntimeError(
+            f"Container logs not supported for instance type {instance_type}"
+        )
+
+    kube_client = settings.kubernetes_client
+    if kube_client is None:
+        raise RuntimeError("Kubernetes client not available")
+
+    if namespace is None:
+        config_loader = LONG_RUNNING_INSTANCE_TYPE_HANDLERS[instance_type].loader
+        job_config = config_loader(
+            service=service,
+            instance=instance,
+            cluster=settings.cluster,
+            soa_dir=settings.soa_dir,
+            load_deployments=False,
+        )
+        namespace = job_config.get_kubernetes_namespace()
+
+    # only look at this instance's pods, so that this can't be used to read
+    # the logs of anything else
+    pods = await kubernetes_tools.pods_for_service_instance(
+        service, instance, kube_client, namespace=namespace
+    )
+    for pod in pods:
+        if pod.metadata.name != replica_name:
+            continue
+        for container_status in pod.status.container_statuses or []:
+            if container_status.name == container_name:
+                return await get_tail_lines_for_kubernetes_container(
+                    kube_client,
+                    pod,
+                    container_status,
+                    num_tail_lines,
+                    previous=previous,
+                )
+    return None
+
+
 async def autoscaling_status(
     kube_client: kubernetes_tools.KubeClient,
     job_config: LongRunningServiceConfig,
@@ -377,6 +437,142 @@ async def get_backends_from_mesh_status(
     return backends
 
 
+# Mesh state (which nodes exist and what each host's Envoy/HAProxy thinks the
+# backends are) is the same for every service, and status gets polled a lot
+# during deploys - so it's shared between requests for a few seconds.
+DEFAULT_MESH_SNAPSHOT_TTL_S = 10
+DEFAULT_MESH_SNAPSHOT_MAXSIZE = 1024
+
+
+mesh_snapshot_cache = SingleFlightTTLCache(
+    ttl=DEFAULT_MESH_SNAPSHOT_TTL_S, maxsize=DEFAULT_MESH_SNAPSHOT_MAXSIZE
+)
+
+# Backend hostnames are cached separately, since there are far more of them
+# than snapshots (and they'd otherwise evict the snapshots), and since an
+# address's hostname only changes when the address is reused.
+DEFAULT_BACKEND_HOSTNAME_TTL_S = 60
+DEFAULT_BACKEND_HOSTNAME_MAXSIZE = 16384
+
+backend_hostname_cache = SingleFlightTTLCache(
+    ttl=DEFAULT_BACKEND_HOSTNAME_TTL_S, maxsize=DEFAULT_BACKEND_HOSTNAME_MAXSIZE
+)
+
+
+def get_replication_checker(settings: Any) -> KubeSmartstackEnvoyReplicationChecker:
+    """Returns a replication checker for a recent snapshot of the cluster's nodes."""
+    return mesh_snapshot_cache.get(
+        ("nodes", settings.kubernetes_client),
+        lambda: KubeSmartstackEnvoyReplicationChecker(
+            nodes=kubernetes_tools.get_all_nodes(settings.kubernetes_client),
+            system_paasta_config=settings.system_paasta_config,
+        ),
+    )
+
+
+def get_envoy_backends(
+    registration: str,
+    envoy_host: str,
+    envoy_admin_port: int,
+    envoy_admin_endpoint_format: str,
+) -> Dict[str, List[Tuple[envoy_tools.EnvoyBackend, bool]]]:
+    """Like envoy_tools.get_backends, but looked up in a recent snapshot of
+    every service's backends on envoy_host."""
+    all_backends = mesh_snapshot_cache.get(
+        ("envoy", envoy_host, envoy_admin_port, envoy_admin_endpoint_format),
+        lambda: envoy_tools.get_multiple_backends(
+            None,
+            envoy_host=envoy_host,
+            envoy_admin_port=envoy_admin_port,
+            envoy_admin_endpoint_format=envoy_admin_endpoint_format,
+            # resolving every backend of every service would take forever, so
+            # only the ones we're asked about are resolved (and cached) below
+            resolve_hostnames=False,
+        ),
+    )
+    if registration not in all_backends:
+        return {}
+    return {
+        registration: [
+            (
+                envoy_tools.EnvoyBackend(
+                    address=backend["address"],
+                    port_value=backend["port_value"],
+                    hostname=_resolve_backend_hostname(backend["address"]),
+                    eds_health_status=backend["eds_health_status"],
+                    weight=backend["weight"],
+                ),
+                is_casper_proxied_backend,
+            )
+            for backend, is_casper_proxied_backend in all_backends[registration]
+        ]
+    }
+
+
+def _resolve_backend_hostname(address: str) -> str:
+    return backend_hostname_cache.get(
+        address, lambda: envoy_tools.resolve_backend_hostname(address)
+    )
+
+
+def get_smartstack_backends(
+    registration: str,
+    synapse_host: str,
+    synapse_port: int,
+    synapse_haproxy_url_format: str,
+) -> List[HaproxyBackend]:
+    """Like smartstack_tools.get_backends, but looked up in a recent snapshot of
+    every service's backends on synapse_host."""
+    backends_by_service = mesh_snapshot_cache.get(
+        ("smartstack", synapse_host, synapse_port, synapse_haproxy_url_format),
+        lambda: _group_haproxy_backends(
+            smartstack_tools.get_multiple_backends(
+                None,
+                synapse_host=synapse_host,
+                synapse_port=synapse_port,
+                synapse_haproxy_url_format=synapse_haproxy_url_format,
+            )
+        ),
+    )
+    return backends_by_service.get(registration, [])
+
+
+def _group_haproxy_backends(
+    backends: Iterable[HaproxyBackend],
+) -> Dict[str, List[HaproxyBackend]]:
+    grouped: DefaultDict[str, List[HaproxyBackend]] = defaultdict(list)
+    for backend in backends:
+        grouped[backend["pxname"]].append(backend)
+    return dict(grouped)
+
+
+def pick_mesh_host(
+    replication_checker: KubeSmartstackEnvoyReplicationChecker,
+    hosts: Sequence[smartstack_tools.DiscoveredHost],
+    pool: str,
+    service_mesh: ServiceMesh,
+    settings: Any,
+    exclude: Set[str],
+) -> str:
+    """Picks a host to ask about the mesh, preferring one that we already have
+    a snapshot for so that we don't fetch a new one for every request."""
+    if service_mesh == ServiceMesh.ENVOY:
+        port = settings.system_paasta_config.get_envoy_admin_port()
+        url_format = settings.system_paasta_config.get_envoy_admin_endpoint_format()
+    else:
+        port = settings.system_paasta_config.get_synapse_port()
+        url_format = settings.system_paasta_config.get_synapse_haproxy_url_format()
+    host = replication_checker.get_hostname_in_pool(hosts, pool)
+    if mesh_snapshot_cache.is_cached((service_mesh.value, host, port, url_format)):
+        return host
+    for hostname in replication_checker.get_hostnames_in_pool(hosts, pool):
+        if hostname not in exclude and mesh_snapshot_cache.is_cached(
+            (service_mesh.value, hostname, port, url_format)
+        ):
+            return hostname
+    return host
+
+
 async def mesh_status(
     service: str,
     service_mesh: ServiceMesh,
@@ -390,15 +586,7 @@ async def mesh_status(
     registration = job_config.get_registrations()[0]
     instance_pool = job_config.get_pool()
 
-    nodes = await asyncio.to_thread(
-        kubernetes_tools.get_all_nodes,
-        settings.kubernetes_client,
-    )
-
-    replication_checker = KubeSmartstackEnvoyReplicationChecker(
-        nodes=nodes,
-        system_paasta_config=settings.system_paasta_config,
-    )
+    replication_checker = await asyncio.to_thread(get_replication_checker, settings)
     node_hostname_by_location = replication_checker.get_allowed_locations_and_hosts(
         job_config
     )
@@ -422,8 +610,17 @@ async def mesh_status(
     for location, hosts in node_hostname_by_location.items():
         max_retries = 3
 
+        failed_hosts: Set[str] = set()
+
         for attempt in range(max_retries):
-            host = replication_checker.get_hostname_in_pool(hosts, instance_pool)
+            host = pick_mesh_host(
+                replication_checker,
+                hosts,
+                instance_pool,
+                service_mesh,
+                settings,
+                exclude=failed_hosts,
+            )
             try:
                 if service_mesh == ServiceMesh.SMARTSTACK:
                     location_dict = _build_smartstack_location_dict(
@@ -450,6 +647,7 @@ async def mesh_status(
                 return mesh_status
 
             except requests.exceptions.ConnectTimeout:
+                failed_hosts.add(host)
                 if attempt < max_retries - 1:
                     logger.warning(
                         "attempt %s/%s: Unable to connect to %s, retrying (on another host, hopefully)...",
@@ -475,7 +673,7 @@ def _build_envoy_location_dict(
     location: str,
     should_return_individual_backends: bool,
 ) -> MutableMapping[str, Any]:
-    backends = envoy_tools.get_backends(
+    backends = get_envoy_backends(
         registration,
         envoy_host=envoy_host,
         envoy_admin_port=envoy_admin_port,
@@ -519,7 +717,7 @@ def _build_smartstack_location_dict(
     should_return_individual_backends: bool,
 ) -> MutableMapping[str, Any]:
     sorted_backends = sorted(
-        smartstack_tools.get_backends(
+        get_smartstack_backends(
             registration,
             synapse_host=synapse_host,
             synapse_port=synapse_port,
@@ -676,22 +874,16 @@ async def get_pods_for_service_instance_multiple_namespaces(
     kube_client: kubernetes_tools.KubeClient,
     namespaces: Iterable[str],
 ) -> Sequence[V1Pod]:
-    ret: List[V1Pod] = []
-
-    for coro in asyncio.as_completed(
-        [
-            kubernetes_tools.pods_for_service_instance(
-                service=service,
-                instance=instance,
-                kube_client=kube_client,
-                namespace=namespace,
-            )
-            for namespace in namespaces
-        ]
-    ):
-        ret.extend(await coro)
-
-    return ret
+    pods_by_namespace = await kubernetes_tools.async_fan_out_over_namespaces(
+        lambda namespace: kubernetes_tools.pods_for_service_instance(
+            service=service,
+            instance=instance,
+            kube_client=kube_client,
+            namespace=namespace,
+        ),
+        namespaces,
+    )
+    return [pod for pods in pods_by_namespace.values() for pod in pods]
 
 
 def find_all_relevant_namespaces(
@@ -875,6 +1067,75 @@ async def kubernetes_status_v2(
     return status
 
 
+# Reading container logs is the most expensive part of a verbose status request
+# (one or two apiserver calls per container), so logs are only read for
+# containers that look unhealthy, and only so many per request. The rest can be
+# fetched one at a time through get_container_tail_lines.
+DEFAULT_TAIL_LINES_MAX_FETCHES = 32
+DEFAULT_TAIL_LINES_MAX_CONCURRENCY = 8
+
+
+class TailLinesBudget:
+    """Bounds how many container log reads a single status request makes, and
+    how many of them are in flight at once."""
+
+    def __init__(
+        self,
+        max_fetches: int = DEFAULT_TAIL_LINES_MAX_FETCHES,
+        max_concurrency: int = DEFAULT_TAIL_LINES_MAX_CONCURRENCY,
+    ) -> None:
+        self.remaining = max_fetches
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    def take(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+def container_wants_tail_lines(
+    container_status: V1ContainerStatus, state: Optional[str], restarted: bool
+) -> bool:
+    """Whether a container's logs are likely to be interesting, i.e. whether it
+    isn't running and ready or has restarted recently."""
+    return state != "running" or not container_status.ready or restarted
+
+
+async def get_tail_lines_within_budget(
+    client: Any,
+    pod: V1Pod,
+    container_status: V1ContainerStatus,
+    num_tail_lines: int,
+    budget: TailLinesBudget,
+    previous: bool = False,
+) -> MutableMapping[str, Any]:
+    description = "previous logs" if previous else "logs"
+    # no logs are read when no lines are asked for, so that's free
+    if num_tail_lines > 0 and not budget.take():
+        return {
+            "stdout": [],
+            "stderr": [],
+            "error_message": (
+                f"Skipped fetching {description} for {container_status.name}: "
+                "too many containers to fetch logs for at once"
+            ),
+        }
+    async with budget.semaphore:
+        try:
+            return await get_tail_lines_for_kubernetes_container(
+                client,
+                pod,
+                container_status,
+                num_tail_lines,
+                previous=previous,
+            )
+        except asyncio.TimeoutError:
+            return {
+                "error_message": f"Could not fetch {description} for {container_status.name}"
+            }
+
+
 async def get_pod_status_tasks_by_replicaset(
     pods_task: "asyncio.Future[V1Pod]",
     backends_task: "asyncio.Future[Dict[str, Any]]",
@@ -882,6 +1143,7 @@ async def get_pod_status_tasks_by_replicaset(
     verbose: int,
 ) -> Dict[str, List["asyncio.Future[Dict[str, Any]]"]]:
     num_tail_lines = calculate_tail_lines(verbose)
+    tail_lines_budget = TailLinesBudget()
     pods = await pods_task
     tasks_by_replicaset: DefaultDict[
         str, List["asyncio.Future[Dict[str, Any]]"]
@@ -890,7 +1152,9 @@ async def get_pod_status_tasks_by_replicaset(
         for owner_reference in pod.metadata.owner_references:
             if owner_reference.kind == "ReplicaSet":
                 pod_status_task = asyncio.create_task(
-                    get_pod_status(pod, backends_task, client, num_tail_lines)
+                    get_pod_status(
+                        pod, backends_task, client, num_tail_lines, tail_lines_budget
+                    )
                 )
                 tasks_by_replicaset[owner_reference.name].append(pod_status_task)
 
@@ -906,19 +1170,20 @@ async def get_versions_for_replicasets(
     container_port: Optional[int],
 ) -> List[KubernetesVersionDict]:
 
-    replicaset_list: List[V1ReplicaSet] = []
-    for coro in asyncio.as_completed(
-        [
-            kubernetes_tools.replicasets_for_service_instance(
-                service=service,
-                instance=instance,
-                kube_client=kube_client,
-                namespace=namespace,
-            )
-            for namespace in namespaces
-        ]
-    ):
-        replicaset_list.extend(await coro)
+    replicasets_by_namespace = await kubernetes_tools.async_fan_out_over_namespaces(
+        lambda namespace: kubernetes_tools.replicasets_for_service_instance(
+            service=service,
+            instance=instance,
+            kube_client=kube_client,
+            namespace=namespace,
+        ),
+        namespaces,
+    )
+    replicaset_list: List[V1ReplicaSet] = [
+        replicaset
+        for replicasets in replicasets_by_namespace.values()
+        for replicaset in replicasets
+    ]
 
     # For the purpose of active_versions/app_count, don't count replicasets that
     # are at 0/0 unless they have terminating pods.
@@ -968,12 +1233,13 @@ async def get_pod_status(
     backends_task: "asyncio.Future[Dict[str, Any]]",
     client: Any,
     num_tail_lines: int,
+    tail_lines_budget: Optional[TailLinesBudget] = None,
 ) -> Dict[str, Any]:
     events_task = asyncio.create_task(
         get_pod_event_messages(client, pod, max_age_in_seconds=900)
     )
     containers_task = asyncio.create_task(
-        get_pod_containers(pod, client, num_tail_lines)
+        get_pod_containers(pod, client, num_tail_lines, tail_lines_budget)
     )
 
     await asyncio.gather(events_task, containers_task, return_exceptions=True)
@@ -1036,8 +1302,13 @@ def get_container_healthcheck(pod_ip: str, probe: V1Probe) -> Dict[str, Any]:
 
 
 async def get_pod_containers(
-    pod: V1Pod, client: Any, num_tail_lines: int
+    pod: V1Pod,
+    client: Any,
+    num_tail_lines: int,
+    tail_lines_budget: Optional[TailLinesBudget] = None,
 ) -> List[Dict[str, Any]]:
+    if tail_lines_budget is None:
+        tail_lines_budget = TailLinesBudget()
     containers = []
     statuses = pod.status.container_statuses or []
     container_specs = pod.spec.containers
@@ -1093,36 +1364,29 @@ async def get_pod_containers(
 
                     last_timestamp = this_state["started_at"].timestamp()
 
-        async def get_tail_lines() -> MutableMapping[str, Any]:
-            try:
-                return await get_tail_lines_for_kubernetes_container(
-                    client,
-                    pod,
-                    cs,
-                    num_tail_lines,
-                    previous=False,
-                )
-            except asyncio.TimeoutError:
-                return {"error_message": f"Could not fetch logs for {cs.name}"}
-
-        # get previous log lines as well if this container restarted recently
-        async def get_previous_tail_lines() -> MutableMapping[str, Any]:
-            if state == "running" and kubernetes_tools.recent_container_restart(
+        recently_restarted = (
+            state == "running"
+            and kubernetes_tools.recent_container_restart(
                 cs.restart_count, last_state, last_timestamp
+            )
+        )
+
+        async def get_tail_lines() -> Optional[MutableMapping[str, Any]]:
+            if num_tail_lines > 0 and not container_wants_tail_lines(
+                cs, state, recently_restarted
             ):
-                try:
-                    return await get_tail_lines_for_kubernetes_container(
-                        client,
-                        pod,
-                        cs,
-                        num_tail_lines,
-                        previous=True,
-                    )
-                except asyncio.TimeoutError:
-                    return {
-                        "error_message": f"Could not fetch previous logs for {cs.name}"
-                    }
-            return None
+                return None
+            return await get_tail_lines_within_budget(
+                client, pod, cs, num_tail_lines, tail_lines_budget
+            )
+
+        # get previous log lines as well if this container restarted recently
+        async def get_previous_tail_lines() -> Optional[MutableMapping[str, Any]]:
+            if not recently_restarted:
+                return None
+            return await get_tail_lines_within_budget(
+                client, pod, cs, num_tail_lines, tail_lines_budget, previous=True
+            )
 
         tail_lines, previous_tail_lines = await asyncio.gather(
             asyncio.ensure_future(get_tail_lines()),
@@ -1160,6 +1424,7 @@ async def get_pod_status_tasks_by_sha_and_readiness(
     Tuple[str, str], DefaultDict[bool, List["asyncio.Future[Dict[str, Any]]"]]
 ]:
     num_tail_lines = calculate_tail_lines(verbose)
+    tail_lines_budget = TailLinesBudget()
     tasks_by_sha_and_readiness: DefaultDict[
         Tuple[str, str], DefaultDict[bool, List["asyncio.Future[Dict[str, Any]]"]]
     ] = defaultdict(lambda: defaultdict(list))
@@ -1168,7 +1433,9 @@ async def get_pod_status_tasks_by_sha_and_readiness(
         config_sha = pod.metadata.labels["paasta.yelp.com/config_sha"]
         is_ready = kubernetes_tools.is_pod_ready(pod)
         pod_status_task = asyncio.create_task(
-            get_pod_status(pod, backends_task, client, num_tail_lines)
+            get_pod_status(
+                pod, backends_task, client, num_tail_lines, tail_lines_budget
+            )
         )
         tasks_by_sha_and_readiness[(git_sha, config_sha)][is_ready].append(
             pod_status_task
@@ -1185,20 +1452,18 @@ async def get_versions_for_controller_revisions(
     pod_status_by_sha_and_readiness_task: "asyncio.Future[Mapping[Tuple[str, str], Mapping[bool, Sequence[asyncio.Future[Mapping[str, Any]]]]]]",
     container_port: Optional[int] = None,
 ) -> List[KubernetesVersionDict]:
-    controller_revision_list: List[V1ControllerRevision] = []
-
-    for coro in asyncio.as_completed(
-        [
-            kubernetes_tools.controller_revisions_for_service_instance(
-                service=service,
-                instance=instance,
-                kube_client=kube_client,
-                namespace=namespace,
-            )
-            for namespace in namespaces
-        ]
-    ):
-        controller_revision_list.extend(await coro)
+    crs_by_namespace = await kubernetes_tools.async_fan_out_over_namespaces(
+        lambda namespace: kubernetes_tools.controller_revisions_for_service_instance(
+            service=service,
+            instance=instance,
+            kube_client=kube_client,
+            namespace=namespace,
+        ),
+        namespaces,
+    )
+    controller_revision_list: List[V1ControllerRevision] = [
+        cr for crs in crs_by_namespace.values() for cr in crs
+    ]
 
     cr_by_shas: Dict[Tuple[str, str], V1ControllerRevision] = {}
     for cr in controller_revision_list:
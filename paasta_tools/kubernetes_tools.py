@@ -12,6 +12,7 @@
 # limitations under the License.
 import asyncio
 import base64
+import concurrent.futures
 import functools
 import hashlib
 import itertools
@@ -27,6 +28,8 @@ from functools import lru_cache
 from inspect import currentframe
 from pathlib import Path
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 from typing import Collection
 from typing import Container
 from typing import Dict
@@ -40,6 +43,7 @@ from typing import Optional
 from typing import Sequence
 from typing import Set
 from typing import Tuple
+from typing import TypeVar
 from typing import Union
 from typing import cast
 
@@ -176,6 +180,7 @@ from paasta_tools.utils import PaastaNotConfiguredError
 from paasta_tools.utils import PersistentVolume
 from paasta_tools.utils import ProjectedSAVolume
 from paasta_tools.utils import SecretVolume
+from paasta_tools.utils import SingleFlightTTLCache
 from paasta_tools.utils import SystemPaastaConfig
 from paasta_tools.utils import TopologySpreadConstraintDict
 from paasta_tools.utils import VolumeWithMode
@@ -239,6 +244,15 @@ PROJECTED_SA_TOKEN_PATH = "token"
 AUTOSCALING_OVERRIDES_CONFIGMAP_NAME = "paasta-autoscaling-overrides"
 AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE = "paasta"
 
+# each of these is a thread (for the blocking client) and a connection to the
+# API server, so keep this in the region of the client's connection pool size
+DEFAULT_NAMESPACE_FAN_OUT_CONCURRENCY = 16
+DEFAULT_NAMESPACE_FAN_OUT_TIMEOUT_S = 30.0
+
+# long enough to cover a single run of e.g. configure_nerve, short enough that
+# a pod starting or stopping is noticed by the next one
+KUBELET_PODS_CACHE_TTL_S = 5
+
 TEMPLATEABLE_PROVIDERS = {
     METRICS_PROVIDER_UWSGI,
     METRICS_PROVIDER_UWSGI_V2,
@@ -2904,12 +2918,61 @@ def get_k8s_pods() -> Mapping[str, Any]:
     return requests.get("http://127.0.0.1:10255/pods").json()
 
 
+kubelet_pods_cache = SingleFlightTTLCache(ttl=KUBELET_PODS_CACHE_TTL_S, maxsize=1)
+
+
+def slim_kubelet_pod(pod: Mapping[str, Any]) -> Dict[str, Any]:
+    """Keeps only the parts of a pod from the kubelet that the *_running_here
+    helpers look at, in the same shape - dropping the (much larger) rest of
+    the spec, container statuses, managedFields, etc."""
+    metadata = pod.get("metadata", {})
+    annotations = metadata.get("annotations", {})
+    slim_metadata = {
+        key: metadata[key]
+        for key in ("name", "namespace", "labels", "deletionTimestamp")
+        if key in metadata
+    }
+    slim_metadata["annotations"] = {
+        key: annotations[key]
+        for key in ("smartstack_registrations",)
+        if key in annotations
+    }
+    return {
+        "metadata": slim_metadata,
+        "status": {
+            key: pod["status"][key]
+            for key in ("phase", "podIP")
+            if key in pod.get("status", {})
+        },
+        "spec": {
+            "containers": [
+                {key: container[key] for key in ("name", "ports") if key in container}
+                for container in pod.get("spec", {}).get("containers", [])
+            ]
+        },
+    }
+
+
+def get_kubelet_pods() -> Mapping[str, Any]:
+    """Returns the pods on this host, from the local kubelet, as slimmed down
+    by slim_kubelet_pod.
+
+    The kubelet's response can be several MB on a busy host, so it's fetched
+    and parsed at most once per KUBELET_PODS_CACHE_TTL_S, however many times
+    (and threads) this is called.
+    """
+    return kubelet_pods_cache.get(
+        "pods",
+        lambda: {"items": [slim_kubelet_pod(pod) for pod in get_k8s_pods()["items"]]},
+    )
+
+
 def get_all_kubernetes_services_running_here() -> List[Tuple[str, str, int]]:
     """Returns all k8s paasta services, even if not in smartstack. Returns a service, instance, port
     tuple to match the return value of other similar functions"""
     services = []
     try:
-        pods = get_k8s_pods()
+        pods = get_kubelet_pods()
     except requests.exceptions.ConnectionError:
         log.debug("Failed to connect to the kublet when trying to get pods")
         return []
@@ -2927,7 +2990,7 @@ def get_kubernetes_services_running_here(
     exclude_terminating: bool = False,
 ) -> Sequence[KubernetesServiceRegistration]:
     services = []
-    pods = get_k8s_pods()
+    pods = get_kubelet_pods()
     for pod in pods["items"]:
         if (
             pod["status"]["phase"] != "Running"
@@ -3140,6 +3203,162 @@ def get_matching_namespaces(
     ]
 
 
+_FanOutT = TypeVar("_FanOutT")
+
+# cluster-wide list calls (e.g. "CoreV1Api.list_pod_for_all_namespaces") that
+# RBAC has forbidden us from making, so that we don't keep trying them
+_forbidden_cluster_wide_lists: Set[str] = set()
+
+
+def fan_out_over_namespaces(
+    func: Callable[[str], _FanOutT],
+    namespaces: Iterable[str],
+    max_concurrency: int = DEFAULT_NAMESPACE_FAN_OUT_CONCURRENCY,
+    timeout_s: Optional[float] = DEFAULT_NAMESPACE_FAN_OUT_TIMEOUT_S,
+    skip_failed_namespaces: bool = False,
+) -> Dict[str, _FanOutT]:
+    """Calls func(namespace) for each namespace, up to max_concurrency at a
+    time, and returns the results by namespace.
+
+    Raises the first exception raised by func, or a TimeoutError if they
+    haven't all finished within timeout_s - in either case without waiting for
+    any calls that are still running.
+
+    :param skip_failed_namespaces: log and leave out namespaces for which func
+        raised an ApiException, or which didn't finish within timeout_s, rather
+        than raising
+    """
+    namespaces = list(namespaces)
+    results: Dict[str, _FanOutT] = {}
+    if not namespaces:
+        return results
+
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(max_concurrency, len(namespaces))
+    )
+    try:
+        futures = {
+            executor.submit(func, namespace): namespace for namespace in namespaces
+        }
+        done, not_done = concurrent.futures.wait(
+            futures,
+            timeout=timeout_s,
+            return_when=(
+                concurrent.futures.ALL_COMPLETED
+                if skip_failed_namespaces
+                else concurrent.futures.FIRST_EXCEPTION
+            ),
+        )
+        for future in done:
+            namespace = futures[future]
+            try:
+                results[namespace] = future.result()
+            except ApiException as exc:
+                if not skip_failed_namespaces:
+                    raise
+                log.error(
+                    f"Error fetching from namespace {namespace}: "
+                    f"status: {exc.status}, reason: {exc.reason}."
+                )
+        if not_done:
+            message = (
+                f"Timed out after {timeout_s}s waiting on {len(not_done)} of "
+                f"{len(namespaces)} namespaces"
+            )
+            if not skip_failed_namespaces:
+                raise TimeoutError(message)
+            skipped = ", ".join(sorted(futures[future] for future in not_done))
+            log.error(f"{message}, skipping: {skipped}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+async def async_fan_out_over_namespaces(
+    func: Callable[[str], Awaitable[_FanOutT]],
+    namespaces: Iterable[str],
+    max_concurrency: int = DEFAULT_NAMESPACE_FAN_OUT_CONCURRENCY,
+    timeout_s: Optional[float] = DEFAULT_NAMESPACE_FAN_OUT_TIMEOUT_S,
+) -> Dict[str, _FanOutT]:
+    """Like fan_out_over_namespaces, but for coroutine functions - raising
+    asyncio.TimeoutError if they haven't all finished within timeout_s."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call(namespace: str) -> Tuple[str, _FanOutT]:
+        async with semaphore:
+            return namespace, await func(namespace)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(call(namespace) for namespace in namespaces)),
+        timeout=timeout_s,
+    )
+    return dict(results)
+
+
+def list_in_namespaces(
+    namespaced_list: Callable[..., Any],
+    cluster_wide_list: Optional[Callable[..., Any]],
+    namespaces: Collection[str],
+    label_selector: str = "",
+    max_concurrency: int = DEFAULT_NAMESPACE_FAN_OUT_CONCURRENCY,
+    timeout_s: Optional[float] = DEFAULT_NAMESPACE_FAN_OUT_TIMEOUT_S,
+    skip_failed_namespaces: bool = False,
+) -> List[Any]:
+    """Returns the items matching label_selector in any of the namespaces.
+
+    If given the cluster-wide equivalent of namespaced_list (e.g.
+    core.list_pod_for_all_namespaces for core.list_namespaced_pod), this makes
+    a single call to that and drops items from any other namespaces - unless
+    RBAC doesn't allow it (or, with skip_failed_namespaces, it fails at all),
+    in which case it falls back to calling namespaced_list for each namespace
+    concurrently.
+
+    :param timeout_s: used both as the timeout for each request and as the
+        deadline for the whole listing
+    :param skip_failed_namespaces: see fan_out_over_namespaces
+    """
+    namespaces = set(namespaces)
+    if len(namespaces) > 1 and cluster_wide_list is not None:
+        name = getattr(cluster_wide_list, "__qualname__", repr(cluster_wide_list))
+        if name not in _forbidden_cluster_wide_lists:
+            try:
+                response = cluster_wide_list(
+                    label_selector=label_selector, _request_timeout=timeout_s
+                )
+            except ApiException as e:
+                if e.status == 403:
+                    log.info(
+                        f"Not allowed to call {name}, listing each namespace instead"
+                    )
+                    _forbidden_cluster_wide_lists.add(name)
+                elif skip_failed_namespaces:
+                    log.error(
+                        f"Error calling {name}: status: {e.status}, reason: "
+                        f"{e.reason}. Listing each namespace instead."
+                    )
+                else:
+                    raise
+            else:
+                return [
+                    item
+                    for item in response.items
+                    if item.metadata.namespace in namespaces
+                ]
+
+    items_by_namespace = fan_out_over_namespaces(
+        lambda namespace: namespaced_list(
+            namespace=namespace,
+            label_selector=label_selector,
+            _request_timeout=timeout_s,
+        ).items,
+        namespaces,
+        max_concurrency=max_concurrency,
+        timeout_s=timeout_s,
+        skip_failed_namespaces=skip_failed_namespaces,
+    )
+    return [item for items in items_by_namespace.values() for item in items]
+
+
 @functools.lru_cache()
 def ensure_namespace(kube_client: KubeClient, namespace: str) -> None:
     paasta_namespace = V1Namespace(
@@ -3267,6 +3486,25 @@ def list_deployments_in_all_namespaces(
     ]
 
 
+def kube_deployment_from_item(
+    item: Union[V1Deployment, V1StatefulSet]
+) -> KubeDeployment:
+    return KubeDeployment(
+        service=item.metadata.labels["paasta.yelp.com/service"],
+        instance=item.metadata.labels["paasta.yelp.com/instance"],
+        git_sha=item.metadata.labels.get("paasta.yelp.com/git_sha", ""),
+        image_version=item.metadata.labels.get("paasta.yelp.com/image_version", None),
+        namespace=item.metadata.namespace,
+        config_sha=item.metadata.labels["paasta.yelp.com/config_sha"],
+        replicas=(
+            item.spec.replicas
+            if item.metadata.labels.get(paasta_prefixed("autoscaled"), "false")
+            == "false"
+            else None
+        ),
+    )
+
+
 def list_deployments(
     kube_client: KubeClient,
     *,
@@ -3281,22 +3519,7 @@ def list_deployments(
         namespace=namespace, label_selector=label_selector
     )
     return [
-        KubeDeployment(
-            service=item.metadata.labels["paasta.yelp.com/service"],
-            instance=item.metadata.labels["paasta.yelp.com/instance"],
-            git_sha=item.metadata.labels.get("paasta.yelp.com/git_sha", ""),
-            image_version=item.metadata.labels.get(
-                "paasta.yelp.com/image_version", None
-            ),
-            namespace=item.metadata.namespace,
-            config_sha=item.metadata.labels["paasta.yelp.com/config_sha"],
-            replicas=(
-                item.spec.replicas
-                if item.metadata.labels.get(paasta_prefixed("autoscaled"), "false")
-                == "false"
-                else None
-            ),
-        )
+        kube_deployment_from_item(item)
         for item in deployments.items + stateful_sets.items
     ]
 
@@ -3304,23 +3527,28 @@ def list_deployments(
 def list_deployments_in_managed_namespaces(
     kube_client: KubeClient,
     label_selector: str,
+    max_concurrency: int = DEFAULT_NAMESPACE_FAN_OUT_CONCURRENCY,
+    timeout_s: Optional[float] = DEFAULT_NAMESPACE_FAN_OUT_TIMEOUT_S,
 ) -> List[KubeDeployment]:
-    ret: List[KubeDeployment] = []
-    for namespace in get_all_managed_namespaces(kube_client):
-        try:
-            ret.extend(
-                list_deployments(
-                    kube_client=kube_client,
-                    label_selector=label_selector,
-                    namespace=namespace,
-                )
-            )
-        except ApiException as exc:
-            log.error(
-                f"Error fetching deployments from namespace {namespace}: "
-                f"status: {exc.status}, reason: {exc.reason}."
+    namespaces = get_all_managed_namespaces(kube_client)
+    items: List[Union[V1Deployment, V1StatefulSet]] = []
+    for kind in ("deployment", "stateful_set"):
+        items.extend(
+            list_in_namespaces(
+                namespaced_list=getattr(
+                    kube_client.deployments, f"list_namespaced_{kind}"
+                ),
+                cluster_wide_list=getattr(
+                    kube_client.deployments, f"list_{kind}_for_all_namespaces"
+                ),
+                namespaces=namespaces,
+                label_selector=label_selector,
+                max_concurrency=max_concurrency,
+                timeout_s=timeout_s,
+                skip_failed_namespaces=True,
             )
-    return ret
+        )
+    return [kube_deployment_from_item(item) for item in items]
 
 
 def recent_container_restart(
@@ -3362,7 +3590,10 @@ async def get_tail_lines_for_kubernetes_container(
 
         try:
             if num_tail_lines > 0:
-                log = kube_client.core.read_namespaced_pod_log(
+                # in a thread, so that reading many containers' logs at once
+                # doesn't serialize on the event loop
+                log = await asyncio.to_thread(
+                    kube_client.core.read_namespaced_pod_log,
                     name=pod.metadata.name,
                     namespace=pod.metadata.namespace,
                     container=container.name,
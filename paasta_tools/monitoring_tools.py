@@ -21,10 +21,17 @@ on the framework that is asking, and still allows you to set your team
 Everything in here is private, and you shouldn't worry about it.
 """
 import abc
+import atexit
 import json
 import logging
 import os
+import queue
+import threading
+import time
+from functools import lru_cache
+from typing import Any
 from typing import Dict
+from typing import List
 from typing import Mapping
 from typing import Optional
 from typing import Tuple
@@ -153,6 +160,39 @@ def get_description(overrides, service, soa_dir=DEFAULT_SOA_DIR):
     return __get_monitoring_config_value("description", overrides, service, soa_dir)
 
 
+# the monitoring settings that send_event looks up for every event
+EVENT_MONITORING_KEYS = (
+    "team",
+    "page",
+    "tip",
+    "notification_email",
+    "irc_channels",
+    "slack_channels",
+    "ticket",
+    "project",
+    "priority",
+    "tags",
+    "component",
+    "description",
+)
+
+
+@lru_cache(maxsize=None)
+def get_service_monitoring_settings(
+    service: str, soa_dir: str = DEFAULT_SOA_DIR
+) -> Mapping[str, Any]:
+    """Resolves the service-level value of every setting that send_event uses.
+
+    This is memoized for the life of the process, since the crons that send
+    events send lots of them and their configs don't change underneath them.
+    Callers must not modify the returned dict.
+    """
+    return {
+        key: __get_monitoring_config_value(key, {}, service, soa_dir)
+        for key in EVENT_MONITORING_KEYS
+    }
+
+
 def __get_monitoring_config_value(
     key,
     overrides,
@@ -223,7 +263,11 @@ def send_event(
     :param dry_run: Print the Sensu event instead of emitting it
     """
     # This function assumes the input is a string like "mumble.main"
-    team = get_team(overrides, service, soa_dir)
+    service_settings = get_service_monitoring_settings(service, soa_dir)
+    settings = {
+        key: overrides.get(key, service_settings[key]) for key in service_settings
+    }
+    team = settings["team"]
     if not team:
         return
 
@@ -242,9 +286,9 @@ def send_event(
         "status": status,
         "output": output,
         "team": team,
-        "page": get_page(overrides, service, soa_dir),
-        "tip": get_tip(overrides, service, soa_dir),
-        "notification_email": get_notification_email(overrides, service, soa_dir),
+        "page": settings["page"],
+        "tip": settings["tip"],
+        "notification_email": settings["notification_email"],
         "check_every": overrides.get("check_every", "1m"),
         "realert_every": overrides.get(
             "realert_every", monitoring_defaults("realert_every")
@@ -252,18 +296,18 @@ def send_event(
         "alert_after": f"{alert_after}s"
         if isinstance(alert_after, int)
         else alert_after,
-        "irc_channels": get_irc_channels(overrides, service, soa_dir),
-        "slack_channels": get_slack_channels(overrides, service, soa_dir),
-        "ticket": get_ticket(overrides, service, soa_dir),
-        "project": get_project(overrides, service, soa_dir),
-        "priority": get_priority(overrides, service, soa_dir),
+        "irc_channels": settings["irc_channels"],
+        "slack_channels": settings["slack_channels"],
+        "ticket": settings["ticket"],
+        "project": settings["project"],
+        "priority": settings["priority"],
         "source": "paasta-%s" % cluster,
-        "tags": get_tags(overrides, service, soa_dir),
+        "tags": settings["tags"],
         "ttl": ttl,
         "sensu_host": system_paasta_config.get_sensu_host(),
         "sensu_port": system_paasta_config.get_sensu_port(),
-        "component": get_component(overrides, service, soa_dir),
-        "description": get_description(overrides, service, soa_dir),
+        "component": settings["component"],
+        "description": settings["description"],
     }
 
     if dry_run:
@@ -276,7 +320,112 @@ def send_event(
             pprint(result_dict)
 
     elif result_dict.get("sensu_host"):
-        pysensu_yelp.send_event(**result_dict)
+        get_event_sender().send(result_dict)
+
+
+DEFAULT_EVENT_SENDER_WORKERS = 4
+DEFAULT_EVENT_SENDER_QUEUE_SIZE = 1000
+# pysensu_yelp doesn't time out connecting to the Sensu client, so don't let a
+# wedged client hold up exit forever
+DEFAULT_EVENT_SENDER_FLUSH_TIMEOUT_S = 30.0
+
+
+class SensuEventSender:
+    """Sends events to Sensu from a few background threads, so that callers
+    don't wait on a connection to the Sensu client for every event.
+
+    pysensu_yelp makes a new connection per event (the Sensu client socket
+    takes one check result per connection), so the workers overlap those
+    rather than reusing connections. The queue is bounded: once it's full,
+    send() blocks rather than dropping events.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_EVENT_SENDER_WORKERS,
+        max_queue_size: int = DEFAULT_EVENT_SENDER_QUEUE_SIZE,
+    ) -> None:
+        self.max_workers = max_workers
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue_size)
+        self.workers: List[threading.Thread] = []
+        self.workers_lock = threading.Lock()
+        self.counts_lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+
+    def _ensure_started(self) -> None:
+        if self.workers:
+            return
+        with self.workers_lock:
+            if self.workers:
+                return
+            for i in range(self.max_workers):
+                worker = threading.Thread(
+                    target=self._run, name=f"sensu-event-sender-{i}", daemon=True
+                )
+                worker.start()
+                self.workers.append(worker)
+            atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            event = self.queue.get()
+            try:
+                pysensu_yelp.send_event(**event)
+                with self.counts_lock:
+                    self.sent += 1
+            except Exception:
+                with self.counts_lock:
+                    self.failed += 1
+                log.exception(f"Failed to send event {event['name']} to Sensu")
+            finally:
+                self.queue.task_done()
+
+    def send(self, event: Dict[str, Any]) -> None:
+        self._ensure_started()
+        self.queue.put(event)
+
+    def flush(self, timeout_s: float = DEFAULT_EVENT_SENDER_FLUSH_TIMEOUT_S) -> bool:
+        """Waits for every event sent so far to be sent to Sensu.
+
+        :param timeout_s: how long to wait before giving up on the rest
+        :returns: whether every event was sent before the deadline
+        """
+        if not self.workers:
+            return True
+        deadline = time.monotonic() + timeout_s
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    log.warning(
+                        f"Gave up after {timeout_s}s waiting on Sensu; "
+                        f"{self.queue.unfinished_tasks} events were not sent"
+                    )
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+
+_event_sender: Optional[SensuEventSender] = None
+_event_sender_lock = threading.Lock()
+
+
+def get_event_sender() -> SensuEventSender:
+    global _event_sender
+    if _event_sender is None:
+        with _event_sender_lock:
+            if _event_sender is None:
+                _event_sender = SensuEventSender()
+    return _event_sender
+
+
+def flush_events(timeout_s: float = DEFAULT_EVENT_SENDER_FLUSH_TIMEOUT_S) -> bool:
+    """Waits for every event passed to send_event so far to be sent to Sensu.
+    This happens at exit anyway, but can be used to bound when it happens."""
+    if _event_sender is not None:
+        return _event_sender.flush(timeout_s=timeout_s)
+    return True
 
 
 @time_cache(ttl=5)
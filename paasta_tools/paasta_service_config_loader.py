@@ -12,11 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
+from typing import Any
 from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Tuple
 from typing import Type
+from typing import cast
 
 from service_configuration_lib import read_service_configuration
 
@@ -24,7 +26,6 @@ from paasta_tools import utils
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import InstanceConfig_T
 from paasta_tools.utils import NoDeploymentsAvailable
-from paasta_tools.utils import deep_merge_dictionaries
 from paasta_tools.utils import list_clusters
 from paasta_tools.utils import load_service_instance_configs
 from paasta_tools.utils import load_v2_deployments_json
@@ -33,6 +34,28 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
+def _merge_with_shared_defaults(
+    overrides: Dict[str, Any], defaults: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Merges overrides on top of defaults like deep_merge_dictionaries, but
+    without copying defaults first: only the dicts along the paths that
+    overrides actually touches are copied, and every other value is shared
+    with defaults.
+
+    The top-level dict is always a new object, so callers may set top-level
+    keys on the result, but nested values coming from defaults must be treated
+    as read-only.
+    """
+    result = dict(defaults)
+    for key, value in overrides.items():
+        child = result.get(key)
+        if isinstance(value, dict) and isinstance(child, dict):
+            result[key] = _merge_with_shared_defaults(value, child)
+        else:
+            result[key] = value
+    return result
+
+
 class PaastaServiceConfigLoader:
     """PaastaServiceConfigLoader provides useful methods for reading soa-configs and
     iterating instance names or InstanceConfigs objects.
@@ -160,7 +183,16 @@ class PaastaServiceConfigLoader:
             self._general_config = read_service_configuration(
                 service_name=self._service, soa_dir=self._soa_dir
             )
-        return deep_merge_dictionaries(overrides=config, defaults=self._general_config)
+        # the general config is the same for every instance of the service, so
+        # rather than deep-copying it for each one, instances share whatever
+        # parts of it they don't override.
+        return cast(
+            utils.InstanceConfigDict,
+            _merge_with_shared_defaults(
+                overrides=cast(Dict[str, Any], config),
+                defaults=self._general_config,
+            ),
+        )
 
     def _create_service_config(
         self,
@@ -179,7 +211,7 @@ class PaastaServiceConfigLoader:
 
         merged_config = self._get_merged_config(config)
 
-        temp_instance_config = config_class(
+        instance_config = config_class(
             service=self._service,
             cluster=cluster,
             instance=instance,
@@ -188,13 +220,10 @@ class PaastaServiceConfigLoader:
             soa_dir=self._soa_dir,
         )
 
-        branch_dict = self._get_branch_dict(cluster, instance, temp_instance_config)
-
-        return config_class(
-            service=self._service,
-            cluster=cluster,
-            instance=instance,
-            config_dict=merged_config,
-            branch_dict=branch_dict,
-            soa_dir=self._soa_dir,
+        # the branch and deploy group only depend on config_dict, so the
+        # branch_dict can be filled in after the fact rather than constructing
+        # the config a second time.
+        instance_config.branch_dict = self._get_branch_dict(
+            cluster, instance, instance_config
         )
+        return instance_config
@@ -36,6 +36,7 @@ from paasta_tools.paastaapi.model.instance_mesh_status import InstanceMeshStatus
 from paasta_tools.paastaapi.model.instance_replica_restart_outcome import InstanceReplicaRestartOutcome
 from paasta_tools.paastaapi.model.instance_status import InstanceStatus
 from paasta_tools.paastaapi.model.instance_tasks import InstanceTasks
+from paasta_tools.paastaapi.model.task_tail_lines import TaskTailLines
 
 
 class ServiceApi(object):
@@ -952,6 +953,176 @@ class ServiceApi(object):
             callable=__get_flink_cluster_overview
         )
 
+        def __instance_replica_container_logs(
+            self,
+            service,
+            instance,
+            replica_name,
+            container_name,
+            **kwargs
+        ):
+            """Get the tail of a container&#39;s logs, for containers whose logs instance status skipped  # noqa: E501
+
+            This method makes a synchronous HTTP request by default. To make an
+            asynchronous HTTP request, please pass async_req=True
+
+            >>> thread = api.instance_replica_container_logs(service, instance, replica_name, container_name, async_req=True)
+            >>> result = thread.get()
+
+            Args:
+                service (str): Service name
+                instance (str): Instance name
+                replica_name (str): Replica (pod) name
+                container_name (str): Container name
+
+            Keyword Args:
+                tail_lines (int): Number of lines to return. [optional] if omitted the server will use the default value of 100
+                previous (bool): Return the logs of the container&#39;s previous run, i.e. from before it restarted. [optional] if omitted the server will use the default value of False
+                namespace (str): Kubernetes namespace of the replica, if not the instance&#39;s own. [optional]
+                _return_http_data_only (bool): response data without head status
+                    code and headers. Default is True.
+                _preload_content (bool): if False, the urllib3.HTTPResponse object
+                    will be returned without reading/decoding response data.
+                    Default is True.
+                _request_timeout (float/tuple): timeout setting for this request. If one
+                    number provided, it will be total request timeout. It can also
+                    be a pair (tuple) of (connection, read) timeouts.
+                    Default is None.
+                _check_input_type (bool): specifies if type checking
+                    should be done one the data sent to the server.
+                    Default is True.
+                _check_return_type (bool): specifies if type checking
+                    should be done one the data received from the server.
+                    Default is True.
+                _host_index (int/None): specifies the index of the server
+                    that we want to use.
+                    Default is read from the configuration.
+                async_req (bool): execute request asynchronously
+
+            Returns:
+                TaskTailLines
+                    If the method is called asynchronously, returns the request
+                    thread.
+            """
+            kwargs['async_req'] = kwargs.get(
+                'async_req', False
+            )
+            kwargs['_return_http_data_only'] = kwargs.get(
+                '_return_http_data_only', True
+            )
+            kwargs['_preload_content'] = kwargs.get(
+                '_preload_content', True
+            )
+            kwargs['_request_timeout'] = kwargs.get(
+                '_request_timeout', None
+            )
+            kwargs['_check_input_type'] = kwargs.get(
+                '_check_input_type', True
+            )
+            kwargs['_check_return_type'] = kwargs.get(
+                '_check_return_type', True
+            )
+            kwargs['_host_index'] = kwargs.get('_host_index')
+            kwargs['service'] = \
+                service
+            kwargs['instance'] = \
+                instance
+            kwargs['replica_name'] = \
+                replica_name
+            kwargs['container_name'] = \
+                container_name
+            return self.call_with_http_info(**kwargs)
+
+        self.instance_replica_container_logs = Endpoint(
+            settings={
+                'response_type': (TaskTailLines,),
+                'auth': [],
+                'endpoint_path': '/services/{service}/{instance}/replicas/{replica_name}/containers/{container_name}/logs',
+                'operation_id': 'instance_replica_container_logs',
+                'http_method': 'GET',
+                'servers': None,
+            },
+            params_map={
+                'all': [
+                    'service',
+                    'instance',
+                    'replica_name',
+                    'container_name',
+                    'tail_lines',
+                    'previous',
+                    'namespace',
+                ],
+                'required': [
+                    'service',
+                    'instance',
+                    'replica_name',
+                    'container_name',
+                ],
+                'nullable': [
+                ],
+                'enum': [
+                ],
+                'validation': [
+                    'tail_lines',
+                ]
+            },
+            root_map={
+                'validations': {
+                    ('tail_lines',): {
+
+                        'inclusive_maximum': 1000,
+                        'inclusive_minimum': 1,
+                    },
+                },
+                'allowed_values': {
+                },
+                'openapi_types': {
+                    'service':
+                        (str,),
+                    'instance':
+                        (str,),
+                    'replica_name':
+                        (str,),
+                    'container_name':
+                        (str,),
+                    'tail_lines':
+                        (int,),
+                    'previous':
+                        (bool,),
+                    'namespace':
+                        (str,),
+                },
+                'attribute_map': {
+                    'service': 'service',
+                    'instance': 'instance',
+                    'replica_name': 'replica_name',
+                    'container_name': 'container_name',
+                    'tail_lines': 'tail_lines',
+                    'previous': 'previous',
+                    'namespace': 'namespace',
+                },
+                'location_map': {
+                    'service': 'path',
+                    'instance': 'path',
+                    'replica_name': 'path',
+                    'container_name': 'path',
+                    'tail_lines': 'query',
+                    'previous': 'query',
+                    'namespace': 'query',
+                },
+                'collection_format_map': {
+                }
+            },
+            headers_map={
+                'accept': [
+                    'application/json'
+                ],
+                'content_type': [],
+            },
+            api_client=api_client,
+            callable=__instance_replica_container_logs
+        )
+
         def __instance_replica_restart(
             self,
             service,
@@ -21,12 +21,19 @@ Command line options:
 - -v, --verbose: Verbose output
 """
 import argparse
+import concurrent.futures
 import logging
 import sys
 from typing import Any
+from typing import Iterable
+from typing import List
 from typing import Mapping
+from typing import NamedTuple
 from typing import Optional
 from typing import Sequence
+from typing import Set
+from typing import Tuple
+from typing import Union
 
 from kubernetes.client.exceptions import ApiException
 
@@ -53,6 +60,37 @@ from paasta_tools.utils import load_system_paasta_config
 
 log = logging.getLogger(__name__)
 
+# bound on the number of concurrent create/replace calls we make to the apiserver
+DEFAULT_MAX_WORKERS = 8
+
+
+class CustomResourceIndex:
+    """Existing custom resources indexed for O(1) lookups while reconciling.
+
+    Resources are indexed both by (service, instance, kind) - to decide whether
+    a resource needs to be created - and by their full identity (which includes
+    the config and git shas) to decide whether an existing one is up to date.
+    """
+
+    def __init__(self, custom_resources: Iterable[KubeCustomResource]) -> None:
+        self.resources: Set[KubeCustomResource] = set(custom_resources)
+        self.keys: Set[Tuple[str, str, str]] = {
+            (cr.service, cr.instance, cr.kind) for cr in self.resources
+        }
+
+    def exists(self, service: str, instance: str, kind: str) -> bool:
+        return (service, instance, kind) in self.keys
+
+    def __contains__(self, custom_resource: object) -> bool:
+        return custom_resource in self.resources
+
+
+class CustomResourceChange(NamedTuple):
+    # either "create" or "update"
+    action: str
+    desired_resource: KubeCustomResource
+    formatted_resource: Mapping[str, Any]
+
 
 class StdoutKubeClient:
     """Replace all destructive operations in Kubernetes APIs with
@@ -115,6 +153,13 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "-c", "--cluster", default=None, help="Cluster to setup CRs for"
     )
+    parser.add_argument(
+        "--max-workers",
+        dest="max_workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="Maximum number of custom resources to create/update concurrently (default: %(default)s)",
+    )
     args = parser.parse_args()
     return args
 
@@ -141,6 +186,8 @@ def main() -> None:
         custom_resource_definitions=custom_resource_definitions,
         service=args.service,
         instance=args.instance,
+        # the dry-run client dumps YAML to stdout, which we don't want interleaved
+        max_workers=1 if args.dry_run else args.max_workers,
     )
     sys.exit(0 if setup_kube_succeeded else 1)
 
@@ -152,6 +199,7 @@ def setup_all_custom_resources(
     custom_resource_definitions: Sequence[CustomResourceDefinition],
     service: str = None,
     instance: str = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> bool:
 
     got_results = False
@@ -205,6 +253,7 @@ def setup_all_custom_resources(
                     service=service,
                     instance=instance,
                     soa_dir=soa_dir,
+                    max_workers=max_workers,
                 )
             )
         if results:
@@ -228,29 +277,46 @@ def setup_custom_resources(
     service: str = None,
     instance: str = None,
     soa_dir: str = DEFAULT_SOA_DIR,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> bool:
     succeded = True
-    if config_dicts:
-        crs = list_custom_resources(
+    if not config_dicts:
+        return succeded
+
+    custom_resources = CustomResourceIndex(
+        list_custom_resources(
             kube_client=kube_client, kind=kind, version=version, group=group
         )
+    )
+    changes: List[CustomResourceChange] = []
     for svc, config in config_dicts.items():
         if service is not None and service != svc:
             continue
-        if not reconcile_kubernetes_resource(
-            kube_client=kube_client,
+        service_changes, service_succeeded = get_custom_resource_changes(
             service=svc,
             instance=instance,
             instance_configs=config,
             kind=kind,
-            custom_resources=crs,
+            custom_resources=custom_resources,
             version=version,
             group=group,
             cluster=cluster,
             crd=crd,
             soa_dir=soa_dir,
-        ):
+        )
+        changes.extend(service_changes)
+        if not service_succeeded:
             succeded = False
+
+    if not apply_custom_resource_changes(
+        kube_client=kube_client,
+        changes=changes,
+        kind=kind,
+        version=version,
+        group=group,
+        max_workers=max_workers,
+    ):
+        succeded = False
     return succeded
 
 
@@ -324,11 +390,10 @@ def format_custom_resource(
     return resource
 
 
-def reconcile_kubernetes_resource(
-    kube_client: KubeClient,
+def get_custom_resource_changes(
     service: str,
     instance_configs: Mapping[str, Any],
-    custom_resources: Sequence[KubeCustomResource],
+    custom_resources: Union[Sequence[KubeCustomResource], CustomResourceIndex],
     kind: KubeKind,
     version: str,
     group: str,
@@ -336,8 +401,18 @@ def reconcile_kubernetes_resource(
     cluster: str,
     instance: str = None,
     soa_dir: str = DEFAULT_SOA_DIR,
-) -> bool:
+) -> Tuple[List[CustomResourceChange], bool]:
+    """Works out which of a service's custom resources need to be created or
+    updated, without making any changes.
+
+    :returns: a tuple of (changes, succeeded) - where succeeded is False if any
+              instance could not be formatted
+    """
+    if not isinstance(custom_resources, CustomResourceIndex):
+        custom_resources = CustomResourceIndex(custom_resources)
+
     succeeded = True
+    changes: List[CustomResourceChange] = []
     config_handler = LONG_RUNNING_INSTANCE_TYPE_HANDLERS[crd.file_prefix]
 
     is_eks = False
@@ -387,34 +462,126 @@ def reconcile_kubernetes_resource(
                 name=formatted_resource["metadata"]["name"],
                 namespace=f"paasta-{kind.plural}",
             )
-            if not (service, inst, kind.singular) in [
-                (c.service, c.instance, c.kind) for c in custom_resources
-            ]:
+            if not custom_resources.exists(service, inst, kind.singular):
                 log.info(f"{desired_resource} does not exist so creating")
-                create_custom_resource(
-                    kube_client=kube_client,
-                    version=version,
-                    kind=kind,
-                    formatted_resource=formatted_resource,
-                    group=group,
+                changes.append(
+                    CustomResourceChange("create", desired_resource, formatted_resource)
                 )
             elif desired_resource not in custom_resources:
-                sanitised_service = sanitise_kubernetes_name(service)
-                sanitised_instance = sanitise_kubernetes_name(inst)
                 log.info(f"{desired_resource} exists but config_sha doesn't match")
-                update_custom_resource(
-                    kube_client=kube_client,
-                    name=f"{sanitised_service}-{sanitised_instance}",
-                    version=version,
-                    kind=kind,
-                    formatted_resource=formatted_resource,
-                    group=group,
+                changes.append(
+                    CustomResourceChange("update", desired_resource, formatted_resource)
                 )
             else:
                 log.info(f"{desired_resource} is up to date, no action taken")
         except Exception as e:
             log.error(str(e))
             succeeded = False
+    return changes, succeeded
+
+
+def apply_custom_resource_change(
+    kube_client: KubeClient,
+    change: CustomResourceChange,
+    kind: KubeKind,
+    version: str,
+    group: str,
+) -> None:
+    if change.action == "create":
+        create_custom_resource(
+            kube_client=kube_client,
+            version=version,
+            kind=kind,
+            formatted_resource=change.formatted_resource,
+            group=group,
+        )
+    else:
+        sanitised_service = sanitise_kubernetes_name(change.desired_resource.service)
+        sanitised_instance = sanitise_kubernetes_name(change.desired_resource.instance)
+        update_custom_resource(
+            kube_client=kube_client,
+            name=f"{sanitised_service}-{sanitised_instance}",
+            version=version,
+            kind=kind,
+            formatted_resource=change.formatted_resource,
+            group=group,
+        )
+
+
+def apply_custom_resource_changes(
+    kube_client: KubeClient,
+    changes: Sequence[CustomResourceChange],
+    kind: KubeKind,
+    version: str,
+    group: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> bool:
+    """Creates/updates custom resources using a bounded pool of workers.
+
+    :returns: False if any change failed to apply
+    """
+    succeeded = True
+    if not changes:
+        return succeeded
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                apply_custom_resource_change,
+                kube_client=kube_client,
+                change=change,
+                kind=kind,
+                version=version,
+                group=group,
+            ): change
+            for change in changes
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                log.error(
+                    f"Failed to {futures[future].action} {futures[future].desired_resource}: {e}"
+                )
+                succeeded = False
+    return succeeded
+
+
+def reconcile_kubernetes_resource(
+    kube_client: KubeClient,
+    service: str,
+    instance_configs: Mapping[str, Any],
+    custom_resources: Union[Sequence[KubeCustomResource], CustomResourceIndex],
+    kind: KubeKind,
+    version: str,
+    group: str,
+    crd: CustomResourceDefinition,
+    cluster: str,
+    instance: str = None,
+    soa_dir: str = DEFAULT_SOA_DIR,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> bool:
+    changes, succeeded = get_custom_resource_changes(
+        service=service,
+        instance=instance,
+        instance_configs=instance_configs,
+        custom_resources=custom_resources,
+        kind=kind,
+        version=version,
+        group=group,
+        crd=crd,
+        cluster=cluster,
+        soa_dir=soa_dir,
+    )
+    if not apply_custom_resource_changes(
+        kube_client=kube_client,
+        changes=changes,
+        kind=kind,
+        version=version,
+        group=group,
+        max_workers=max_workers,
+    ):
+        succeeded = False
     return succeeded
 
 
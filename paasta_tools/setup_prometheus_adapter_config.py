@@ -15,11 +15,13 @@
 Small utility to update the Prometheus adapter's config to match soaconfigs.
 """
 import argparse
+import json
 import logging
 import sys
 from pathlib import Path
 from typing import Dict
 from typing import List
+from typing import MutableMapping
 from typing import Optional
 from typing import Set
 from typing import Tuple
@@ -32,6 +34,7 @@ from kubernetes.client import V1ObjectMeta
 from kubernetes.client.rest import ApiException
 from mypy_extensions import TypedDict
 
+from paasta_tools import __version__
 from paasta_tools.autoscaling.utils import MetricsProviderDict
 from paasta_tools.eks_tools import EksDeploymentConfig
 from paasta_tools.kubernetes_tools import TEMPLATEABLE_PROVIDERS
@@ -74,6 +77,8 @@ from paasta_tools.long_running_service_tools import METRICS_PROVIDER_UWSGI_V2
 from paasta_tools.long_running_service_tools import METRICS_PROVIDER_WORKER_LOAD
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
 from paasta_tools.utils import DEFAULT_SOA_DIR
+from paasta_tools.utils import atomic_file_write
+from paasta_tools.utils import get_config_hash
 from paasta_tools.utils import get_services_for_cluster
 from paasta_tools.utils import load_system_paasta_config
 
@@ -143,6 +148,16 @@ class PrometheusAdapterRule(TypedDict):
     metricsQuery: str
 
 
+class PrometheusAdapterRuleCacheEntry(TypedDict):
+    """
+    The per-instance rules we rendered on a previous run, keyed (in the rule cache) by
+    service.instance and stored alongside a hash of everything that went into them.
+    """
+
+    hash: str
+    rules: List[PrometheusAdapterRule]
+
+
 class PrometheusAdapterConfig(TypedDict):
     """
     Typed version of the Prometheus adapter configuration dictionary.
@@ -188,6 +203,16 @@ def parse_args() -> argparse.Namespace:
         default=False,
         help="Enable verbose logging.",
     )
+    parser.add_argument(
+        "--rule-cache",
+        dest="rule_cache",
+        default=None,
+        type=Path,
+        help=(
+            "Path to a file in which to cache the rules generated for each instance between runs. "
+            "Only instances whose autoscaling config changed will have their rules regenerated."
+        ),
+    )
 
     return parser.parse_args()
 
@@ -1420,14 +1445,77 @@ def get_rules_for_service_instance(
     return rules
 
 
+def get_rules_hash_for_service_instance(
+    service_name: str,
+    instance_config: KubernetesDeploymentConfig,
+    paasta_cluster: str,
+) -> str:
+    """
+    Returns a hash of everything that goes into the per-instance rules for a service instance,
+    so that we can tell whether previously-generated rules can be reused as-is.
+
+    The paasta_tools version is included so that changes to the rule templates themselves
+    invalidate everything that was rendered by an older version.
+    """
+    return get_config_hash(
+        {
+            "paasta_tools_version": __version__,
+            "paasta_cluster": paasta_cluster,
+            "service": service_name,
+            "instance": instance_config.instance,
+            "namespace": instance_config.get_namespace(),
+            "registrations": instance_config.get_registrations(),
+            "use_raw_ksm_queries": load_system_paasta_config().get_use_raw_ksm_queries(),
+            "metrics_providers": [
+                instance_config.get_autoscaling_metrics_provider(provider_type)
+                for provider_type in ALL_METRICS_PROVIDERS
+                if provider_type not in TEMPLATEABLE_PROVIDERS
+            ],
+        }
+    )
+
+
+def load_rule_cache(
+    path: Optional[Path],
+) -> Dict[str, PrometheusAdapterRuleCacheEntry]:
+    if path is None:
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        log.warning(f"Unable to read rule cache at {path}, regenerating all rules.")
+        return {}
+
+
+def save_rule_cache(
+    path: Optional[Path], rule_cache: Dict[str, PrometheusAdapterRuleCacheEntry]
+) -> None:
+    if path is None:
+        return
+    try:
+        with atomic_file_write(str(path)) as f:
+            json.dump(rule_cache, f, sort_keys=True)
+    except OSError:
+        log.warning(f"Unable to write rule cache to {path}.", exc_info=True)
+
+
 def create_prometheus_adapter_config(
-    paasta_cluster: str, soa_dir: Path
+    paasta_cluster: str,
+    soa_dir: Path,
+    rule_cache: Optional[MutableMapping[str, PrometheusAdapterRuleCacheEntry]] = None,
 ) -> PrometheusAdapterConfig:
     """
     Given a paasta cluster and a soaconfigs directory, create the necessary Prometheus adapter
     config to autoscale services.
     Currently supports the following metrics providers:
         * uwsgi
+
+    If a rule_cache is passed in, per-instance rules are only rendered for instances whose
+    inputs changed since the cache was populated - the cache is updated in-place (including
+    dropping any instances that no longer exist).
     """
     rules: List[PrometheusAdapterRule] = []
     # get_services_for_cluster() returns a list of (service, instance) tuples, but this
@@ -1453,6 +1541,8 @@ def create_prometheus_adapter_config(
     # when shared rules are enabled, collect unique (provider_type, window) combos for
     # templateable providers instead of emitting one rule per instance.
     seen_combos: Set[Tuple[str, int]] = set()
+    seen_instances: Set[str] = set()
+    rendered = reused = 0
 
     for service_name in services:
         config_loader = PaastaServiceConfigLoader(
@@ -1473,15 +1563,49 @@ def create_prometheus_adapter_config(
                             DEFAULT_MOVING_AVERAGE_WINDOW_BY_PROVIDER[provider_type],
                         )
                         seen_combos.add((provider_type, window))
-                # still emit per-instance rules for non-templateable providers
-                rules.extend(
-                    get_rules_for_service_instance(
-                        service_name=service_name,
-                        instance_config=instance_config,
-                        paasta_cluster=paasta_cluster,
-                        skip_providers=TEMPLATEABLE_PROVIDERS,
+
+                if rule_cache is None:
+                    # still emit per-instance rules for non-templateable providers
+                    rules.extend(
+                        get_rules_for_service_instance(
+                            service_name=service_name,
+                            instance_config=instance_config,
+                            paasta_cluster=paasta_cluster,
+                            skip_providers=TEMPLATEABLE_PROVIDERS,
+                        )
                     )
+                    continue
+
+                cache_key = f"{service_name}.{instance_config.instance}"
+                seen_instances.add(cache_key)
+                rules_hash = get_rules_hash_for_service_instance(
+                    service_name=service_name,
+                    instance_config=instance_config,
+                    paasta_cluster=paasta_cluster,
                 )
+                cached = rule_cache.get(cache_key)
+                if cached is None or cached["hash"] != rules_hash:
+                    cached = {
+                        "hash": rules_hash,
+                        "rules": get_rules_for_service_instance(
+                            service_name=service_name,
+                            instance_config=instance_config,
+                            paasta_cluster=paasta_cluster,
+                            skip_providers=TEMPLATEABLE_PROVIDERS,
+                        ),
+                    }
+                    rule_cache[cache_key] = cached
+                    rendered += 1
+                else:
+                    reused += 1
+                rules.extend(cached["rules"])
+
+    if rule_cache is not None:
+        for stale_key in set(rule_cache) - seen_instances:
+            del rule_cache[stale_key]
+        log.info(
+            f"Rendered rules for {rendered} instance(s), reused cached rules for {reused}."
+        )
 
     for provider_type, window in seen_combos:
         rules.append(create_shared_scaling_rule(paasta_cluster, provider_type, window))
@@ -1495,6 +1619,26 @@ def create_prometheus_adapter_config(
     }
 
 
+def diff_prometheus_adapter_configs(
+    existing_config: PrometheusAdapterConfig, desired_config: PrometheusAdapterConfig
+) -> Tuple[Set[str], Set[str], Set[str]]:
+    """
+    Returns the names of the rules that were (added, removed, changed) going from
+    existing_config to desired_config.
+    """
+    existing_rules = {rule["name"]["as"]: rule for rule in existing_config["rules"]}
+    desired_rules = {rule["name"]["as"]: rule for rule in desired_config["rules"]}
+
+    added = desired_rules.keys() - existing_rules.keys()
+    removed = existing_rules.keys() - desired_rules.keys()
+    changed = {
+        name
+        for name in desired_rules.keys() & existing_rules.keys()
+        if desired_rules[name] != existing_rules[name]
+    }
+    return added, removed, changed
+
+
 def update_prometheus_adapter_configmap(
     kube_client: KubeClient, config: PrometheusAdapterConfig
 ) -> None:
@@ -1597,10 +1741,13 @@ def main() -> int:
         logging.basicConfig(level=logging.INFO)
 
     log.info("Generating adapter config from soaconfigs.")
+    rule_cache = load_rule_cache(args.rule_cache)
     config = create_prometheus_adapter_config(
         paasta_cluster=args.cluster,
         soa_dir=args.soa_dir,
+        rule_cache=rule_cache if args.rule_cache else None,
     )
+    save_rule_cache(args.rule_cache, rule_cache)
     log.info("Generated adapter config from soaconfigs.")
     if args.dry_run:
         log.info(
@@ -1628,9 +1775,16 @@ def main() -> int:
 
     existing_config = get_prometheus_adapter_configmap(kube_client=kube_client)
     if existing_config and existing_config != config:
-        log.info("Existing config differs from soaconfigs - updating.")
-        log.debug("Existing data: %s", existing_config)
-        log.debug("Desired data: %s", config)
+        added, removed, changed = diff_prometheus_adapter_configs(
+            existing_config=existing_config, desired_config=config
+        )
+        log.info(
+            f"Existing config differs from soaconfigs ({len(added)} rule(s) added, "
+            f"{len(removed)} removed, {len(changed)} changed) - updating."
+        )
+        log.debug("Added rules: %s", sorted(added))
+        log.debug("Removed rules: %s", sorted(removed))
+        log.debug("Changed rules: %s", sorted(changed))
         update_prometheus_adapter_configmap(kube_client=kube_client, config=config)
         log.info("Updated adapter config.")
     elif existing_config:
@@ -21,11 +21,14 @@ The script will load the service configuration file, generate a Tron configurati
 file for it, and send the updated file to Tron.
 """
 import argparse
+import concurrent.futures
 import logging
 import sys
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Set
+from typing import Tuple
 
 import ruamel.yaml as yaml
 
@@ -33,6 +36,7 @@ from paasta_tools import spark_tools
 from paasta_tools import tron_tools
 from paasta_tools.kubernetes_tools import KubeClient
 from paasta_tools.kubernetes_tools import ensure_service_account
+from paasta_tools.tron.client import TronClient
 from paasta_tools.tron_tools import KUBERNETES_NAMESPACE
 from paasta_tools.tron_tools import MASTER_NAMESPACE
 from paasta_tools.tron_tools import TronJobConfig
@@ -41,6 +45,10 @@ from paasta_tools.utils import load_system_paasta_config
 
 log = logging.getLogger(__name__)
 
+# every update makes the Tron master reload that namespace, so this is kept small:
+# the point is to overlap request latency, not to hammer the master.
+DEFAULT_MAX_WORKERS = 4
+
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -71,6 +79,13 @@ def parse_args():
         default=False,
         help="Attempt to fetch all configs in bulk rather than one by one",
     )
+    parser.add_argument(
+        "--max-workers",
+        dest="max_workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="Maximum number of namespaces to update concurrently (default: %(default)s)",
+    )
     parser.add_argument(
         "--cluster",
         help="Cluster to read configs for. Defaults to the configuration in /etc/paasta",
@@ -129,6 +144,49 @@ def ensure_service_accounts(job_configs: List[TronJobConfig]) -> None:
             )
 
 
+def update_namespaces_concurrently(
+    client: TronClient,
+    new_configs: Dict[str, str],
+    current_configs: Optional[Dict[str, Dict[str, str]]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Tuple[List[str], List[str], List[str]]:
+    """Sends the given namespace configs to Tron using a bounded pool of workers.
+
+    :param current_configs: the output of client.get_namespace_configs(), if it has
+        already been fetched in bulk - otherwise each worker fetches the current
+        config for its own namespace.
+    :returns: a tuple of sorted (updated, skipped, failed) namespace lists
+    """
+    updated = []
+    skipped = []
+    failed = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                client.update_namespace,
+                namespace,
+                new_config,
+                current_config=(current_configs or {}).get(namespace),
+            ): namespace
+            for namespace, new_config in new_configs.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            namespace = futures[future]
+            try:
+                if future.result():
+                    updated.append(namespace)
+                    log.debug(f"Updated {namespace}")
+                else:
+                    skipped.append(namespace)
+                    log.debug(f"Skipped {namespace}")
+            except Exception:
+                failed.append(namespace)
+                log.exception(f"Update for {namespace} failed:")
+
+    return sorted(updated), sorted(skipped), sorted(failed)
+
+
 def main() -> None:
     args = parse_args()
     log_level = logging.DEBUG if args.verbose else logging.INFO
@@ -157,7 +215,7 @@ def main() -> None:
         sys.exit(0)
 
     if not args.dry_run:
-        client = tron_tools.get_tron_client()
+        client = tron_tools.get_tron_client(max_connections=args.max_workers)
 
     updated = []
     failed = []
@@ -195,7 +253,6 @@ def main() -> None:
                 k8s_enabled=k8s_enabled_for_cluster,
                 dry_run=args.dry_run,
             )
-            new_configs[service] = new_config
             if args.dry_run:
                 log.info(f"Would update {service} to:")
                 log.info(f"{new_config}")
@@ -212,43 +269,40 @@ def main() -> None:
                     for_validation=False,
                 )
                 ensure_service_accounts(job_configs)
-                if not args.bulk_config_fetch:
-                    if client.update_namespace(service, new_config):
-                        updated.append(service)
-                        log.debug(f"Updated {service}")
-                    else:
-                        skipped.append(service)
-                        log.debug(f"Skipped {service}")
+                new_configs[service] = new_config
 
         except Exception:
-            if args.bulk_config_fetch:
-                # service account creation should be the only action that can throw if this flag is true,
-                # so we can safely assume that's what happened here in the log message
-                log.exception(
-                    f"Failed to create service account for {service} (will skip reconfiguring):"
-                )
-
-                # since service account creation failed, we want to skip reconfiguring this service
-                # as the new config will likely fail due to the missing service account - even though
-                # the rest of the config is valid
-                new_configs.pop(service, None)
-            else:
-                log.exception(f"Update for {service} failed:")
-
-            # NOTE: this happens for both ways of updating (bulk fetch and JIT fetch)
-            # since we need to print out what failed in either case
+            # if service account creation failed, we want to skip reconfiguring this service
+            # as the new config will likely fail due to the missing service account - even though
+            # the rest of the config is valid
+            log.exception(f"Update for {service} failed:")
             failed.append(service)
 
-    if args.dry_run and args.bulk_config_fetch:
-        updated_namespaces = client.update_namespaces(new_configs)
-
-        if updated_namespaces:
-            updated = list(updated_namespaces.keys())
-            log.debug(f"Updated {updated}")
+    if new_configs:
+        current_configs = None
+        if args.bulk_config_fetch:
+            # a single request gets us the hash of every namespace's current config,
+            # so only namespaces that actually changed cost any further requests
+            try:
+                current_configs = client.get_namespace_configs()
+            except Exception:
+                log.exception(
+                    "Failed to fetch current configs in bulk, falling back to fetching them one by one:"
+                )
 
-        if updated_namespaces != new_configs.keys():
-            skipped = list(set(new_configs.keys()) - set(updated_namespaces.keys()))
-            log.debug(f"Skipped {skipped}")
+        (
+            updated_namespaces,
+            skipped_namespaces,
+            failed_namespaces,
+        ) = update_namespaces_concurrently(
+            client=client,
+            new_configs=new_configs,
+            current_configs=current_configs,
+            max_workers=args.max_workers,
+        )
+        updated.extend(updated_namespaces)
+        skipped.extend(skipped_namespaces)
+        failed.extend(failed_namespaces)
 
     skipped_report = skipped if args.verbose else len(skipped)
     log.info(
@@ -588,6 +588,9 @@ class KubeSmartstackEnvoyReplicationChecker(BaseReplicationChecker):
         self, nodes: Sequence[V1Node], system_paasta_config: SystemPaastaConfig
     ) -> None:
         self.nodes = nodes
+        # grouping the nodes is the same work for every service that discovers
+        # at the same level, so it's only done once per checker
+        self._hosts_by_attribute: Dict[str, Dict[str, Sequence[DiscoveredHost]]] = {}
         super().__init__(
             system_paasta_config=system_paasta_config,
             service_discovery_providers=get_service_discovery_providers(
@@ -604,19 +607,22 @@ class KubeSmartstackEnvoyReplicationChecker(BaseReplicationChecker):
             soa_dir=instance_config.soa_dir,
         ).get_discover()
 
-        attribute_to_nodes = kubernetes_tools.get_nodes_grouped_by_attribute(
-            nodes=self.nodes, attribute=discover_location_type
-        )
-        ret: Dict[str, Sequence[DiscoveredHost]] = {}
-        for attr, nodes in attribute_to_nodes.items():
-            ret[attr] = [
-                DiscoveredHost(
-                    hostname=node.metadata.labels["yelp.com/hostname"],
-                    pool=node.metadata.labels["yelp.com/pool"],
-                )
-                for node in nodes
-            ]
-        return ret
+        hosts_by_attribute = self._hosts_by_attribute.get(discover_location_type)
+        if hosts_by_attribute is None:
+            attribute_to_nodes = kubernetes_tools.get_nodes_grouped_by_attribute(
+                nodes=self.nodes, attribute=discover_location_type
+            )
+            hosts_by_attribute = {}
+            for attr, nodes in attribute_to_nodes.items():
+                hosts_by_attribute[attr] = [
+                    DiscoveredHost(
+                        hostname=node.metadata.labels["yelp.com/hostname"],
+                        pool=node.metadata.labels["yelp.com/pool"],
+                    )
+                    for node in nodes
+                ]
+            self._hosts_by_attribute[discover_location_type] = hosts_by_attribute
+        return dict(hosts_by_attribute)
 
 
 def build_smartstack_location_dict(
@@ -10,12 +10,16 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import hashlib
 import logging
 import os
+from typing import Any
 from typing import Dict
+from typing import Optional
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from paasta_tools import yaml_tools as yaml
 from paasta_tools.cli.authentication import get_service_auth_token
@@ -24,30 +28,61 @@ from paasta_tools.utils import get_user_agent
 log = logging.getLogger(__name__)
 
 
+# enough keep-alive connections for setup_tron_namespace's worker pool
+DEFAULT_MAX_CONNECTIONS = 8
+
+
 class TronRequestError(Exception):
     pass
 
 
+def get_config_content_hash(config: str) -> str:
+    """Hashes namespace config content the same way the Tron master does, so
+    that a generated config can be compared against the hash Tron reports for
+    the config it currently has without parsing either one."""
+    return hashlib.sha1(config.encode("utf-8")).hexdigest()
+
+
+def is_config_unchanged(new_config: str, current_config: Dict[str, Any]) -> bool:
+    if current_config.get("hash") == get_config_content_hash(new_config):
+        return True
+    # the text may differ without the config itself differing (e.g. key order or
+    # formatting), so fall back to comparing the parsed configs - this only
+    # happens for namespaces whose content actually changed.
+    return yaml.safe_load(new_config) == yaml.safe_load(
+        current_config.get("config", "")
+    )
+
+
 class TronClient:
     """
     Client for interacting with a Tron master.
+
+    Requests go through a single keep-alive session, so the client can be
+    shared between threads to talk to the master concurrently.
     """
 
-    def __init__(self, url):
+    def __init__(self, url, max_connections=DEFAULT_MAX_CONNECTIONS):
         self.master_url = url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=max_connections, pool_block=True
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def _request(self, method, url, data):
         headers = {"User-Agent": get_user_agent()}
         kwargs = {"url": urljoin(self.master_url, url), "headers": headers}
         if method == "GET":
             kwargs["params"] = data
-            response = requests.get(**kwargs)
+            response = self.session.get(**kwargs)
         elif method == "POST":
             kwargs["data"] = data
             if os.getenv("TRONCTL_API_AUTH"):
                 token = get_service_auth_token()
                 kwargs["headers"]["Authorization"] = f"Bearer {token}"
-            response = requests.post(**kwargs)
+            response = self.session.post(**kwargs)
         else:
             raise ValueError(f"Unrecognized method: {method}")
 
@@ -76,18 +111,35 @@ class TronClient:
     def _post(self, url, data=None):
         return self._request("POST", url, data)
 
-    def update_namespace(self, namespace, new_config, skip_if_unchanged=True):
+    def get_namespace_config(self, namespace: str) -> Dict[str, str]:
+        """Gets the current config (and its hash) for a single namespace."""
+        return self._get("/api/config", {"name": namespace, "no_header": 1})
+
+    def get_namespace_configs(self) -> Dict[str, Dict[str, str]]:
+        """Gets the current config (and its hash) for every namespace in one request."""
+        return self._get("/api/config")  # type: ignore  # we don't have a good way to share types between tron/paasta
+
+    def update_namespace(
+        self,
+        namespace,
+        new_config,
+        skip_if_unchanged=True,
+        current_config: Optional[Dict[str, str]] = None,
+    ):
         """Updates the configuration for a namespace.
 
         :param namespace: str
         :param new_config: str, should be valid YAML.
         :param skip_if_unchanged: boolean. If False, will send the update
             even if the current config matches the new config.
+        :param current_config: the namespace's entry from get_namespace_configs(),
+            if already known. Fetched from the master if not given.
         """
-        current_config = self._get("/api/config", {"name": namespace, "no_header": 1})
+        if current_config is None:
+            current_config = self.get_namespace_config(namespace)
 
         if skip_if_unchanged:
-            if yaml.safe_load(new_config) == yaml.safe_load(current_config["config"]):
+            if is_config_unchanged(new_config, current_config):
                 log.debug("No change in config, skipping update.")
                 return
 
@@ -104,33 +156,25 @@ class TronClient:
     def update_namespaces(
         self, new_configs: Dict[str, str], skip_if_unchanged: bool = True
     ):
-        """Updates the configuration for a namespace.
+        """Updates the configuration for several namespaces, fetching their
+        current configs in a single request.
 
-        :param namespace: str
-        :param new_config: str, should be valid YAML.
-        :param skip_if_unchanged: boolean. If False, will send the update
+        :param new_configs: dict of namespace to new config (valid YAML)
+        :param skip_if_unchanged: boolean. If False, will send the updates
             even if the current config matches the new config.
+        :returns: dict of namespace to response for the namespaces updated
         """
-        current_configs: Dict[str, Dict[str, str]] = self._get("/api/config")  # type: ignore  # we don't have a good way to share types between tron/paasta
+        current_configs = self.get_namespace_configs()
         responses: Dict[str, str] = {}
         for namespace, new_config in new_configs.items():
-            current_config = current_configs.get(namespace, {})
-            if skip_if_unchanged:
-                if yaml.safe_load(new_config) == yaml.safe_load(
-                    current_config["config"]
-                ):
-                    log.debug("No change in config, skipping update.")
-                    continue
-
-            responses[namespace] = self._post(
-                "/api/config",
-                data={
-                    "name": namespace,
-                    "config": new_config,
-                    "hash": current_config["hash"],
-                    "check": 0,
-                },
+            response = self.update_namespace(
+                namespace,
+                new_config,
+                skip_if_unchanged=skip_if_unchanged,
+                current_config=current_configs.get(namespace),
             )
+            if response:
+                responses[namespace] = response
         return responses
 
     def list_namespaces(self):
@@ -156,8 +156,8 @@ def load_tron_config():
     return TronConfig(load_system_paasta_config().get_tron_config())
 
 
-def get_tron_client():
-    return TronClient(load_tron_config().get_url())
+def get_tron_client(**kwargs):
+    return TronClient(load_tron_config().get_url(), **kwargs)
 
 
 def compose_instance(job, action):
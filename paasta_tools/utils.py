@@ -11,6 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import atexit
+import concurrent.futures
 import contextlib
 import copy
 import datetime
@@ -32,6 +34,7 @@ import shlex
 import signal
 import socket
 import ssl
+import struct
 import sys
 import tempfile
 import threading
@@ -47,6 +50,7 @@ from subprocess import STDOUT
 from subprocess import Popen
 from types import FrameType
 from typing import IO
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 from typing import Collection
@@ -70,21 +74,24 @@ from typing import TypeVar
 from typing import Union
 from typing import cast
 
+import cachetools
 import choice
 import dateutil.tz
-import ldap3
-import requests_cache
+import inotify.constants as inotify_constants
 import service_configuration_lib
-from docker import APIClient
-from docker.utils import kwargs_from_env
-from environment_tools.type_utils import convert_location_type
-from kazoo.client import KazooClient
 from mypy_extensions import TypedDict
 from service_configuration_lib import read_service_configuration
 
 import paasta_tools.cli.fsm
 from paasta_tools import yaml_tools as yaml
 
+# these are only needed by a handful of functions but are slow to import, which
+# every CLI invocation (and every other script) would otherwise pay for, so they
+# are imported where they're used instead
+if TYPE_CHECKING:
+    from docker import APIClient
+    from kazoo.client import KazooClient
+
 # DO NOT CHANGE SPACER, UNLESS YOU'RE PREPARED TO CHANGE ALL INSTANCES
 # OF IT IN OTHER LIBRARIES (i.e. service_configuration_lib).
 # It's used to compose a job's full ID from its name and instance
@@ -110,6 +117,10 @@ DEFAULT_LOGLEVEL = "event"
 no_escape = re.compile(r"\x1B\[[0-9;]*[mK]")
 # NOTE: renaming these named groups will require refactoring users of this regex
 ROLLBACK_TAG_PATTERN = r"^refs/tags/paasta-{deploy_group}(?:\+(?P<image_version>.*)){{0,1}}-(?P<dtime>\d{{8}}T\d{{6}})-rollback$"
+# matches both deploy and rollback tags for any deploy group - see DeploymentRefIndex
+DEPLOYMENT_TAG_REGEX = re.compile(
+    r"^refs/tags/paasta-(?P<deploy_group>[^+]+?)(?:\+(?P<image_version>.*)){0,1}-(?P<dtime>\d{8}T\d{6})-(?P<kind>deploy|rollback)$"
+)
 
 # instead of the convention of using underscores in this scribe channel name,
 # the audit log uses dashes to prevent collisions with a service that might be
@@ -199,40 +210,176 @@ class TimeCacheEntry(TypedDict):
     fetch_time: float
 
 
+class TimeCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    maxsize: Optional[int]
+
+
 _CacheRetT = TypeVar("_CacheRetT")
 
 
 class time_cache:
-    def __init__(self, ttl: float = 0) -> None:
-        self.configs: Dict[Tuple, TimeCacheEntry] = {}
+    """Caches a function's results for ttl seconds, keyed on its arguments.
+
+    Concurrent callers that miss on the same key wait for a single call of the
+    function rather than all calling it. The decorated function also gets
+    cache_stats(), invalidate(*args, **kwargs) and cache_clear().
+
+    :param ttl: how long results are cached for; 0 disables caching. Callers can
+        override this per call by passing ttl=...
+    :param maxsize: if set, the least recently used entries are evicted once
+        there are more than this many
+    """
+
+    def __init__(self, ttl: float = 0, maxsize: Optional[int] = None) -> None:
+        self.configs: "OrderedDict[Tuple, TimeCacheEntry]" = OrderedDict()
         self.ttl = ttl
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        # one lock per key currently being computed, so that only one caller
+        # computes it while any others wait
+        self.key_locks: Dict[Tuple, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(args: Tuple, kwargs: Mapping[str, Any]) -> Tuple:
+        key = args
+        for item in kwargs.items():
+            key += item
+        return key
+
+    def _get_fresh(self, key: Tuple, ttl: float) -> Optional[TimeCacheEntry]:
+        """Must be called with self.lock held."""
+        entry = self.configs.get(key)
+        if entry is None or time.time() - entry["fetch_time"] > ttl:
+            return None
+        self.configs.move_to_end(key)
+        return entry
+
+    def _set(self, key: Tuple, data: Any) -> None:
+        """Must be called with self.lock held."""
+        self.configs[key] = {"data": data, "fetch_time": time.time()}
+        self.configs.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self.configs) > self.maxsize:
+                self.configs.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *args: Any, **kwargs: Any) -> None:
+        """Drops the cached result for the given arguments, if any."""
+        with self.lock:
+            self.configs.pop(self.make_key(args, kwargs), None)
+
+    def cache_clear(self) -> None:
+        with self.lock:
+            self.configs.clear()
+
+    def cache_stats(self) -> TimeCacheStats:
+        with self.lock:
+            return TimeCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                currsize=len(self.configs),
+                maxsize=self.maxsize,
+            )
 
     def __call__(self, f: Callable[..., _CacheRetT]) -> Callable[..., _CacheRetT]:
+        @wraps(f)
         def cache(*args: Any, **kwargs: Any) -> _CacheRetT:
             if "ttl" in kwargs:
                 ttl = kwargs["ttl"]
                 del kwargs["ttl"]
             else:
                 ttl = self.ttl
-            key = args
-            for item in kwargs.items():
-                key += item
-            if (
-                (not ttl)
-                or (key not in self.configs)
-                or (time.time() - self.configs[key]["fetch_time"] > ttl)
-            ):
-                self.configs[key] = {
-                    "data": f(*args, **kwargs),
-                    "fetch_time": time.time(),
-                }
-            return self.configs[key]["data"]
+            if not ttl:
+                with self.lock:
+                    self.misses += 1
+                return f(*args, **kwargs)
+
+            key = self.make_key(args, kwargs)
+            with self.lock:
+                entry = self._get_fresh(key, ttl)
+                if entry is not None:
+                    self.hits += 1
+                    return entry["data"]
+                key_lock = self.key_locks.setdefault(key, threading.Lock())
+
+            with key_lock:
+                with self.lock:
+                    # someone else may have computed it while we were waiting
+                    entry = self._get_fresh(key, ttl)
+                    if entry is not None:
+                        self.hits += 1
+                        return entry["data"]
+                    self.misses += 1
+                try:
+                    data = f(*args, **kwargs)
+                    with self.lock:
+                        self._set(key, data)
+                    return data
+                finally:
+                    with self.lock:
+                        if self.key_locks.get(key) is key_lock:
+                            del self.key_locks[key]
 
+        cache.cache_stats = self.cache_stats  # type: ignore[attr-defined]
+        cache.invalidate = self.invalidate  # type: ignore[attr-defined]
+        cache.cache_clear = self.cache_clear  # type: ignore[attr-defined]
         return cache
 
 
 # Avoid re-reading service.yaml when multiple callers need it in quick succession.
-cached_read_service_configuration = time_cache(ttl=5)(read_service_configuration)
+cached_read_service_configuration = time_cache(ttl=5, maxsize=4096)(
+    read_service_configuration
+)
+
+
+class SingleFlightTTLCache:
+    """Short-TTL cache where concurrent misses for the same key share a single
+    fetch. Failed fetches aren't cached."""
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int = 1024,
+    ) -> None:
+        self.lock = threading.Lock()
+        self.entries: cachetools.TTLCache = cachetools.TTLCache(
+            maxsize=maxsize, ttl=ttl
+        )
+
+    def get(self, key: Any, fetch: Callable[[], _CacheRetT]) -> _CacheRetT:
+        with self.lock:
+            future = self.entries.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = concurrent.futures.Future()
+                self.entries[key] = future
+
+        if is_owner:
+            try:
+                future.set_result(fetch())
+            except BaseException as e:
+                with self.lock:
+                    if self.entries.get(key) is future:
+                        del self.entries[key]
+                future.set_exception(e)
+        return future.result()
+
+    def is_cached(self, key: Any) -> bool:
+        with self.lock:
+            future = self.entries.get(key)
+            return future is not None and future.done() and not future.exception()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
 
 
 _SortDictsT = TypeVar("_SortDictsT", bound=Mapping)
@@ -1698,19 +1845,61 @@ def _empty_context() -> Iterator[None]:
 _AnyIO = Union[io.IOBase, IO]
 
 
+# path_format usually has {service} in it, so a long-running process can end up
+# logging to a lot of different files
+FILE_LOG_WRITER_MAX_OPEN_FILES = 64
+
+
 @register_log_writer("file")
 class FileLogWriter(LogWriter):
+    """Appends log lines to files named by path_format.
+
+    Files are opened (with O_APPEND) the first time they're logged to and kept
+    open, rather than being reopened for every line; if a file is rotated or
+    removed out from under us, it's reopened on the next write. At most
+    max_open_files are kept open, closing the least recently used one to make room.
+
+    With buffer_max_bytes or buffer_max_seconds set, lines are buffered per
+    file and written out once either bound is exceeded, as well as at exit.
+    The bounds are checked whenever a line is logged; buffer_max_seconds is
+    also enforced by a background timer, so that lines don't sit in the buffer
+    indefinitely once no more are being logged.
+    """
+
     def __init__(
         self,
         path_format: str,
         mode: str = "a+",
         line_delimiter: str = "\n",
         flock: bool = False,
+        buffer_max_bytes: int = 0,
+        buffer_max_seconds: float = 0,
+        max_open_files: int = FILE_LOG_WRITER_MAX_OPEN_FILES,
     ) -> None:
         self.path_format = path_format
         self.mode = mode
         self.flock = flock
         self.line_delimiter = line_delimiter
+        self.buffer_max_bytes = buffer_max_bytes
+        self.buffer_max_seconds = buffer_max_seconds
+        self.max_open_files = max_open_files
+
+        self.lock = threading.RLock()
+        # path -> (open file, (st_dev, st_ino) of the file when it was opened),
+        # least recently used first
+        self.files: "OrderedDict[str, Tuple[io.FileIO, Tuple[int, int]]]" = (
+            OrderedDict()
+        )
+        # path -> (lines waiting to be written, when the first of them was buffered)
+        self.buffers: Dict[str, Tuple[List[bytes], float]] = {}
+        self.buffered_bytes: Dict[str, int] = {}
+        self.flush_timer: Optional[threading.Timer] = None
+        self.pid = os.getpid()
+        atexit.register(self.close)
+
+    @property
+    def buffering(self) -> bool:
+        return self.buffer_max_bytes > 0 or self.buffer_max_seconds > 0
 
     def maybe_flock(self, fd: _AnyIO) -> ContextManager:
         if self.flock:
@@ -1730,25 +1919,128 @@ class FileLogWriter(LogWriter):
             instance=instance,
         )
 
-    def _log_message(self, path: str, message: str) -> None:
+    def _check_pid(self) -> None:
+        # a forked child shares our descriptors, which is fine, but it must
+        # not also write out the lines that we've buffered
+        if os.getpid() != self.pid:
+            self.pid = os.getpid()
+            self.files = OrderedDict()
+            self.buffers = {}
+            self.buffered_bytes = {}
+            # threads don't survive a fork
+            self.flush_timer = None
+
+    def _get_file(self, path: str) -> io.FileIO:
+        if path in self.files:
+            f, file_id = self.files[path]
+            try:
+                stat = os.stat(path)
+                rotated = (stat.st_dev, stat.st_ino) != file_id
+            except FileNotFoundError:
+                rotated = True
+            if not rotated:
+                self.files.move_to_end(path)
+                return f
+            self._close_file(path)
+
+        while self.files and len(self.files) >= self.max_open_files:
+            self._close_file(next(iter(self.files)))
+        f = io.FileIO(path, mode=self.mode, closefd=True)
+        stat = os.fstat(f.fileno())
+        self.files[path] = (f, (stat.st_dev, stat.st_ino))
+        return f
+
+    def _close_file(self, path: str) -> None:
+        f, _ = self.files.pop(path, (None, None))
+        if f is not None:
+            try:
+                f.close()
+            except OSError:
+                pass
+
+    def _write(self, path: str, data: bytes) -> None:
         # We use io.FileIO here because it guarantees that write() is implemented with a single write syscall,
-        # and on Linux, writes to O_APPEND files with a single write syscall are atomic.
+        # and on Linux, writes to O_APPEND files with a single write syscall are atomic - so whole lines (even
+        # a buffer's worth of them) never get interleaved with other writers without needing to flock.
         #
         # https://docs.python.org/2/library/io.html#io.FileIO
         # http://article.gmane.org/gmane.linux.kernel/43445
-
         try:
-            with io.FileIO(path, mode=self.mode, closefd=True) as f:
-                with self.maybe_flock(f):
-                    f.write(message.encode("UTF-8"))
+            f = self._get_file(path)
+            with self.maybe_flock(f):
+                f.write(data)
         except IOError as e:
+            # start from scratch next time, in case the descriptor is the problem
+            self._close_file(path)
             print(
                 "Could not log to {}: {}: {} -- would have logged: {}".format(
-                    path, type(e).__name__, str(e), message
+                    path, type(e).__name__, str(e), data.decode("UTF-8")
                 ),
                 file=sys.stderr,
             )
 
+    def _flush_path(self, path: str) -> None:
+        lines, _ = self.buffers.pop(path, ([], 0.0))
+        self.buffered_bytes.pop(path, None)
+        if lines:
+            self._write(path, b"".join(lines))
+
+    def flush(self) -> None:
+        """Writes out any buffered lines."""
+        with self.lock:
+            self._check_pid()
+            for path in list(self.buffers):
+                self._flush_path(path)
+
+    def _flush_on_timer(self) -> None:
+        with self.lock:
+            if self.flush_timer is not threading.current_thread():
+                # cancelled, or we've forked since it was started
+                return
+            self.flush_timer = None
+            self.flush()
+
+    def _start_flush_timer(self) -> None:
+        if self.flush_timer is None:
+            self.flush_timer = threading.Timer(
+                self.buffer_max_seconds, self._flush_on_timer
+            )
+            self.flush_timer.daemon = True
+            self.flush_timer.start()
+
+    def close(self) -> None:
+        """Writes out any buffered lines and closes all open files."""
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            self.flush()
+            for path in list(self.files):
+                self._close_file(path)
+
+    def _log_message(self, path: str, message: str) -> None:
+        data = message.encode("UTF-8")
+        with self.lock:
+            self._check_pid()
+            if not self.buffering:
+                self._write(path, data)
+                return
+
+            now = time.monotonic()
+            lines, first_buffered = self.buffers.setdefault(path, ([], now))
+            lines.append(data)
+            self.buffered_bytes[path] = self.buffered_bytes.get(path, 0) + len(data)
+            if (
+                self.buffer_max_bytes > 0
+                and self.buffered_bytes[path] >= self.buffer_max_bytes
+            ) or (
+                self.buffer_max_seconds > 0
+                and now - first_buffered >= self.buffer_max_seconds
+            ):
+                self._flush_path(path)
+            elif self.buffer_max_seconds > 0:
+                self._start_flush_timer()
+
     def log(
         self,
         service: str,
@@ -2056,13 +2348,175 @@ class SystemPaastaConfigDict(TypedDict, total=False):
     use_raw_ksm_queries: bool
 
 
+# how often to re-check the system paasta config when not using inotify
+SYSTEM_PAASTA_CONFIG_POLL_INTERVAL_S = 1.0
+# wd, mask, cookie, len - see inotify(7)
+_INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+
+class ConfigChangeWatcher:
+    """Keeps track of whether any of the files behind a key may have changed
+    since the key was last marked fresh, so that callers don't have to stat
+    them to find out.
+
+    By default, a key is treated as fresh for poll_interval_s after it was
+    watched, which is plenty for short-lived processes.
+
+    Long-running processes can enable_inotify(), after which a single
+    non-blocking inotify instance is used where available (so changes are
+    noticed right away, and checking a fresh key is a dict lookup and a read()
+    that returns nothing), still polling elsewhere - e.g. on macOS, or if
+    we're out of inotify instances/watches. It's not the default as each
+    process uses up an inotify instance, and there are only
+    fs.inotify.max_user_instances (128 by default) per user.
+    """
+
+    WATCH_MASK = (
+        inotify_constants.IN_MODIFY
+        | inotify_constants.IN_ATTRIB
+        | inotify_constants.IN_CLOSE_WRITE
+        | inotify_constants.IN_CREATE
+        | inotify_constants.IN_DELETE
+        | inotify_constants.IN_MOVED_FROM
+        | inotify_constants.IN_MOVED_TO
+        | inotify_constants.IN_DELETE_SELF
+        | inotify_constants.IN_MOVE_SELF
+    )
+
+    def __init__(
+        self,
+        poll_interval_s: float = SYSTEM_PAASTA_CONFIG_POLL_INTERVAL_S,
+        use_inotify: bool = False,
+    ) -> None:
+        self.poll_interval_s = poll_interval_s
+        self.use_inotify = use_inotify
+        self.lock = threading.Lock()
+        self.pid: Optional[int] = None
+        self.fd: Optional[int] = None
+        self.add_watch: Optional[Callable[[int, bytes, int], int]] = None
+        self.keys_by_wd: Dict[int, Set[str]] = {}
+        # key -> time.monotonic() when it was marked fresh
+        self.fresh: Dict[str, float] = {}
+
+    def _ensure_initialized(self) -> None:
+        # an inotify fd shared with a forked parent would share its events too,
+        # so children start over with their own
+        if self.pid == os.getpid():
+            return
+        if self.fd is not None:
+            os.close(self.fd)
+        self.pid = os.getpid()
+        self.fd = None
+        self.keys_by_wd = {}
+        self.fresh = {}
+        if not self.use_inotify:
+            return
+        try:
+            # imported here as it needs libc's inotify_* functions, which e.g.
+            # macOS doesn't have
+            import inotify.calls
+
+            self.fd = inotify.calls.inotify_init()
+            self.add_watch = inotify.calls.inotify_add_watch
+        except Exception as e:
+            log.debug(f"inotify is unavailable, polling for config changes: {e}")
+            return
+        os.set_blocking(self.fd, False)
+        os.set_inheritable(self.fd, False)
+
+    def enable_inotify(self) -> None:
+        with self.lock:
+            if not self.use_inotify:
+                self.use_inotify = True
+                # start over, with an inotify instance this time
+                self.pid = None
+
+    def _drain_events(self) -> None:
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            if not buf:
+                return
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _, name_len = _INOTIFY_EVENT_HEADER.unpack_from(buf, offset)
+                offset += _INOTIFY_EVENT_HEADER.size + name_len
+                if mask & inotify_constants.IN_Q_OVERFLOW:
+                    self.fresh.clear()
+                    continue
+                for key in self.keys_by_wd.get(wd, ()):
+                    self.fresh.pop(key, None)
+                if mask & inotify_constants.IN_IGNORED:
+                    self.keys_by_wd.pop(wd, None)
+
+    def watch(self, key: str, paths: Iterable[str]) -> bool:
+        """Marks key as fresh until any of the given files or directories
+        change. Call this *before* reading them, so that no change is missed.
+
+        :returns: whether changes to all of the paths will be noticed - if not,
+            the key isn't marked fresh
+        """
+        with self.lock:
+            self._ensure_initialized()
+            if self.fd is not None and self.add_watch is not None:
+                for path in paths:
+                    try:
+                        wd = self.add_watch(self.fd, os.fsencode(path), self.WATCH_MASK)
+                    except Exception:
+                        self.fresh.pop(key, None)
+                        return False
+                    self.keys_by_wd.setdefault(wd, set()).add(key)
+            self.fresh[key] = time.monotonic()
+            return True
+
+    def is_fresh(self, key: str) -> bool:
+        """Returns whether nothing behind key has changed since it was last
+        watched."""
+        with self.lock:
+            self._ensure_initialized()
+            if self.fd is not None:
+                self._drain_events()
+                return key in self.fresh
+            marked_at = self.fresh.get(key)
+            return (
+                marked_at is not None
+                and time.monotonic() - marked_at < self.poll_interval_s
+            )
+
+    def forget(self, key: str) -> None:
+        with self.lock:
+            self.fresh.pop(key, None)
+
+
+system_paasta_config_watcher = ConfigChangeWatcher()
+# path -> the SystemPaastaConfig loaded from it while it was watched
+_system_paasta_configs: Dict[str, "SystemPaastaConfig"] = {}
+
+
+def watch_system_paasta_config() -> None:
+    """Makes load_system_paasta_config notice changes right away using inotify,
+    rather than polling for them. Meant for long-running processes that load
+    it a lot (see ConfigChangeWatcher)."""
+    system_paasta_config_watcher.enable_inotify()
+
+
 def load_system_paasta_config(
     path: str = PATH_TO_SYSTEM_PAASTA_CONFIG_DIR,
 ) -> "SystemPaastaConfig":
     """
     Reads Paasta configs in specified directory in lexicographical order and deep merges
     the dictionaries (last file wins).
+
+    The result is reused for up to SYSTEM_PAASTA_CONFIG_POLL_INTERVAL_S (or,
+    in processes that have called watch_system_paasta_config, until something
+    in the directory changes), so that calling this in a loop is cheap.
     """
+    cached = _system_paasta_configs.get(path)
+    if cached is not None and system_paasta_config_watcher.is_fresh(path):
+        return cached
+
     if not os.path.isdir(path):
         raise PaastaNotConfiguredError(
             "Could not find system paasta configuration directory: %s" % path
@@ -2074,17 +2528,33 @@ def load_system_paasta_config(
         )
 
     try:
-        file_stats = frozenset(
-            {
-                (fn, os.stat(fn))
-                for fn in get_readable_files_in_glob(glob="*.json", path=path)
-            }
-        )
-        return parse_system_paasta_config(file_stats, path)
+        # watch the directory before listing it, and the files (which might be
+        # symlinks to somewhere else) before reading them, so that we can't
+        # miss a change that happens in between
+        watching = system_paasta_config_watcher.watch(path, [path])
+        filenames = get_readable_files_in_glob(glob="*.json", path=path)
+        watching = watching and system_paasta_config_watcher.watch(path, filenames)
+        file_stats = set()
+        for fn in filenames:
+            # os.stat_result only compares whole-second mtimes, which would
+            # miss a same-size edit made within the same second
+            st = os.stat(fn)
+            file_stats.add((fn, st.st_ino, st.st_size, st.st_mtime_ns))
+        config = parse_system_paasta_config(frozenset(file_stats), path)
     except IOError as e:
+        system_paasta_config_watcher.forget(path)
         raise PaastaNotConfiguredError(
             f"Could not load system paasta config file {e.filename}: {e.strerror}"
         )
+    except Exception:
+        system_paasta_config_watcher.forget(path)
+        raise
+
+    if watching:
+        _system_paasta_configs[path] = config
+    else:
+        _system_paasta_configs.pop(path, None)
+    return config
 
 
 def optionally_load_system_paasta_config(
@@ -2102,11 +2572,11 @@ def optionally_load_system_paasta_config(
 
 @lru_cache()
 def parse_system_paasta_config(
-    file_stats: FrozenSet[Tuple[str, os.stat_result]], path: str
+    file_stats: FrozenSet[Tuple[str, int, int, int]], path: str
 ) -> "SystemPaastaConfig":
-    """Pass in a dictionary of filename -> os.stat_result, and this returns the merged parsed configs"""
+    """Pass in a set of (filename, inode, size, mtime_ns), and this returns the merged parsed configs"""
     config: SystemPaastaConfigDict = {}
-    for filename, _ in file_stats:
+    for filename, *_ in file_stats:
         with open(filename) as f:
             config = deep_merge_dictionaries(
                 json.load(f), config, allow_duplicate_keys=False
@@ -2855,6 +3325,8 @@ class SystemPaastaConfig:
             # NOTE: this should never happen unless our kube metadata generator is broken
             return None
 
+        from environment_tools.type_utils import convert_location_type
+
         result = convert_location_type(
             location=yelp_region,
             source_type="region",
@@ -3486,7 +3958,10 @@ def get_docker_host() -> str:
     return os.environ.get("DOCKER_HOST", "unix://var/run/docker.sock")
 
 
-def get_docker_client() -> APIClient:
+def get_docker_client() -> "APIClient":
+    from docker import APIClient
+    from docker.utils import kwargs_from_env
+
     client_opts = kwargs_from_env()
     if "base_url" in client_opts:
         return APIClient(**client_opts)
@@ -3750,12 +4225,91 @@ def format_tag(tag: str) -> str:
     return "refs/tags/%s" % tag
 
 
+class DeploymentTag(NamedTuple):
+    ref: str
+    sha: str
+    deploy_group: str
+    kind: str
+    timestamp: str
+    image_version: Optional[str]
+
+
+class DeploymentRefIndex:
+    """A one-pass index of the paasta deploy and rollback tags in a refs dict.
+
+    Parsing every tag once up front lets callers that ask about many deploy
+    groups (or ask repeatedly) avoid re-running a regex over every ref per
+    query. Tags are grouped by (deploy_group, kind) and kept sorted by
+    timestamp, so the latest tag is O(1).
+
+    Membership checks (``ref in index``) are answered against the original
+    refs so that the index can stand in for the refs dict it was built from.
+    """
+
+    def __init__(self, refs: Mapping[str, str]) -> None:
+        self._refs = refs
+        self._tags: Dict[Tuple[str, str], List[DeploymentTag]] = {}
+        self._latest: Dict[Tuple[str, str], DeploymentTag] = {}
+
+        for ref_name, sha in refs.items():
+            match = DEPLOYMENT_TAG_REGEX.match(ref_name)
+            if not match:
+                continue
+            tag = DeploymentTag(
+                ref=ref_name,
+                sha=sha,
+                deploy_group=match.group("deploy_group"),
+                kind=match.group("kind"),
+                timestamp=match.group("dtime"),
+                image_version=match.group("image_version"),
+            )
+            key = (tag.deploy_group, tag.kind)
+            self._tags.setdefault(key, []).append(tag)
+            # ties go to the first tag seen, matching the historical behavior
+            # of get_latest_deployment_tag
+            latest = self._latest.get(key)
+            if latest is None or tag.timestamp > latest.timestamp:
+                self._latest[key] = tag
+
+        for tags in self._tags.values():
+            # sort() is stable, so tags sharing a timestamp keep ref order
+            tags.sort(key=lambda tag: tag.timestamp)
+
+    def __contains__(self, ref: object) -> bool:
+        return ref in self._refs
+
+    def get_latest_tag(
+        self, deploy_group: str, kind: str = "deploy"
+    ) -> Optional[DeploymentTag]:
+        return self._latest.get((deploy_group, kind))
+
+    def get_tag_history(
+        self, deploy_group: str, kind: str = "deploy"
+    ) -> Sequence[DeploymentTag]:
+        """Returns the tags of the given kind for a deploy group, oldest first."""
+        return self._tags.get((deploy_group, kind), [])
+
+    def get_rollback_tags_for_sha(
+        self, deploy_group: str, sha: str
+    ) -> List[Tuple[str, str]]:
+        results = [
+            (tag.ref, tag.timestamp)
+            for tag in self._tags.get((deploy_group, "rollback"), [])
+            if tag.sha == sha
+        ]
+        # most recent first; sorting (rather than reversing) keeps tags that
+        # share a timestamp in ref order
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results
+
+
 def get_latest_deployment_tag(
-    refs: Dict[str, str], deploy_group: str
+    refs: Union[Mapping[str, str], DeploymentRefIndex], deploy_group: str
 ) -> Tuple[str, str, Optional[str]]:
     """Gets the latest deployment tag and sha for the specified deploy_group
 
-    :param refs: A dictionary mapping git refs to shas
+    :param refs: A dictionary mapping git refs to shas, or a DeploymentRefIndex
+                 built from one (preferable when querying several deploy groups)
     :param deploy_group: The deployment group to return a deploy tag for
 
     :returns: A tuple of the form (ref, sha, image_version) where ref is the
@@ -3763,34 +4317,21 @@ def get_latest_deployment_tag(
               the sha it points at and image_version provides additional
               version information about the image
     """
-    most_recent_dtime = None
-    most_recent_ref = None
-    most_recent_sha = None
-    most_recent_image_version = None
-    pattern = re.compile(
-        r"^refs/tags/paasta-%s(?:\+(?P<image_version>.*)){0,1}-(?P<dtime>\d{8}T\d{6})-deploy$"
-        % deploy_group
-    )
-
-    for ref_name, sha in refs.items():
-        match = pattern.match(ref_name)
-        if match:
-            gd = match.groupdict()
-            dtime = gd["dtime"]
-            if most_recent_dtime is None or dtime > most_recent_dtime:
-                most_recent_dtime = dtime
-                most_recent_ref = ref_name
-                most_recent_sha = sha
-                most_recent_image_version = gd["image_version"]
-    return most_recent_ref, most_recent_sha, most_recent_image_version
+    if not isinstance(refs, DeploymentRefIndex):
+        refs = DeploymentRefIndex(refs)
+    tag = refs.get_latest_tag(deploy_group)
+    if tag is None:
+        return None, None, None
+    return tag.ref, tag.sha, tag.image_version
 
 
 def get_rollback_tags_for_sha(
-    refs: Dict[str, str], deploy_group: str, sha: str
+    refs: Union[Mapping[str, str], DeploymentRefIndex], deploy_group: str, sha: str
 ) -> List[Tuple[str, str]]:
     """Gets all rollback tags for a given SHA in a deploy group.
 
-    :param refs: A dictionary mapping git refs to shas
+    :param refs: A dictionary mapping git refs to shas, or a DeploymentRefIndex
+                 built from one (only worth it if the caller already has one)
     :param deploy_group: The deployment group to look for tags for
     :param sha: The git SHA to check for rollback tags
 
@@ -3801,6 +4342,11 @@ def get_rollback_tags_for_sha(
               embedded in the tag name - but it does save some processing
               later on :p
     """
+    if isinstance(refs, DeploymentRefIndex):
+        return refs.get_rollback_tags_for_sha(deploy_group, sha)
+
+    # for a single lookup, filtering by sha first is cheaper than indexing
+    # every tag
     pattern = re.compile(
         ROLLBACK_TAG_PATTERN.format(deploy_group=re.escape(deploy_group))
     )
@@ -4041,11 +4587,13 @@ class ZookeeperPool:
     """
 
     counter: int = 0
-    zk: KazooClient = None
+    zk: "KazooClient" = None
 
     @classmethod
-    def __enter__(cls) -> KazooClient:
+    def __enter__(cls) -> "KazooClient":
         if cls.zk is None:
+            from kazoo.client import KazooClient
+
             cls.zk = KazooClient(
                 hosts=load_system_paasta_config().get_zk_hosts(), read_only=True
             )
@@ -4087,6 +4635,8 @@ def use_requests_cache(
 ) -> Callable[[_UseRequestsCacheFuncT], _UseRequestsCacheFuncT]:
     def wrap(fun: _UseRequestsCacheFuncT) -> _UseRequestsCacheFuncT:
         def fun_with_cache(*args: Any, **kwargs: Any) -> Any:
+            import requests_cache
+
             requests_cache.install_cache(cache_name, backend=backend, **kwargs)
             result = fun(*args, **kwargs)
             requests_cache.uninstall_cache()
@@ -4284,6 +4834,8 @@ def ldap_user_search(
     password: str,
 ) -> Set[str]:
     """Connects to LDAP and raises a subclass of LDAPOperationResult when it fails"""
+    import ldap3
+
     tls_config = ldap3.Tls(
         validate=ssl.CERT_REQUIRED, ca_certs_file="/etc/ssl/certs/ca-certificates.crt"
     )
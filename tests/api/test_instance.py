@@ -34,6 +34,13 @@ from paasta_tools.utils import NoConfigurationForServiceError
 from tests.conftest import wrap_value_in_task
 
 
+@pytest.fixture(autouse=True)
+def clear_instance_status_cache():
+    instance.instance_status_cache.clear()
+    yield
+    instance.instance_status_cache.clear()
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "mock_job_config",
@@ -58,7 +65,7 @@ async def test_kubernetes_smartstack_status(mock_job_config):
     with mock.patch(
         "paasta_tools.api.views.instance.pik.match_backends_and_pods", autospec=True
     ) as mock_match_backends_and_pods, mock.patch(
-        "paasta_tools.api.views.instance.pik.smartstack_tools.get_backends",
+        "paasta_tools.api.views.instance.pik.smartstack_tools.get_multiple_backends",
         autospec=True,
     ), mock.patch(
         "paasta_tools.api.views.instance.pik.KubeSmartstackEnvoyReplicationChecker",
@@ -162,6 +169,59 @@ def test_instances_status_adhoc(
     }
 
 
+@mock.patch("paasta_tools.api.views.instance.get_instance_status", autospec=True)
+def test_instance_status_etag(mock_get_instance_status):
+    mock_get_instance_status.return_value = {"service": "fake_service", "foo": 1}
+
+    request = testing.DummyRequest()
+    request.swagger_data = {"service": "fake_service", "instance": "fake_instance"}
+    response = instance.instance_status(request)
+    assert response == {"service": "fake_service", "foo": 1}
+    etag = request.response.etag
+    assert etag == instance.get_status_etag({"foo": 1, "service": "fake_service"})
+
+    conditional_request = testing.DummyRequest(headers={"If-None-Match": f'"{etag}"'})
+    conditional_request.swagger_data = request.swagger_data
+    not_modified = instance.instance_status(conditional_request)
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == f'"{etag}"'
+
+    stale_request = testing.DummyRequest(headers={"If-None-Match": '"something"'})
+    stale_request.swagger_data = request.swagger_data
+    assert instance.instance_status(stale_request) == response
+
+    # all of the above were served from one computation of the status
+    assert mock_get_instance_status.call_count == 1
+
+
+@mock.patch("paasta_tools.api.views.instance.get_instance_status", autospec=True)
+def test_instance_status_cache_is_per_request_kind(mock_get_instance_status):
+    mock_get_instance_status.side_effect = lambda **kwargs: {
+        "verbose": kwargs["verbose"]
+    }
+
+    for verbose in [0, 1, 0, 1]:
+        request = testing.DummyRequest()
+        request.swagger_data = {
+            "service": "fake_service",
+            "instance": "fake_instance",
+            "verbose": verbose,
+        }
+        assert instance.instance_status(request) == {"verbose": verbose}
+    assert mock_get_instance_status.call_count == 2
+
+
+@mock.patch("paasta_tools.api.views.instance.get_instance_status", autospec=True)
+def test_instance_status_does_not_cache_failures(mock_get_instance_status):
+    mock_get_instance_status.side_effect = [ApiFailure("oops", 500), {"ok": True}]
+
+    request = testing.DummyRequest()
+    request.swagger_data = {"service": "fake_service", "instance": "fake_instance"}
+    with pytest.raises(ApiFailure):
+        instance.instance_status(request)
+    assert instance.instance_status(request) == {"ok": True}
+
+
 def test_add_executor_info():
     mock_mesos_task = mock.Mock()
     mock_executor = {
@@ -650,3 +710,104 @@ class TestInstanceReplicaRestart:
             instance.instance_replica_restart(mock_request)
 
         assert excinfo.value.err == 500
+
+
+@mock.patch("paasta_tools.api.views.instance.validate_service_instance", autospec=True)
+@mock.patch(
+    "paasta_tools.api.views.instance.pik.get_container_tail_lines", autospec=True
+)
+class TestInstanceReplicaContainerLogs:
+    @pytest.fixture(autouse=True)
+    def mock_settings(self):
+        with mock.patch(
+            "paasta_tools.api.views.instance.settings", autospec=True
+        ) as _mock_settings:
+            _mock_settings.cluster = "test_cluster"
+            _mock_settings.soa_dir = "/test/soa/dir"
+            yield
+
+    @pytest.fixture
+    def mock_request(self):
+        request = testing.DummyRequest()
+        request.swagger_data = {
+            "service": "test_service",
+            "instance": "test_instance",
+            "replica_name": "test-pod-12345",
+            "container_name": "main",
+            "previous": True,
+        }
+        return request
+
+    def test_success(
+        self,
+        mock_get_container_tail_lines,
+        mock_validate_service_instance,
+        mock_request,
+    ):
+        mock_validate_service_instance.return_value = "kubernetes"
+        mock_get_container_tail_lines.return_value = {
+            "stdout": ["a line"],
+            "stderr": [],
+            "error_message": "",
+        }
+
+        assert instance.instance_replica_container_logs(mock_request) == {
+            "stdout": ["a line"],
+            "stderr": [],
+            "error_message": "",
+        }
+        mock_get_container_tail_lines.assert_called_once_with(
+            service="test_service",
+            instance="test_instance",
+            instance_type="kubernetes",
+            replica_name="test-pod-12345",
+            container_name="main",
+            settings=mock.ANY,
+            num_tail_lines=100,
+            previous=True,
+            namespace=None,
+        )
+
+    def test_container_not_found(
+        self,
+        mock_get_container_tail_lines,
+        mock_validate_service_instance,
+        mock_request,
+    ):
+        mock_validate_service_instance.return_value = "kubernetes"
+        mock_get_container_tail_lines.return_value = None
+
+        with pytest.raises(ApiFailure) as excinfo:
+            instance.instance_replica_container_logs(mock_request)
+
+        assert excinfo.value.err == 404
+
+    def test_service_not_found(
+        self,
+        mock_get_container_tail_lines,
+        mock_validate_service_instance,
+        mock_request,
+    ):
+        mock_validate_service_instance.side_effect = NoConfigurationForServiceError
+
+        with pytest.raises(ApiFailure) as excinfo:
+            instance.instance_replica_container_logs(mock_request)
+
+        assert excinfo.value.err == 404
+        assert mock_get_container_tail_lines.call_count == 0
+
+    def test_instance_type_not_supported(
+        self,
+        mock_get_container_tail_lines,
+        mock_validate_service_instance,
+        mock_request,
+    ):
+        mock_validate_service_instance.return_value = "tron"
+        mock_get_container_tail_lines.side_effect = RuntimeError(
+            "Container logs not supported for instance type tron"
+        )
+
+        with pytest.raises(ApiFailure) as excinfo:
+            instance.instance_replica_container_logs(mock_request)
+
+        assert excinfo.value.err == 500
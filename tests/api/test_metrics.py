@@ -0,0 +1,34 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import mock
+
+from pyramid.request import Request
+
+from paasta_tools.api.tweens.metrics import REQUEST_LATENCY
+from paasta_tools.api.views import metrics
+
+
+def test_metrics():
+    REQUEST_LATENCY.labels("/v1/version", "GET", "200").observe(0.01)
+
+    response = metrics.metrics(mock.Mock(spec=Request))
+
+    assert response.status_int == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = response.body.decode()
+    assert (
+        'paasta_api_request_duration_seconds_count{method="GET",route="/v1/version",status="200"}'
+        in body
+    )
+    assert "paasta_api_requests_in_progress" in body
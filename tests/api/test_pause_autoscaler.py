@@ -19,9 +19,7 @@ from paasta_tools.api.views import pause_autoscaler
 
 
 def test_get_service_autoscaler_pause():
-    with mock.patch(
-        "paasta_tools.utils.KazooClient", autospec=True
-    ) as mock_zk, mock.patch(
+    with mock.patch("kazoo.client.KazooClient", autospec=True) as mock_zk, mock.patch(
         "paasta_tools.utils.load_system_paasta_config", autospec=True
     ):
         request = testing.DummyRequest()
@@ -34,9 +32,7 @@ def test_get_service_autoscaler_pause():
 
 
 def test_update_autoscaler_pause():
-    with mock.patch(
-        "paasta_tools.utils.KazooClient", autospec=True
-    ) as mock_zk, mock.patch(
+    with mock.patch("kazoo.client.KazooClient", autospec=True) as mock_zk, mock.patch(
         "paasta_tools.api.views.pause_autoscaler.time", autospec=True
     ) as mock_time, mock.patch(
         "paasta_tools.utils.load_system_paasta_config", autospec=True
@@ -56,9 +52,7 @@ def test_update_autoscaler_pause():
 
 
 def test_delete_autoscaler_pause():
-    with mock.patch(
-        "paasta_tools.utils.KazooClient", autospec=True
-    ) as mock_zk, mock.patch(
+    with mock.patch("kazoo.client.KazooClient", autospec=True) as mock_zk, mock.patch(
         "paasta_tools.api.views.pause_autoscaler.time", autospec=True
     ) as mock_time, mock.patch(
         "paasta_tools.utils.load_system_paasta_config", autospec=True
@@ -0,0 +1,49 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import mock
+
+import pytest
+
+from paasta_tools.api.tweens import profiling as profiling_tween
+from paasta_tools.api.views import profiling
+from paasta_tools.api.views.exception import ApiFailure
+
+
+def test_profiling_stacks_disabled():
+    with mock.patch.object(profiling_tween, "sampler", None), pytest.raises(
+        ApiFailure
+    ) as excinfo:
+        profiling.profiling_stacks(mock.Mock(params={}))
+    assert excinfo.value.err == 404
+
+
+@pytest.mark.parametrize(
+    "params,expected_kwargs",
+    [
+        ({}, {"route": None, "reset": False}),
+        (
+            {"route": "/v1/version", "reset": "true"},
+            {"route": "/v1/version", "reset": True},
+        ),
+    ],
+)
+def test_profiling_stacks(params, expected_kwargs):
+    mock_sampler = mock.Mock(spec=profiling_tween.StackSampler)
+    mock_sampler.collapsed_stacks.return_value = "a_route;main 1\n"
+    with mock.patch.object(profiling_tween, "sampler", mock_sampler):
+        response = profiling.profiling_stacks(mock.Mock(params=params))
+
+    assert mock_sampler.collapsed_stacks.call_args == mock.call(**expected_kwargs)
+    assert response.text == "a_route;main 1\n"
+    assert response.content_type == "text/plain"
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import threading
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
@@ -50,7 +51,10 @@ def test_call(mock_auth_tween):
         mock_is_authorized.return_value = auth.AuthorizationOutcome(True, "Ok")
         mock_auth_tween(mock_request)
         mock_is_authorized.assert_called_once_with(
-            "/something", "aaa.bbb.ccc", "post", "foobar"
+            "/something",
+            "aaa.bbb.ccc",
+            "post",
+            "foobar",
         )
         mock_auth_tween.handler.assert_called_once_with(mock_request)
 
@@ -109,3 +113,102 @@ def test_is_request_authorized_malformed(mock_auth_tween):
         "post",
         "foobar",
     ) == auth.AuthorizationOutcome(False, "Malformed auth response")
+
+
+def test_is_request_authorized_caches_by_path(mock_auth_tween):
+    mock_auth_tween.session.post.return_value.json.return_value = {
+        "result": {"allowed": True, "reason": "User allowed"}
+    }
+    for instance in ("main", "canary", "main"):
+        assert mock_auth_tween.is_request_authorized(
+            f"/v1/services/foobar/{instance}/status",
+            "aaa.bbb.ccc",
+            "get",
+            "foobar",
+        ) == auth.AuthorizationOutcome(True, "User allowed")
+    # the backend may decide differently per instance, so each path gets its own decision
+    assert mock_auth_tween.session.post.call_count == 2
+    assert mock_auth_tween.cache_info() == {
+        "hits": 1,
+        "misses": 2,
+        "coalesced": 0,
+        "size": 2,
+    }
+
+    # anything else in the key still needs its own decision
+    mock_auth_tween.is_request_authorized(
+        "/v1/services/foobar/main/status", "aaa.bbb.ccc", "post", "foobar"
+    )
+    mock_auth_tween.is_request_authorized(
+        "/v1/services/foobar/main/status", "eee.ddd.fff", "get", "foobar"
+    )
+    assert mock_auth_tween.session.post.call_count == 4
+
+
+def test_is_request_authorized_negative_ttl(mock_auth_tween):
+    mock_auth_tween.session.post.return_value.json.return_value = {
+        "result": {"allowed": False, "reason": "Nope"}
+    }
+    mock_timer = MagicMock(return_value=1000)
+    mock_auth_tween.cache = auth.cachetools.TLRUCache(
+        maxsize=10, ttu=auth._auth_cache_ttu, timer=mock_timer
+    )
+    for _ in range(2):
+        assert mock_auth_tween.is_request_authorized(
+            "/allowed", "aaa.bbb.ccc", "get", "foobar"
+        ) == auth.AuthorizationOutcome(False, "Nope")
+    assert mock_auth_tween.session.post.call_count == 1
+
+    mock_timer.return_value = 1000 + auth.AUTH_NEGATIVE_CACHE_TTL + 1
+    mock_auth_tween.is_request_authorized("/allowed", "aaa.bbb.ccc", "get", "foobar")
+    assert mock_auth_tween.session.post.call_count == 2
+
+
+def test_is_request_authorized_does_not_cache_errors(mock_auth_tween):
+    mock_auth_tween.session.post.side_effect = Exception
+    for _ in range(2):
+        assert mock_auth_tween.is_request_authorized(
+            "/allowed", "eee.ddd.fff", "get", "foobar"
+        ) == auth.AuthorizationOutcome(False, "Auth backend error")
+    assert mock_auth_tween.session.post.call_count == 2
+    assert len(mock_auth_tween.cache) == 0
+
+
+def test_is_request_authorized_single_flight(mock_auth_tween):
+    num_threads = 8
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_post(**kwargs):
+        started.set()
+        release.wait(timeout=5)
+        response = MagicMock()
+        response.json.return_value = {"result": {"allowed": True}}
+        return response
+
+    mock_auth_tween.session.post.side_effect = slow_post
+
+    results = []
+
+    def check():
+        results.append(
+            mock_auth_tween.is_request_authorized(
+                "/allowed", "aaa.bbb.ccc", "get", "foobar"
+            )
+        )
+
+    threads = [threading.Thread(target=check) for _ in range(num_threads)]
+    threads[0].start()
+    assert started.wait(timeout=5)
+    for thread in threads[1:]:
+        thread.start()
+    # wait until every other thread is blocked on the in-flight lookup
+    while mock_auth_tween.cache_coalesced < num_threads - 1:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == [auth.AuthorizationOutcome(True, "Ok")] * num_threads
+    assert mock_auth_tween.session.post.call_count == 1
+    assert mock_auth_tween.in_flight == {}
@@ -0,0 +1,133 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+from unittest import mock
+
+import pytest
+from kubernetes.client.rest import ApiException
+from pyramid.request import Request
+from pyramid.response import Response
+
+from paasta_tools.api.tweens import metrics
+
+
+def _request_count(route, method, status):
+    return (
+        metrics.REGISTRY.get_sample_value(
+            "paasta_api_request_duration_seconds_count",
+            {"route": route, "method": method, "status": status},
+        )
+        or 0
+    )
+
+
+def _kube_request_count(method, path, status):
+    return (
+        metrics.REGISTRY.get_sample_value(
+            "paasta_api_kubernetes_request_duration_seconds_count",
+            {"method": method, "path": path, "status": status},
+        )
+        or 0
+    )
+
+
+def _in_progress():
+    return metrics.REGISTRY.get_sample_value("paasta_api_requests_in_progress")
+
+
+def _matching(pattern):
+    def handler(request):
+        request.matched_route = mock.Mock(pattern=pattern)
+        assert _in_progress() == 1
+        return Response(status=200)
+
+    return handler
+
+
+def test_metrics_tween_records_route_template():
+    route = "/v1/services/{service}/{instance}/status"
+    tween = metrics.metrics_tween_factory(_matching(route), mock.Mock())
+    before = _request_count(route, "GET", "200")
+
+    tween(Request.blank("/v1/services/foo/main/status"))
+    tween(Request.blank("/v1/services/bar/canary/status"))
+
+    assert _request_count(route, "GET", "200") == before + 2
+    assert _in_progress() == 0
+
+
+def test_metrics_tween_unmatched_and_errors():
+    def not_found(request):
+        return Response(status=404)
+
+    def broken(request):
+        raise Exception("oops")
+
+    before_404 = _request_count(metrics.UNMATCHED_ROUTE, "GET", "404")
+    before_500 = _request_count(metrics.UNMATCHED_ROUTE, "POST", "500")
+
+    metrics.metrics_tween_factory(not_found, mock.Mock())(Request.blank("/nope"))
+    with pytest.raises(Exception):
+        metrics.metrics_tween_factory(broken, mock.Mock())(
+            Request.blank("/nope", method="POST")
+        )
+
+    assert _request_count(metrics.UNMATCHED_ROUTE, "GET", "404") == before_404 + 1
+    assert _request_count(metrics.UNMATCHED_ROUTE, "POST", "500") == before_500 + 1
+    assert _in_progress() == 0
+
+
+def test_metrics_tween_overhead():
+    """Benchmark-ish: the tween runs on every request, so it should be cheap."""
+    tween = metrics.metrics_tween_factory(
+        lambda request: Response(status=200), mock.Mock()
+    )
+    request = Request.blank("/v1/version")
+    runs = 2000
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        tween(request)
+    elapsed = (time.perf_counter() - start) / runs
+
+    # generous, to avoid flakiness - this is typically ~10us
+    assert elapsed < 0.001, f"metrics tween took {elapsed * 1e6:.0f}us per request"
+
+
+def test_instrument_kube_client():
+    mock_kube_client = mock.Mock()
+    mock_call_api = mock_kube_client.api_client.call_api
+    mock_call_api.side_effect = ["a_result", ApiException(status=404)]
+    mock_kube_client.api_client._paasta_api_instrumented = False
+    path = "/api/v1/namespaces/{namespace}/pods"
+    before_success = _kube_request_count("GET", path, "success")
+    before_404 = _kube_request_count("GET", path, "404")
+
+    metrics.instrument_kube_client(mock_kube_client)
+    # instrumenting twice shouldn't double count
+    metrics.instrument_kube_client(mock_kube_client)
+
+    api_client = mock_kube_client.api_client
+    assert api_client.call_api(path, "GET", path_params={"namespace": "a"}) == (
+        "a_result"
+    )
+    with pytest.raises(ApiException):
+        api_client.call_api(path, "GET", path_params={"namespace": "a"})
+
+    assert mock_call_api.call_args_list == [
+        mock.call(path, "GET", path_params={"namespace": "a"}),
+        mock.call(path, "GET", path_params={"namespace": "a"}),
+    ]
+    assert _kube_request_count("GET", path, "success") == before_success + 1
+    assert _kube_request_count("GET", path, "404") == before_404 + 1
@@ -0,0 +1,173 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import sys
+import threading
+import time
+from unittest import mock
+
+import pytest
+from pyramid.request import Request
+from pyramid.response import Response
+
+from paasta_tools.api.tweens import profiling
+
+
+@pytest.fixture(autouse=True)
+def reset_sampler():
+    with mock.patch.object(profiling, "sampler", None):
+        yield
+
+
+def _inner():
+    return profiling.fold_stack(sys._getframe())
+
+
+def _outer():
+    return _inner()
+
+
+def test_fold_stack():
+    frames = _outer().split(";")
+    assert frames[-1].startswith(f"_inner ({__file__}:")
+    assert frames[-2].startswith(f"_outer ({__file__}:")
+    assert frames[-3].startswith(f"test_fold_stack ({__file__}:")
+
+
+def test_stack_sampler_attributes_samples_to_routes():
+    sampler = profiling.StackSampler()
+    done = threading.Event()
+    registered = threading.Event()
+    sampled = threading.Event()
+
+    def serve_request():
+        sampler.begin_request()
+        registered.set()
+        sampled.wait(5)
+        sampler.end_request("/v1/services/{service}")
+
+    def background_work():
+        done.wait(5)
+
+    threads = [
+        threading.Thread(target=serve_request),
+        threading.Thread(target=background_work),
+    ]
+    for thread in threads:
+        thread.start()
+    registered.wait(5)
+    sampler.sample()
+    sampler.sample()
+    sampled.set()
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    stacks = sampler.stacks
+    assert sum(stacks["/v1/services/{service}"].values()) == 2
+    assert all("serve_request" in stack for stack in stacks["/v1/services/{service}"])
+    assert any("background_work" in stack for stack in stacks["[background]"])
+    assert sampler.samples_taken == 2
+    assert sampler.active == {}
+
+
+def test_stack_sampler_max_stacks_per_route():
+    sampler = profiling.StackSampler(max_stacks_per_route=2)
+    sampler.begin_request()
+    sampler.active[threading.get_ident()].update({"a": 1, "b": 2, "c": 3, "d": 4})
+    sampler.end_request("a_route")
+    assert sampler.stacks == {"a_route": {"a": 1, "b": 2, "[truncated]": 7}}
+
+
+def test_collapsed_stacks():
+    sampler = profiling.StackSampler()
+    sampler.stacks = {
+        "route_b": profiling.Counter({"main;b": 1}),
+        "route_a": profiling.Counter({"main;a;c": 3, "main;a": 2}),
+    }
+
+    assert sampler.collapsed_stacks() == (
+        "route_a;main;a 2\n" "route_a;main;a;c 3\n" "route_b;main;b 1\n"
+    )
+    assert sampler.collapsed_stacks(route="route_b", reset=True) == (
+        "route_b;main;b 1\n"
+    )
+    assert sampler.stacks == {}
+
+
+def test_stack_sampler_tween_factory_disabled():
+    handler = mock.Mock()
+    with mock.patch.object(
+        profiling, "get_stack_sampler_config", autospec=True, return_value={}
+    ):
+        assert profiling.stack_sampler_tween_factory(handler, mock.Mock()) is handler
+    assert profiling.sampler is None
+
+
+def test_stack_sampler_tween_factory():
+    sampled = threading.Event()
+    sample = profiling.StackSampler.sample
+
+    def sample_and_notify(self):
+        sample(self)
+        sampled.set()
+
+    def handler(request):
+        request.matched_route = mock.Mock(pattern="/v1/version")
+        # make sure that the sampler catches us in here
+        sampled.clear()
+        sampled.wait(5)
+        return Response()
+
+    with mock.patch.object(
+        profiling.StackSampler,
+        "sample",
+        autospec=True,
+        side_effect=sample_and_notify,
+    ), mock.patch.object(
+        profiling,
+        "get_stack_sampler_config",
+        autospec=True,
+        return_value={"stack_sampling_enabled": True, "stack_sampling_hz": 200},
+    ):
+        tween = profiling.stack_sampler_tween_factory(handler, mock.Mock())
+        try:
+            tween(Request.blank("/v1/version"))
+        finally:
+            profiling.sampler.stop()
+
+    assert any("handler" in stack for stack in profiling.sampler.stacks["/v1/version"])
+
+
+def test_stack_sampler_overhead():
+    """Benchmark-ish: at the default rate, sampling should cost well under 1%
+    of a CPU even with a bunch of threads around."""
+    sampler = profiling.StackSampler()
+    done = threading.Event()
+    threads = [threading.Thread(target=done.wait) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    try:
+        runs = 100
+        start = time.perf_counter()
+        for _ in range(runs):
+            sampler.sample()
+        per_sample = (time.perf_counter() - start) / runs
+    finally:
+        done.set()
+        for thread in threads:
+            thread.join()
+
+    overhead = per_sample * profiling.DEFAULT_SAMPLING_HZ
+    # generous, to avoid flakiness - this is typically well under 0.1%
+    assert overhead < 0.01, f"sampling costs {overhead:.2%} of a CPU"
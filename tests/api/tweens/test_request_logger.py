@@ -11,6 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import threading
+import time
 from datetime import datetime
 from datetime import timezone
 from unittest import mock
@@ -80,6 +82,7 @@ def test_request_logger_tween_factory_log(mock_clog, mock_factory):
         level="ERROR",
         additional_fields={"additional_key": "additional_value"},
     )
+    assert mock_factory.writer.flush(timeout=5)
     assert mock_clog.log_line.call_args_list == [
         mock.call(
             "request_logs",
@@ -164,3 +167,105 @@ def test_request_logger_tween_factory_call(
             },
         ),
     ]
+
+
+def test_request_logger_tween_factory_writer_settings(mock_handler, mock_registry):
+    mock_registry.settings = {
+        "request_log_queue_size": "3",
+        "request_log_batch_size": "2",
+        "request_log_overflow_policy": "drop_oldest",
+    }
+    factory = request_logger.request_logger_tween_factory(mock_handler, mock_registry)
+    assert factory.writer.queue.maxsize == 3
+    assert factory.writer.batch_size == 2
+    assert factory.writer.overflow_policy == "drop_oldest"
+
+
+def test_request_log_writer_bad_overflow_policy():
+    with pytest.raises(ValueError):
+        request_logger.RequestLogWriter("request_logs", overflow_policy="block")
+
+
+@pytest.mark.parametrize(
+    "policy,expected_queued",
+    [
+        ("drop_newest", [{"n": 0}, {"n": 1}]),
+        ("drop_oldest", [{"n": 2}, {"n": 3}]),
+    ],
+)
+def test_request_log_writer_overflow(policy, expected_queued):
+    writer = request_logger.RequestLogWriter(
+        "request_logs", max_queue_size=2, overflow_policy=policy
+    )
+    # no writer thread, so nothing drains the queue
+    with mock.patch.object(writer, "_ensure_started", autospec=True):
+        results = [writer.enqueue({"n": n}) for n in range(4)]
+
+    if policy == "drop_newest":
+        assert results == [True, True, False, False]
+    else:
+        assert results == [True, True, True, True]
+    assert [writer.queue.get_nowait() for _ in range(2)] == expected_queued
+    assert writer.stats() == {
+        "enqueued": 2 if policy == "drop_newest" else 4,
+        "written": 0,
+        "dropped": 2,
+        "write_errors": 0,
+        "queued": 0,
+    }
+    assert writer.pending == 2
+
+
+def test_request_log_writer_batches(mock_clog):
+    writer = request_logger.RequestLogWriter("request_logs", batch_size=3)
+    for n in range(5):
+        writer.queue.put_nowait({"n": n})
+    writer.pending = 5
+
+    assert writer._next_batch() == [{"n": 0}, {"n": 1}, {"n": 2}]
+    writer.write_batch([{"n": 0}, {"n": 1}, {"n": 2}])
+    assert writer._next_batch() == [{"n": 3}, {"n": 4}]
+
+    assert mock_clog.log_line.call_args_list == [
+        mock.call("request_logs", '{"n": 0}'),
+        mock.call("request_logs", '{"n": 1}'),
+        mock.call("request_logs", '{"n": 2}'),
+    ]
+    assert writer.written == 3
+    assert writer.pending == 2
+
+
+def test_request_log_writer_counts_write_errors(mock_clog):
+    mock_clog.log_line.side_effect = [Exception("sink down"), None]
+    writer = request_logger.RequestLogWriter("request_logs")
+    assert writer.enqueue({"n": 0})
+    assert writer.enqueue({"n": 1})
+
+    assert writer.flush(timeout=5)
+    assert writer.stats() == {
+        "enqueued": 2,
+        "written": 1,
+        "dropped": 0,
+        "write_errors": 1,
+        "queued": 0,
+    }
+
+
+def test_request_log_writer_does_not_block_on_slow_sink(mock_clog):
+    release = threading.Event()
+    mock_clog.log_line.side_effect = lambda *args: release.wait(5)
+    writer = request_logger.RequestLogWriter(
+        "request_logs", max_queue_size=10, batch_size=1
+    )
+
+    start = time.monotonic()
+    for n in range(100):
+        writer.enqueue({"n": n})
+    assert time.monotonic() - start < 1
+    # the writer is stuck on (at most) one record, so the rest overflowed
+    assert writer.dropped >= 100 - 10 - 1
+    assert writer.flush(timeout=0.01) is False
+
+    release.set()
+    assert writer.flush(timeout=5)
+    assert writer.written + writer.dropped == 100
@@ -1,3 +1,10 @@
+import pytest
+from hypothesis import given
+from hypothesis.strategies import floats
+from hypothesis.strategies import integers
+from hypothesis.strategies import lists
+from hypothesis.strategies import tuples
+
 from paasta_tools.autoscaling import forecasting
 
 
@@ -70,3 +77,117 @@ def test_linreg_forecast_policy():
     assert 350 == forecasting.linreg_forecast_policy(
         historical_load_2, linreg_window_seconds=7, linreg_extrapolation_seconds=0
     )
+
+
+# unix-ish timestamps and loads, with the odd duplicate timestamp
+historical_loads = lists(
+    lists(
+        tuples(
+            integers(min_value=1_600_000_000, max_value=1_600_000_600),
+            floats(min_value=0, max_value=1e6),
+        ),
+        min_size=1,
+        max_size=30,
+    ),
+    min_size=1,
+    max_size=5,
+)
+
+
+def _moving_average_reference(historical_load, moving_average_window_seconds):
+    windowed_data = forecasting.trailing_window_historical_load(
+        historical_load, moving_average_window_seconds
+    )
+    windowed_values = [value for timestamp, value in windowed_data]
+    return sum(windowed_values) / len(windowed_values)
+
+
+def _linreg_reference(
+    historical_load,
+    linreg_window_seconds,
+    linreg_extrapolation_seconds,
+    linreg_default_slope,
+):
+    """A plain Python linear regression, to check the vectorized one against."""
+    window = forecasting.trailing_window_historical_load(
+        historical_load, linreg_window_seconds
+    )
+    times = [timestamp for timestamp, load in window]
+    mean_time = sum(times) / len(times)
+    mean_load = sum(load for timestamp, load in window) / len(window)
+    if len(window) > 1:
+        slope = sum((t - mean_time) * (l - mean_load) for t, l in window) / sum(
+            (t - mean_time) ** 2 for t in times
+        )
+    else:
+        slope = linreg_default_slope
+    intercept = mean_load - slope * mean_time
+    now, _ = historical_load[-1]
+    return max(
+        slope * (now + delta) + intercept for delta in linreg_extrapolation_seconds
+    )
+
+
+def _forecast_or_exception(policy, *args, **kwargs):
+    try:
+        return policy(*args, **kwargs)
+    except ZeroDivisionError as e:
+        return type(e)
+
+
+@given(
+    historical_loads=historical_loads,
+    window=integers(min_value=0, max_value=900),
+)
+def test_moving_average_forecast_many_matches_reference(historical_loads, window):
+    expected = [
+        _moving_average_reference(historical_load, moving_average_window_seconds=window)
+        for historical_load in historical_loads
+    ]
+    assert forecasting.moving_average_forecast_many(
+        historical_loads, moving_average_window_seconds=window
+    ) == pytest.approx(expected, rel=1e-9)
+
+
+@given(
+    historical_loads=historical_loads,
+    window=integers(min_value=0, max_value=900),
+    extrapolation=lists(integers(min_value=0, max_value=600), min_size=1, max_size=3),
+    default_slope=floats(min_value=-10, max_value=10),
+)
+def test_linreg_forecast_many_matches_reference(
+    historical_loads, window, extrapolation, default_slope
+):
+    kwargs = dict(
+        linreg_window_seconds=window,
+        linreg_extrapolation_seconds=extrapolation,
+        linreg_default_slope=default_slope,
+    )
+    expected = [
+        _forecast_or_exception(_linreg_reference, historical_load, **kwargs)
+        for historical_load in historical_loads
+    ]
+    actual = _forecast_or_exception(
+        forecasting.linreg_forecast_many, historical_loads, **kwargs
+    )
+    if ZeroDivisionError in expected:
+        assert actual is ZeroDivisionError
+    else:
+        assert actual == pytest.approx(expected, rel=1e-6, abs=1e-6)
+
+
+def test_forecast_many():
+    historical_load = [(1, 100), (2, 120), (3, 140), (4, 160), (5, 180)]
+    assert forecasting.forecast_many(
+        "moving_average",
+        [historical_load, historical_load[:2]],
+        moving_average_window_seconds=5,
+    ) == [140, 110]
+    assert forecasting.forecast_many(
+        "linreg",
+        [historical_load],
+        linreg_window_seconds=5,
+        linreg_extrapolation_seconds=[0, 10],
+    ) == [380]
+    assert forecasting.forecast_many("current", [historical_load]) == [180]
+    assert forecasting.forecast_many("linreg", [], linreg_window_seconds=5) == []
@@ -0,0 +1,190 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import subprocess
+import sys
+from unittest import mock
+
+import pytest
+
+from paasta_tools.cli import cli
+
+COMMON_SUBCOMMANDS = [
+    "status",
+    "logs",
+    "list",
+    "mark-for-deployment",
+    "local-run",
+    "start",
+    "validate",
+]
+
+
+def _make_executable(path):
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+
+
+@pytest.fixture
+def fake_path(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    _make_executable(bin_dir / "paasta-foo")
+    _make_executable(bin_dir / "paasta-status")
+    (bin_dir / "paasta-not-executable").write_text("")
+    _make_executable(bin_dir / "something-else")
+    monkeypatch.setenv(
+        "PATH", os.pathsep.join([str(bin_dir), str(tmp_path / "does-not-exist")])
+    )
+    return bin_dir
+
+
+def test_list_external_commands(fake_path):
+    assert cli.list_external_commands() == {"foo", "status"}
+
+
+def test_find_external_command(fake_path):
+    assert cli.find_external_command("foo") == str(fake_path / "paasta-foo")
+    assert cli.find_external_command("not-executable") is None
+    assert cli.find_external_command("bar") is None
+
+
+@pytest.mark.parametrize("command", COMMON_SUBCOMMANDS)
+def test_calling_external_command_skips_path_for_builtin_subcommands(command):
+    with mock.patch.object(
+        cli.sys, "argv", ["paasta", command, "--help"]
+    ), mock.patch.object(
+        cli, "find_external_command", autospec=True
+    ) as mock_find_external_command:
+        assert cli.calling_external_command() is False
+    assert mock_find_external_command.call_count == 0
+
+
+def test_calling_external_command(fake_path):
+    with mock.patch.object(cli.sys, "argv", ["paasta", "foo", "--bar"]):
+        assert cli.calling_external_command() is True
+    with mock.patch.object(cli.sys, "argv", ["paasta", "bar"]):
+        assert cli.calling_external_command() is False
+    with mock.patch.object(cli.sys, "argv", ["paasta"]):
+        assert cli.calling_external_command() is False
+
+
+def test_get_argparser_lists_external_commands(fake_path):
+    parser = cli.get_argparser(commands=[])
+    args, _ = parser.parse_known_args(["foo"])
+    assert args.command == "foo"
+
+
+@pytest.mark.parametrize("command", COMMON_SUBCOMMANDS)
+def test_startup_overhead_for_common_subcommands(command, capsys):
+    """The work done before a builtin subcommand runs should be cheap, and in
+    particular shouldn't shell out or walk $PATH."""
+    argv = [command, "--help"]
+    # some subcommands' modules shell out when they're first imported
+    cli.get_argparser(commands=[command])
+    with mock.patch.object(cli.sys, "argv", ["paasta", *argv]), mock.patch.object(
+        cli, "list_external_commands", autospec=True
+    ) as mock_list_external_commands, mock.patch.object(
+        cli, "find_external_command", autospec=True
+    ) as mock_find_external_command, mock.patch(
+        "subprocess.Popen", autospec=True
+    ) as mock_popen:
+        with pytest.raises(SystemExit):
+            cli.main(argv)
+
+    assert f" {command} [-h]" in capsys.readouterr().out
+    assert mock_popen.call_count == 0
+    assert mock_list_external_commands.call_count == 0
+    assert mock_find_external_command.call_count == 0
+
+
+def test_parse_args_lists_external_commands_only_when_needed(fake_path):
+    with mock.patch.object(
+        cli, "list_external_commands", autospec=True, return_value={"foo"}
+    ) as mock_list_external_commands:
+        args, _ = cli.parse_args(["list"])
+        assert mock_list_external_commands.call_count == 0
+
+        with pytest.raises(SystemExit):
+            cli.parse_args(["--help"])
+        assert mock_list_external_commands.call_count == 1
+
+        args, _ = cli.parse_args(["foo"])
+        assert args.command == "foo"
+        assert mock_list_external_commands.call_count == 1
+
+
+# subcommands that shouldn't need the kubernetes client, the generated API
+# client and friends just to build their parser (i.e. for --help and completion)
+LIGHTWEIGHT_SUBCOMMANDS = [
+    "check",
+    "check-rollback-status",
+    "cook-image",
+    "get-docker-image",
+    "get-image-version",
+    "get-latest-deployment",
+    "info",
+    "itest",
+    "list",
+    "list-clusters",
+    "list-namespaces",
+    "logs",
+    "push-to-registry",
+    "security-check",
+    "verify-image-exists",
+]
+
+HEAVY_MODULES = [
+    "boto3",
+    "docker",
+    "kazoo",
+    "kubernetes",
+    "ldap3",
+    "nats",
+    "networkx",
+    "paasta_tools.kubernetes_tools",
+    "paasta_tools.paastaapi",
+    "requests_cache",
+]
+
+
+def _modules_imported_by_subcommand(command):
+    """Builds the parser for a subcommand in a fresh interpreter, returning the
+    modules that ended up imported."""
+    code = (
+        "import sys\n"
+        "from paasta_tools.cli import cli\n"
+        f"cli.get_argparser(commands=[{command!r}] if {command!r} else [])\n"
+        "print('\\n'.join(sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize("command", ["", *LIGHTWEIGHT_SUBCOMMANDS])
+def test_subcommand_avoids_heavy_imports(command):
+    modules = _modules_imported_by_subcommand(command)
+
+    assert not [
+        module
+        for module in modules
+        if any(
+            module == heavy or module.startswith(f"{heavy}.") for heavy in HEAVY_MODULES
+        )
+    ]
@@ -46,7 +46,7 @@ from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
 @patch("paasta_tools.cli.cmds.check.deployments_check", autospec=True)
 @patch("paasta_tools.cli.cmds.check.sensu_check", autospec=True)
 @patch("paasta_tools.cli.cmds.check.smartstack_check", autospec=True)
-@patch("paasta_tools.cli.cmds.check.paasta_validate_soa_configs", autospec=True)
+@patch("paasta_tools.cli.cmds.validate.paasta_validate_soa_configs", autospec=True)
 def test_check_paasta_check_calls_everything(
     mock_paasta_validate_soa_configs,
     mock_smartstart_check,
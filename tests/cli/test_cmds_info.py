@@ -31,7 +31,7 @@ def test_get_service_info():
     ) as mock_scl_read_service_configuration, mock.patch(
         "service_configuration_lib.read_extra_service_information", autospec=True
     ) as mock_read_extra_service_information, mock.patch(
-        "paasta_tools.cli.cmds.info.get_actual_deployments", autospec=True
+        "paasta_tools.cli.cmds.status.get_actual_deployments", autospec=True
     ) as mock_get_actual_deployments, mock.patch(
         "paasta_tools.cli.cmds.info.get_smartstack_endpoints", autospec=True
     ) as mock_get_smartstack_endpoints:
@@ -122,7 +122,7 @@ def test_get_smartstack_endpoints_tcp():
 
 def test_get_deployments_strings_default_case_with_smartstack():
     with mock.patch(
-        "paasta_tools.cli.cmds.info.get_actual_deployments", autospec=True
+        "paasta_tools.cli.cmds.status.get_actual_deployments", autospec=True
     ) as mock_get_actual_deployments, mock.patch(
         "service_configuration_lib.read_extra_service_information", autospec=True
     ) as mock_read_extra_service_information:
@@ -146,7 +146,7 @@ def test_get_deployments_strings_default_case_with_smartstack():
 
 def test_get_deployments_strings_protocol_tcp_case():
     with mock.patch(
-        "paasta_tools.cli.cmds.info.get_actual_deployments", autospec=True
+        "paasta_tools.cli.cmds.status.get_actual_deployments", autospec=True
     ) as mock_get_actual_deployments, mock.patch(
         "paasta_tools.cli.cmds.info.load_service_namespace_config", autospec=True
     ) as mock_load_service_namespace_config:
@@ -161,7 +161,7 @@ def test_get_deployments_strings_protocol_tcp_case():
 
 def test_get_deployments_strings_non_listening_service():
     with mock.patch(
-        "paasta_tools.cli.cmds.info.get_actual_deployments", autospec=True
+        "paasta_tools.cli.cmds.status.get_actual_deployments", autospec=True
     ) as mock_get_actual_deployments, mock.patch(
         "paasta_tools.cli.cmds.info.load_service_namespace_config", autospec=True
     ) as mock_load_service_namespace_config:
@@ -174,7 +174,7 @@ def test_get_deployments_strings_non_listening_service():
 
 def test_get_deployments_strings_no_deployments():
     with mock.patch(
-        "paasta_tools.cli.cmds.info.get_actual_deployments", autospec=True
+        "paasta_tools.cli.cmds.status.get_actual_deployments", autospec=True
     ) as mock_get_actual_deployments:
         mock_get_actual_deployments.side_effect = NoDeploymentsAvailable
         actual = info.get_deployments_strings("unused", "/fake/soa/dir")
@@ -19,6 +19,7 @@ from paasta_tools import remote_git
 from paasta_tools.cli.cli import parse_args
 from paasta_tools.cli.cmds import start_stop_restart
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
+from paasta_tools.utils import DeploymentRefIndex
 
 
 def test_format_tag():
@@ -150,7 +151,9 @@ def test_log_event():
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.get_latest_deployment_tag", autospec=True
 )
-@mock.patch("paasta_tools.cli.cmds.start_stop_restart.get_remote_refs", autospec=True)
+@mock.patch(
+    "paasta_tools.cli.cmds.start_stop_restart.get_remote_ref_index", autospec=True
+)
 @mock.patch("paasta_tools.utils.InstanceConfig", autospec=True)
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.get_instance_config", autospec=True
@@ -162,7 +165,7 @@ def test_paasta_start_or_stop(
     mock_get_git_url,
     mock_get_instance_config,
     mock_instance_config,
-    get_remote_refs,
+    mock_get_remote_ref_index,
     mock_get_latest_deployment_tag,
     mock_format_timestamp,
     mock_issue_state_change_for_service,
@@ -187,7 +190,7 @@ def test_paasta_start_or_stop(
     mock_get_git_url.return_value = "fake_git_url"
     mock_get_instance_config.return_value = mock_instance_config
     mock_instance_config.get_deploy_group.return_value = "some_group"
-    get_remote_refs.return_value = ["not_a_real_tag", "fake_tag"]
+    mock_get_remote_ref_index.return_value = ["not_a_real_tag", "fake_tag"]
     mock_get_latest_deployment_tag.return_value = ("not_a_real_tag", None, None)
     mock_format_timestamp.return_value = "not_a_real_timestamp"
     mock_apply_args_filters.return_value = {
@@ -263,7 +266,9 @@ def test_paasta_start_or_stop(
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.get_latest_deployment_tag", autospec=True
 )
-@mock.patch("paasta_tools.cli.cmds.start_stop_restart.get_remote_refs", autospec=True)
+@mock.patch(
+    "paasta_tools.cli.cmds.start_stop_restart.get_remote_ref_index", autospec=True
+)
 @mock.patch("paasta_tools.utils.InstanceConfig", autospec=True)
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.get_instance_config", autospec=True
@@ -275,7 +280,7 @@ def test_paasta_start_or_stop_with_deploy_group(
     mock_get_git_url,
     mock_get_instance_config,
     mock_instance_config,
-    mock_get_remote_refs,
+    mock_get_remote_ref_index,
     mock_get_latest_deployment_tag,
     mock_format_timestamp,
     mock_issue_state_change_for_service,
@@ -300,7 +305,7 @@ def test_paasta_start_or_stop_with_deploy_group(
     mock_get_git_url.return_value = "fake_git_url"
     mock_get_instance_config.return_value = mock_instance_config
     mock_instance_config.get_deploy_group.return_value = args.deploy_group
-    mock_get_remote_refs.return_value = ["not_a_real_tag", "fake_tag"]
+    mock_get_remote_ref_index.return_value = ["not_a_real_tag", "fake_tag"]
     mock_get_latest_deployment_tag.return_value = ("not_a_real_tag", None, None)
     mock_format_timestamp.return_value = "not_a_real_timestamp"
     mock_apply_args_filters.return_value = {
@@ -345,7 +350,9 @@ def test_paasta_start_or_stop_with_deploy_group(
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.get_latest_deployment_tag", autospec=True
 )
-@mock.patch("paasta_tools.cli.cmds.start_stop_restart.get_remote_refs", autospec=True)
+@mock.patch(
+    "paasta_tools.cli.cmds.start_stop_restart.get_remote_ref_index", autospec=True
+)
 @mock.patch("paasta_tools.utils.InstanceConfig", autospec=True)
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.get_instance_config", autospec=True
@@ -357,7 +364,7 @@ def test_stop_or_start_figures_out_correct_instances(
     mock_get_git_url,
     mock_get_instance_config,
     mock_instance_config,
-    mock_get_remote_refs,
+    mock_get_remote_ref_index,
     mock_get_latest_deployment_tag,
     mock_format_timestamp,
     mock_issue_state_change_for_service,
@@ -382,7 +389,7 @@ def test_stop_or_start_figures_out_correct_instances(
     mock_get_git_url.return_value = "fake_git_url"
     mock_get_instance_config.return_value = mock_instance_config
     mock_instance_config.get_deploy_group.return_value = "some_group"
-    mock_get_remote_refs.return_value = ["not_a_real_tag", "fake_tag"]
+    mock_get_remote_ref_index.return_value = ["not_a_real_tag", "fake_tag"]
     mock_get_latest_deployment_tag.return_value = ("not_a_real_tag", None, None)
     mock_format_timestamp.return_value = "not_a_real_timestamp"
     mock_apply_args_filters.return_value = {
@@ -442,7 +449,9 @@ def test_stop_or_start_figures_out_correct_instances(
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.apply_args_filters", autospec=True
 )
-@mock.patch("paasta_tools.cli.cmds.start_stop_restart.get_remote_refs", autospec=True)
+@mock.patch(
+    "paasta_tools.cli.cmds.start_stop_restart.get_remote_ref_index", autospec=True
+)
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.get_instance_config", autospec=True
 )
@@ -452,7 +461,7 @@ def test_stop_or_start_handle_ls_remote_failures(
     mock_list_clusters,
     mock_get_git_url,
     mock_get_instance_config,
-    mock_get_remote_refs,
+    mock_get_remote_ref_index,
     mock_apply_args_filters,
     mock_confirm_to_continue,
     mock_can_user_deploy_service,
@@ -465,7 +474,7 @@ def test_stop_or_start_handle_ls_remote_failures(
     mock_list_clusters.return_value = ["cluster1"]
     mock_get_git_url.return_value = "fake_git_url"
     mock_get_instance_config.return_value = None
-    mock_get_remote_refs.side_effect = remote_git.LSRemoteException
+    mock_get_remote_ref_index.side_effect = remote_git.LSRemoteException
     mock_apply_args_filters.return_value = {
         "cluster1": {"fake_service": {"instance1": mock.Mock()}}
     }
@@ -487,11 +496,13 @@ def test_stop_or_start_handle_ls_remote_failures(
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.get_instance_config", autospec=True
 )
-@mock.patch("paasta_tools.cli.cmds.start_stop_restart.get_remote_refs", autospec=True)
+@mock.patch(
+    "paasta_tools.cli.cmds.start_stop_restart.get_remote_ref_index", autospec=True
+)
 @mock.patch("paasta_tools.cli.cmds.status.list_clusters", autospec=True)
 def test_start_or_stop_bad_refs(
     mock_list_clusters,
-    mock_get_remote_refs,
+    mock_get_remote_ref_index,
     mock_get_instance_config,
     mock_apply_args_filters,
     mock_confirm_to_continue,
@@ -520,9 +531,11 @@ def test_start_or_stop_bad_refs(
         config_dict={},
         branch_dict=None,
     )
-    mock_get_remote_refs.return_value = {
-        "refs/tags/paasta-deliberatelyinvalidref-20160304T053919-deploy": "70f7245ccf039d778c7e527af04eac00d261d783"
-    }
+    mock_get_remote_ref_index.return_value = DeploymentRefIndex(
+        {
+            "refs/tags/paasta-deliberatelyinvalidref-20160304T053919-deploy": "70f7245ccf039d778c7e527af04eac00d261d783"
+        }
+    )
     mock_apply_args_filters.return_value = {
         "fake_cluster1": {"fake_service": {"fake_instance": None}},
         "fake_cluster2": {"fake_service": {"fake_instance": None}},
@@ -543,7 +556,9 @@ def test_start_or_stop_bad_refs(
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.get_latest_deployment_tag", autospec=True
 )
-@mock.patch("paasta_tools.cli.cmds.start_stop_restart.get_remote_refs", autospec=True)
+@mock.patch(
+    "paasta_tools.cli.cmds.start_stop_restart.get_remote_ref_index", autospec=True
+)
 @mock.patch("paasta_tools.utils.InstanceConfig", autospec=True)
 @mock.patch(
     "paasta_tools.cli.cmds.start_stop_restart.get_instance_config", autospec=True
@@ -555,7 +570,7 @@ def test_start_warn_on_multi_instance(
     mock_get_git_url,
     mock_get_instance_config,
     mock_instance_config,
-    get_remote_refs,
+    mock_get_remote_ref_index,
     mock_get_latest_deployment_tag,
     mock_format_timestamp,
     mock_issue_state_change_for_service,
@@ -577,7 +592,7 @@ def test_start_warn_on_multi_instance(
     mock_get_git_url.return_value = "fake_git_url"
     mock_get_instance_config.return_value = mock_instance_config
     mock_instance_config.get_deploy_group.return_value = "some_group"
-    get_remote_refs.return_value = ["not_a_real_tag", "fake_tag"]
+    mock_get_remote_ref_index.return_value = ["not_a_real_tag", "fake_tag"]
     mock_get_latest_deployment_tag.return_value = ("not_a_real_tag", None, None)
     mock_format_timestamp.return_value = "not_a_real_timestamp"
     mock_apply_args_filters.return_value = {
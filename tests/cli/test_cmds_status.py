@@ -769,6 +769,7 @@ def test_apply_args_filters_no_instances_found(
         assert i in output
 
 
+@patch("paasta_tools.cli.cmds.status.ServiceIndex", autospec=True)
 @patch("paasta_tools.cli.cmds.status.get_instance_configs_for_service", autospec=True)
 @patch("paasta_tools.cli.cmds.status.list_services", autospec=True)
 @patch("paasta_tools.cli.cmds.status.figure_out_service_name", autospec=True)
@@ -786,11 +787,14 @@ def test_status_with_owner(
     mock_figure_out_service_name,
     mock_list_services,
     mock_get_instance_configs_for_service,
+    mock_service_index,
     system_paasta_config,
 ):
 
     mock_load_system_paasta_config.return_value = system_paasta_config
-    mock_list_services.return_value = ["fakeservice", "otherservice"]
+    mock_list_services.return_value = ["fakeservice", "otherservice", "unowned"]
+    mock_get_services_owned_by = mock_service_index.return_value.get_services_owned_by
+    mock_get_services_owned_by.return_value = ["fakeservice", "otherservice"]
     cluster = "fake_cluster"
     mock_list_clusters.return_value = [cluster]
     mock_inst_1 = make_fake_instance_conf(
@@ -827,6 +831,16 @@ def test_status_with_owner(
 
     assert return_value == 0
     assert mock_report_status.call_count == 2
+    assert mock_get_services_owned_by.call_args == mock.call(
+        owners=["faketeam"],
+        services=["fakeservice", "otherservice", "unowned"],
+        clusters=None,
+    )
+    # only the services that the index says are owned get their configs loaded
+    assert [
+        call[0][0] for call in mock_get_instance_configs_for_service.call_args_list
+    ] == ["fakeservice", "otherservice"]
+    assert mock_service_index.return_value.save.call_count == 1
 
 
 @patch("paasta_tools.cli.cmds.status.list_clusters", autospec=True)
@@ -36,8 +36,11 @@ from paasta_tools.cli.cmds.validate import check_service_path
 from paasta_tools.cli.cmds.validate import get_config_file_dict
 from paasta_tools.cli.cmds.validate import get_schema_validator
 from paasta_tools.cli.cmds.validate import get_service_path
+from paasta_tools.cli.cmds.validate import get_services_for_changed_paths
 from paasta_tools.cli.cmds.validate import list_upcoming_runs
+from paasta_tools.cli.cmds.validate import list_validatable_services
 from paasta_tools.cli.cmds.validate import paasta_validate
+from paasta_tools.cli.cmds.validate import paasta_validate_services
 from paasta_tools.cli.cmds.validate import paasta_validate_soa_configs
 from paasta_tools.cli.cmds.validate import validate_autoscaling_configs
 from paasta_tools.cli.cmds.validate import validate_cpu_burst
@@ -118,6 +121,8 @@ def test_paasta_validate_calls_everything(
     args = mock.MagicMock()
     args.service = "test"
     args.soa_dir = None
+    args.all_services = False
+    args.changed_paths = None
 
     paasta_validate(args)
 
@@ -179,6 +184,8 @@ def test_validate_unknown_service():
     args = mock.MagicMock()
     args.service = None
     args.yelpsoa_config_root = "unused"
+    args.all_services = False
+    args.changed_paths = None
     paasta_validate(args) == 1
 
 
@@ -186,6 +193,8 @@ def test_validate_service_name():
     args = mock.MagicMock()
     args.service = "aa________________________________a"
     args.yelpsoa_config_root = "unused"
+    args.all_services = False
+    args.changed_paths = None
     paasta_validate(args) == 1
 
 
@@ -270,6 +279,10 @@ def test_get_schema_tron_found():
     get_schema_validator("tron")
 
 
+def test_get_schema_validator_is_only_built_once():
+    assert get_schema_validator("kubernetes") is get_schema_validator("kubernetes")
+
+
 def test_get_schema_missing():
     with pytest.raises(FileNotFoundError):
         get_schema_validator("fake_schema")
@@ -2171,3 +2184,105 @@ def test_validate_pool_limits_passes_for_unconfigured_pool(
     ]
 
     assert validate_pool_limits("fake-service-path") is True
+
+
+def _make_soa_dir(tmp_path, services):
+    for service in services:
+        (tmp_path / service).mkdir()
+        (tmp_path / service / "service.yaml").write_text("description: test\n")
+    # directories without a service.yaml are not services
+    (tmp_path / "_shared").mkdir()
+    (tmp_path / "_shared" / "something.yaml").write_text("foo: bar\n")
+    return str(tmp_path)
+
+
+def test_list_validatable_services(tmp_path):
+    soa_dir = _make_soa_dir(tmp_path, ["b_service", "a_service"])
+    assert list_validatable_services(soa_dir) == ["a_service", "b_service"]
+
+
+def test_get_services_for_changed_paths(tmp_path):
+    soa_dir = _make_soa_dir(tmp_path, ["a_service", "b_service", "c_service"])
+    assert get_services_for_changed_paths(
+        soa_dir,
+        [
+            "c_service/kubernetes-norcal-devc.yaml",
+            os.path.join(soa_dir, "a_service", "service.yaml"),
+            "c_service/tron-norcal-devc.yaml",
+            "_shared/something.yaml",
+            "deleted_service/service.yaml",
+            "../outside/service.yaml",
+        ],
+    ) == ["a_service", "c_service"]
+
+
+def test_get_services_for_changed_paths_soa_dir_itself(tmp_path):
+    soa_dir = _make_soa_dir(tmp_path, ["a_service", "b_service"])
+    for path in (".", soa_dir, soa_dir + "/", "a_service/.."):
+        assert get_services_for_changed_paths(soa_dir, ["a_service", path]) == [
+            "a_service",
+            "b_service",
+        ]
+
+
+@patch("paasta_tools.cli.cmds.validate.paasta_validate_soa_configs", autospec=True)
+def test_paasta_validate_services_reports_in_order(
+    mock_paasta_validate_soa_configs, capsys
+):
+    def fake_validate(service, service_path, verbose):
+        print(f"checked {service_path}")
+        if service == "boom":
+            raise Exception("oh no")
+        return service != "bad"
+
+    mock_paasta_validate_soa_configs.side_effect = fake_validate
+
+    invalid = paasta_validate_services(
+        services=["good", "bad", "boom", "also_good"],
+        soa_dir="/soa",
+        max_workers=1,
+    )
+
+    assert invalid == ["bad", "boom"]
+    output = capsys.readouterr().out
+    assert output.index("good:") < output.index("bad:") < output.index("boom:")
+    assert output.index("boom:") < output.index("also_good:")
+    assert "checked /soa/bad" in output
+    assert "oh no" in output
+
+
+@patch("paasta_tools.cli.cmds.validate.paasta_validate_services", autospec=True)
+@patch("paasta_tools.cli.cmds.validate.get_services_for_changed_paths", autospec=True)
+@patch("paasta_tools.cli.cmds.validate.list_validatable_services", autospec=True)
+def test_paasta_validate_many_services(
+    mock_list_validatable_services,
+    mock_get_services_for_changed_paths,
+    mock_paasta_validate_services,
+):
+    mock_list_validatable_services.return_value = ["a", "b"]
+    mock_get_services_for_changed_paths.return_value = ["b"]
+    mock_paasta_validate_services.return_value = []
+
+    args = mock.MagicMock()
+    args.yelpsoa_config_root = "/soa"
+    args.all_services = True
+    args.changed_paths = None
+    args.max_workers = 4
+    args.verbose = False
+    assert paasta_validate(args) == 0
+    mock_paasta_validate_services.assert_called_once_with(
+        services=["a", "b"], soa_dir="/soa", verbose=False, max_workers=4
+    )
+
+    args.all_services = False
+    args.changed_paths = ["b/service.yaml"]
+    mock_paasta_validate_services.return_value = ["b"]
+    assert paasta_validate(args) == 1
+    mock_get_services_for_changed_paths.assert_called_once_with(
+        "/soa", ["b/service.yaml"]
+    )
+
+    mock_get_services_for_changed_paths.return_value = []
+    mock_paasta_validate_services.reset_mock()
+    assert paasta_validate(args) == 0
+    assert not mock_paasta_validate_services.called
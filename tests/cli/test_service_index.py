@@ -0,0 +1,177 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+from unittest import mock
+
+import pytest
+
+from paasta_tools.cli import service_index
+from paasta_tools.cli.service_index import ServiceIndex
+
+
+def _fake_instance_config(cluster, instance, team=None):
+    instance_config = mock.Mock()
+    instance_config.get_cluster.return_value = cluster
+    instance_config.get_instance.return_value = instance
+    instance_config.get_instance_type.return_value = "kubernetes"
+    instance_config.get_team.return_value = team
+    instance_config.get_deploy_group.return_value = f"{cluster}.{instance}"
+    return instance_config
+
+
+@pytest.fixture
+def soa_dir(tmp_path):
+    soa_dir = tmp_path / "soa"
+    for service in ("service_a", "service_b", "service_c"):
+        (soa_dir / service).mkdir(parents=True)
+        (soa_dir / service / "kubernetes-cluster1.yaml").write_text("main: {}\n")
+    return str(soa_dir)
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "cache" / "service_index.json")
+
+
+@pytest.fixture
+def mock_configs():
+    configs = {
+        "service_a": [_fake_instance_config("cluster1", "main")],
+        "service_b": [
+            _fake_instance_config("cluster1", "main"),
+            _fake_instance_config("cluster2", "batch", team="team_a"),
+        ],
+        "service_c": [_fake_instance_config("cluster1", "main")],
+    }
+    teams = {"service_a": "team_a", "service_b": "team_b", "service_c": "team_c"}
+    with mock.patch.object(
+        service_index,
+        "get_instance_configs_for_service",
+        autospec=True,
+        side_effect=lambda service, soa_dir: configs[service],
+    ) as mock_get_instance_configs_for_service, mock.patch.object(
+        service_index,
+        "get_team",
+        autospec=True,
+        side_effect=lambda overrides, service, soa_dir: teams[service],
+    ):
+        yield mock_get_instance_configs_for_service
+
+
+def test_get_default_index_path(monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", "/fake/cache")
+    path = service_index.get_default_index_path("/nail/etc/services")
+    assert path.startswith("/fake/cache/paasta/service_index-")
+    assert path != service_index.get_default_index_path("/other/soa/dir")
+
+
+def test_get_service_dir_signature(soa_dir):
+    signature = service_index.get_service_dir_signature("service_a", soa_dir)
+    assert signature == service_index.get_service_dir_signature("service_a", soa_dir)
+
+    config_path = os.path.join(soa_dir, "service_a", "kubernetes-cluster1.yaml")
+    os.utime(config_path, ns=(0, 0))
+    assert signature != service_index.get_service_dir_signature("service_a", soa_dir)
+
+
+def test_service_index_get(soa_dir, index_path, mock_configs):
+    index = ServiceIndex(soa_dir=soa_dir, index_path=index_path)
+    entry = index.get("service_b")
+
+    assert entry["team"] == "team_b"
+    assert entry["instances"] == [
+        {
+            "cluster": "cluster1",
+            "instance": "main",
+            "instance_type": "kubernetes",
+            "team": None,
+            "deploy_group": "cluster1.main",
+        },
+        {
+            "cluster": "cluster2",
+            "instance": "batch",
+            "instance_type": "kubernetes",
+            "team": "team_a",
+            "deploy_group": "cluster2.batch",
+        },
+    ]
+    assert index.dirty
+
+
+def test_get_services_owned_by(soa_dir, index_path, mock_configs):
+    index = ServiceIndex(soa_dir=soa_dir, index_path=index_path)
+    services = ["service_a", "service_b", "service_c"]
+
+    # service_b's batch instance is owned by team_a, rather than by service_b's team
+    assert index.get_services_owned_by(["team_a"], services) == [
+        "service_a",
+        "service_b",
+    ]
+    assert index.get_services_owned_by(["team_a"], services, clusters=["cluster1"]) == [
+        "service_a"
+    ]
+    assert index.get_services_owned_by(["team_b", "team_c"], services) == [
+        "service_b",
+        "service_c",
+    ]
+    assert index.get_services_owned_by(["nobody"], services) == []
+
+
+def test_service_index_is_reused_across_invocations(soa_dir, index_path, mock_configs):
+    services = ["service_a", "service_b", "service_c"]
+    index = ServiceIndex(soa_dir=soa_dir, index_path=index_path)
+    index.get_services_owned_by(["team_a"], services)
+    index.save()
+    assert mock_configs.call_count == 3
+    assert not index.dirty
+
+    # nothing has changed, so nothing needs loading (or saving)
+    index = ServiceIndex(soa_dir=soa_dir, index_path=index_path)
+    assert index.get_services_owned_by(["team_a"], services) == [
+        "service_a",
+        "service_b",
+    ]
+    assert mock_configs.call_count == 3
+    assert not index.dirty
+
+    # only the service whose configs changed gets reloaded
+    with open(os.path.join(soa_dir, "service_c", "kubernetes-cluster2.yaml"), "w"):
+        pass
+    index = ServiceIndex(soa_dir=soa_dir, index_path=index_path)
+    index.get_services_owned_by(["team_a"], services)
+    assert mock_configs.call_args_list[-1] == mock.call("service_c", soa_dir=soa_dir)
+    assert mock_configs.call_count == 4
+    assert index.dirty
+
+
+@pytest.mark.parametrize(
+    "contents", ["not json", '{"version": 0, "services": {"service_a": {}}}']
+)
+def test_service_index_ignores_bad_index(soa_dir, index_path, contents):
+    os.makedirs(os.path.dirname(index_path))
+    with open(index_path, "w") as f:
+        f.write(contents)
+    assert ServiceIndex(soa_dir=soa_dir, index_path=index_path).entries == {}
+
+
+def test_service_index_save_failure(soa_dir, index_path, mock_configs):
+    index = ServiceIndex(soa_dir=soa_dir, index_path=index_path)
+    index.get("service_a")
+    with mock.patch.object(
+        service_index.os, "makedirs", autospec=True, side_effect=PermissionError
+    ):
+        # shouldn't raise, there's just no index next time
+        index.save()
+    assert index.dirty
+    assert not os.path.exists(index_path)
@@ -6,6 +6,7 @@ from unittest import mock
 
 import pytest
 
+from paasta_tools import utils
 from paasta_tools.flink_tools import FlinkDeploymentConfig
 from paasta_tools.flink_tools import FlinkDeploymentConfigDict
 from paasta_tools.kubernetes_tools import KubeClient
@@ -24,6 +25,14 @@ time.true_slow_sleep = time.sleep
 time.sleep = time_to_feel_bad
 
 
+@pytest.fixture(autouse=True)
+def forget_system_paasta_configs():
+    # load_system_paasta_config reuses what it loaded for a little while, which
+    # tests that fake out the config directory mustn't see from other tests
+    with mock.patch.dict(utils._system_paasta_configs, clear=True):
+        yield
+
+
 @pytest.fixture
 def system_paasta_config():
     return SystemPaastaConfig(
@@ -27,6 +27,15 @@ from tests.conftest import Struct
 from tests.conftest import wrap_value_in_task
 
 
+@pytest.fixture(autouse=True)
+def clear_mesh_snapshot_cache():
+    pik.mesh_snapshot_cache.clear()
+    pik.backend_hostname_cache.clear()
+    yield
+    pik.mesh_snapshot_cache.clear()
+    pik.backend_hostname_cache.clear()
+
+
 @pytest.fixture
 def mock_pod():
     return Struct(
@@ -63,6 +72,7 @@ def mock_pod():
                 Struct(
                     name="main_container",
                     restart_count=0,
+                    ready=True,
                     state=Struct(
                         running=dict(
                             reason="a_state_reason",
@@ -1075,6 +1085,119 @@ async def test_get_pod_containers(mock_pod):
     assert no_start_containers[0]["timestamp"] is None
 
 
+@pytest.mark.asyncio
+async def test_get_pod_containers_skips_logs_of_healthy_containers(mock_pod):
+    with mock.patch(
+        "paasta_tools.instance.kubernetes.get_tail_lines_for_kubernetes_container",
+        new_callable=AsyncMock,
+        autospec=None,
+        return_value={"stdout": ["current"], "stderr": [], "error_message": ""},
+    ) as mock_get_tail_lines, mock.patch(
+        "paasta_tools.kubernetes_tools.recent_container_restart",
+        return_value=False,
+        autospec=None,
+    ):
+        containers = await pik.get_pod_containers(mock_pod, mock.Mock(), 10)
+        assert containers[0]["tail_lines"] is None
+        assert containers[0]["previous_tail_lines"] is None
+        assert mock_get_tail_lines.call_count == 0
+
+        mock_pod.status.container_statuses[0].ready = False
+        containers = await pik.get_pod_containers(mock_pod, mock.Mock(), 10)
+        assert containers[0]["tail_lines"]["stdout"] == ["current"]
+        assert containers[0]["previous_tail_lines"] is None
+        assert mock_get_tail_lines.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_pod_containers_respects_tail_lines_budget(mock_pod):
+    mock_pod.status.container_statuses[0].ready = False
+    budget = pik.TailLinesBudget(max_fetches=3, max_concurrency=2)
+    in_flight = []
+    max_in_flight = []
+
+    async def fake_get_tail_lines(*args, **kwargs):
+        in_flight.append(1)
+        max_in_flight.append(len(in_flight))
+        await asyncio.sleep(0)
+        in_flight.pop()
+        return {"stdout": ["current"], "stderr": [], "error_message": ""}
+
+    with mock.patch(
+        "paasta_tools.instance.kubernetes.get_tail_lines_for_kubernetes_container",
+        autospec=True,
+        side_effect=fake_get_tail_lines,
+    ) as mock_get_tail_lines, mock.patch(
+        "paasta_tools.kubernetes_tools.recent_container_restart",
+        return_value=False,
+        autospec=None,
+    ):
+        results = await asyncio.gather(
+            *[
+                pik.get_pod_containers(mock_pod, mock.Mock(), 10, budget)
+                for _ in range(5)
+            ]
+        )
+
+    assert mock_get_tail_lines.call_count == 3
+    assert max(max_in_flight) <= 2
+    tail_lines = [containers[0]["tail_lines"] for containers in results]
+    assert [t["stdout"] for t in tail_lines].count(["current"]) == 3
+    assert [t["error_message"].startswith("Skipped") for t in tail_lines].count(
+        True
+    ) == 2
+
+
+def test_get_container_tail_lines(mock_pod):
+    mock_settings = mock.Mock()
+    with mock.patch(
+        "paasta_tools.instance.kubernetes.kubernetes_tools.pods_for_service_instance",
+        new_callable=AsyncMock,
+        autospec=None,
+        return_value=[mock_pod],
+    ) as mock_pods_for_service_instance, mock.patch(
+        "paasta_tools.instance.kubernetes.get_tail_lines_for_kubernetes_container",
+        new_callable=AsyncMock,
+        autospec=None,
+        return_value={"stdout": ["line"], "stderr": [], "error_message": ""},
+    ) as mock_get_tail_lines:
+        kwargs = dict(
+            service="service",
+            instance="instance",
+            instance_type="kubernetes",
+            settings=mock_settings,
+            num_tail_lines=100,
+            previous=True,
+            namespace="paasta",
+        )
+        assert pik.get_container_tail_lines(
+            replica_name="pod_1", container_name="main_container", **kwargs
+        ) == {"stdout": ["line"], "stderr": [], "error_message": ""}
+        assert (
+            pik.get_container_tail_lines(
+                replica_name="pod_1", container_name="nope", **kwargs
+            )
+            is None
+        )
+        assert (
+            pik.get_container_tail_lines(
+                replica_name="pod_2", container_name="main_container", **kwargs
+            )
+            is None
+        )
+
+    mock_pods_for_service_instance.assert_called_with(
+        "service", "instance", mock_settings.kubernetes_client, namespace="paasta"
+    )
+    mock_get_tail_lines.assert_called_once_with(
+        mock_settings.kubernetes_client,
+        mock_pod,
+        mock_pod.status.container_statuses[0],
+        100,
+        previous=True,
+    )
+
+
 @pytest.mark.asyncio
 async def test_mesh_status_retry_on_timeout_then_success():
     """Test that mesh_status retries on ConnectTimeout and succeeds on second attempt."""
@@ -1576,3 +1699,99 @@ def test_restart_replica_by_name_force_parameter(
         kube_client=mock_settings.kubernetes_client,
         grace_period_seconds=expected_grace_period,
     )
+
+
+def test_get_envoy_backends_reuses_host_snapshot():
+    backend = {
+        "address": "10.0.0.1",
+        "port_value": 8888,
+        "hostname": "10.0.0.1",
+        "eds_health_status": "HEALTHY",
+        "weight": 1,
+    }
+    with mock.patch(
+        "paasta_tools.instance.kubernetes.envoy_tools.get_multiple_backends",
+        autospec=True,
+        return_value={"service.main": [(backend, False)], "service.canary": []},
+    ) as mock_get_multiple_backends, mock.patch(
+        "paasta_tools.instance.kubernetes.envoy_tools.resolve_backend_hostname",
+        autospec=True,
+        return_value="host1",
+    ) as mock_resolve_backend_hostname:
+        for _ in range(2):
+            assert pik.get_envoy_backends(
+                "service.main", "host1", 9901, "http://{host}:{port}/{endpoint}"
+            ) == {"service.main": [({**backend, "hostname": "host1"}, False)]}
+        assert pik.get_envoy_backends(
+            "service.canary", "host1", 9901, "http://{host}:{port}/{endpoint}"
+        ) == {"service.canary": []}
+        assert (
+            pik.get_envoy_backends(
+                "service.other", "host1", 9901, "http://{host}:{port}/{endpoint}"
+            )
+            == {}
+        )
+
+    mock_get_multiple_backends.assert_called_once_with(
+        None,
+        envoy_host="host1",
+        envoy_admin_port=9901,
+        envoy_admin_endpoint_format="http://{host}:{port}/{endpoint}",
+        resolve_hostnames=False,
+    )
+    mock_resolve_backend_hostname.assert_called_once_with("10.0.0.1")
+    # hostnames don't take up room meant for snapshots
+    assert pik.backend_hostname_cache.is_cached("10.0.0.1")
+    assert len(pik.mesh_snapshot_cache.entries) == 1
+
+
+def test_get_smartstack_backends_reuses_host_snapshot():
+    backends = [
+        {"pxname": "service.main", "svname": "a"},
+        {"pxname": "service.canary", "svname": "b"},
+        {"pxname": "service.main", "svname": "c"},
+    ]
+    with mock.patch(
+        "paasta_tools.instance.kubernetes.smartstack_tools.get_multiple_backends",
+        autospec=True,
+        return_value=backends,
+    ) as mock_get_multiple_backends:
+        assert pik.get_smartstack_backends(
+            "service.main", "host1", 3212, "http://{host}:{port}/"
+        ) == [backends[0], backends[2]]
+        assert pik.get_smartstack_backends(
+            "service.canary", "host1", 3212, "http://{host}:{port}/"
+        ) == [backends[1]]
+        assert (
+            pik.get_smartstack_backends(
+                "service.other", "host1", 3212, "http://{host}:{port}/"
+            )
+            == []
+        )
+    assert mock_get_multiple_backends.call_count == 1
+
+
+def test_pick_mesh_host_prefers_host_with_snapshot():
+    mock_checker = mock.Mock()
+    mock_checker.get_hostname_in_pool.return_value = "host1"
+    mock_checker.get_hostnames_in_pool.return_value = ["host1", "host2", "host3"]
+    mock_settings = mock.Mock()
+    mock_settings.system_paasta_config.get_envoy_admin_port.return_value = 9901
+    mock_settings.system_paasta_config.get_envoy_admin_endpoint_format.return_value = (
+        "fmt"
+    )
+
+    def pick(exclude):
+        return pik.pick_mesh_host(
+            mock_checker,
+            hosts=[],
+            pool="default",
+            service_mesh=pik.ServiceMesh.ENVOY,
+            settings=mock_settings,
+            exclude=exclude,
+        )
+
+    assert pick(exclude=set()) == "host1"
+    pik.mesh_snapshot_cache.get(("envoy", "host2", 9901, "fmt"), lambda: {})
+    assert pick(exclude=set()) == "host2"
+    assert pick(exclude={"host2"}) == "host1"
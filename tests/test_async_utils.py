@@ -202,6 +202,89 @@ async def test_async_ttl_cache_for_class_members_doesnt_leak_mem():
     del o3
 
 
+@pytest.mark.asyncio
+async def test_async_ttl_cache_evicts_least_recently_used():
+    calls = []
+
+    @async_ttl_cache(ttl=None, maxsize=2)
+    async def func(x):
+        calls.append(x)
+        return x
+
+    await func(1)
+    await func(2)
+    # touch 1, so that 2 is the least recently used
+    await func(1)
+    await func(3)
+    await func(1)
+    await func(2)
+
+    assert calls == [1, 2, 3, 2]
+    stats = func.cache_stats()
+    assert stats.hits == 2
+    assert stats.misses == 4
+    assert stats.evictions == 2
+
+
+@pytest.mark.asyncio
+async def test_async_ttl_cache_stale_while_revalidate():
+    cache = {}
+    values = iter([1, 2])
+    refresh_started = asyncio.Event()
+    finish_refresh = asyncio.Event()
+
+    @async_ttl_cache(ttl=10, cache=cache, stale_while_revalidate=True)
+    async def func():
+        value = next(values)
+        if value == 2:
+            refresh_started.set()
+            await finish_refresh.wait()
+        return value
+
+    with mock.patch("time.time", autospec=True, return_value=100):
+        assert await func() == 1
+    with mock.patch("time.time", autospec=True, return_value=200):
+        # expired: both callers get the stale value, and only one refresh runs
+        assert await func() == 1
+        assert await func() == 1
+        await refresh_started.wait()
+        finish_refresh.set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert await func() == 2
+
+    stats = func.cache_stats()
+    assert stats.stale_hits == 2
+    assert stats.refreshes == 1
+    assert stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_async_ttl_cache_stale_while_revalidate_keeps_value_on_failure():
+    cache = {}
+    side_effect = [1, Exception("boom"), 3]
+
+    @async_ttl_cache(ttl=10, cache=cache, stale_while_revalidate=True)
+    async def func():
+        value = side_effect.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    with mock.patch("time.time", autospec=True, return_value=100):
+        assert await func() == 1
+    with mock.patch("time.time", autospec=True, return_value=200):
+        assert await func() == 1
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert func.cache_stats().refresh_failures == 1
+        # the stale value is still served, and a new refresh is started
+        assert await func() == 1
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert await func() == 3
+
+
 def test_run_sync_executes_async_function():
     async def add(x, y):
         return x + y
@@ -11,17 +11,26 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import threading
 from unittest import mock
 
 import pytest
 from kubernetes.client.rest import ApiException as KubeApiException
 
 import paasta_tools.flink_tools as flink_tools
+from paasta_tools.async_utils import run_sync
 from paasta_tools.flink_tools import FlinkDeploymentConfig
 from paasta_tools.flink_tools import FlinkDeploymentConfigDict
 from paasta_tools.utils import PaastaColors
 
 
+@pytest.fixture(autouse=True)
+def clear_flink_endpoint_cache():
+    flink_tools.flink_endpoint_cache.clear()
+    yield
+    flink_tools.flink_endpoint_cache.clear()
+
+
 def test_get_flink_ingress_url_root():
     assert (
         flink_tools.get_flink_ingress_url_root("mycluster")
@@ -30,11 +39,11 @@ def test_get_flink_ingress_url_root():
 
 
 @mock.patch("requests.Response", autospec=True)
-@mock.patch("paasta_tools.flink_tools.requests.get", autospec=True)
+@mock.patch("paasta_tools.flink_tools.get_flink_session", autospec=True)
 @mock.patch("paasta_tools.flink_tools.get_cr", autospec=True)
 def test_curl_flink_endpoint_error(
     mock_get_cr,
-    mock_requests_get,
+    mock_get_flink_session,
     mock_response,
 ):
     mock_get_cr.return_value = {
@@ -45,7 +54,7 @@ def test_curl_flink_endpoint_error(
             },
         }
     }
-    mock_requests_get.return_value = mock_response
+    mock_get_flink_session.return_value.get.return_value = mock_response
     mock_response.ok = False
     mock_response.status_code = 401
     mock_response.reason = "Unauthorized"
@@ -63,13 +72,17 @@ def test_curl_flink_endpoint_error(
         "text": "401 Authorization Required",
     }
 
+    # errors aren't cached, so the next request asks the jobmanager again
+    flink_tools.curl_flink_endpoint(flink_tools.cr_id(service, instance), "overview")
+    assert mock_get_flink_session.return_value.get.call_count == 2
+
 
 @mock.patch("requests.Response", autospec=True)
-@mock.patch("paasta_tools.flink_tools.requests.get", autospec=True)
+@mock.patch("paasta_tools.flink_tools.get_flink_session", autospec=True)
 @mock.patch("paasta_tools.flink_tools.get_cr", autospec=True)
 def test_curl_flink_endpoint_overview(
     mock_get_cr,
-    mock_requests_get,
+    mock_get_flink_session,
     mock_response,
 ):
     mock_get_cr.return_value = {
@@ -80,7 +93,7 @@ def test_curl_flink_endpoint_overview(
             },
         }
     }
-    mock_requests_get.return_value = mock_response
+    mock_get_flink_session.return_value.get.return_value = mock_response
     mock_response.json.return_value = {
         "taskmanagers": 5,
         "slots-total": 25,
@@ -109,11 +122,11 @@ def test_curl_flink_endpoint_overview(
 
 
 @mock.patch("requests.Response", autospec=True)
-@mock.patch("paasta_tools.flink_tools.requests.get", autospec=True)
+@mock.patch("paasta_tools.flink_tools.get_flink_session", autospec=True)
 @mock.patch("paasta_tools.flink_tools.get_cr", autospec=True)
 def test_curl_flink_endpoint_config(
     mock_get_cr,
-    mock_requests_get,
+    mock_get_flink_session,
     mock_response,
 ):
     mock_get_cr.return_value = {
@@ -124,7 +137,7 @@ def test_curl_flink_endpoint_config(
             },
         }
     }
-    mock_requests_get.return_value = mock_response
+    mock_get_flink_session.return_value.get.return_value = mock_response
     mock_response.json.return_value = {
         "refresh-interval": 3000,
         "timezone-name": "Coordinated Universal Time",
@@ -147,11 +160,11 @@ def test_curl_flink_endpoint_config(
 
 
 @mock.patch("requests.Response", autospec=True)
-@mock.patch("paasta_tools.flink_tools.requests.get", autospec=True)
+@mock.patch("paasta_tools.flink_tools.get_flink_session", autospec=True)
 @mock.patch("paasta_tools.flink_tools.get_cr", autospec=True)
 def test_curl_flink_endpoint_list_jobs(
     mock_get_cr,
-    mock_requests_get,
+    mock_get_flink_session,
     mock_response,
 ):
     mock_get_cr.return_value = {
@@ -162,7 +175,7 @@ def test_curl_flink_endpoint_list_jobs(
             },
         }
     }
-    mock_requests_get.return_value = mock_response
+    mock_get_flink_session.return_value.get.return_value = mock_response
     mock_response.json.return_value = {
         "jobs": [{"id": "4210f0646f5c9ce1db0b3e5ae4372b82", "status": "RUNNING"}]
     }
@@ -177,11 +190,11 @@ def test_curl_flink_endpoint_list_jobs(
 
 
 @mock.patch("requests.Response", autospec=True)
-@mock.patch("paasta_tools.flink_tools.requests.get", autospec=True)
+@mock.patch("paasta_tools.flink_tools.get_flink_session", autospec=True)
 @mock.patch("paasta_tools.flink_tools.get_cr", autospec=True)
 def test_curl_flink_endpoint_get_job_details(
     mock_get_cr,
-    mock_requests_get,
+    mock_get_flink_session,
     mock_response,
 ):
     mock_get_cr.return_value = {
@@ -192,7 +205,7 @@ def test_curl_flink_endpoint_get_job_details(
             },
         }
     }
-    mock_requests_get.return_value = mock_response
+    mock_get_flink_session.return_value.get.return_value = mock_response
     mock_response.json.return_value = {
         "jid": "4210f0646f5c9ce1db0b3e5ae4372b82",
         "name": "beam_happyhour.main.test_job",
@@ -246,11 +259,11 @@ def test_curl_flink_endpoint_get_job_details(
 
 
 @mock.patch("requests.Response", autospec=True)
-@mock.patch("paasta_tools.flink_tools.requests.get", autospec=True)
+@mock.patch("paasta_tools.flink_tools.get_flink_session", autospec=True)
 @mock.patch("paasta_tools.flink_tools.get_cr", autospec=True)
 def test_curl_flink_endpoint_get_job_checkpoints(
     mock_get_cr,
-    mock_requests_get,
+    mock_get_flink_session,
     mock_response,
 ):
     mock_get_cr.return_value = {
@@ -261,7 +274,7 @@ def test_curl_flink_endpoint_get_job_checkpoints(
             },
         }
     }
-    mock_requests_get.return_value = mock_response
+    mock_get_flink_session.return_value.get.return_value = mock_response
     mock_response.json.return_value = {
         "counts": {
             "completed": 100,
@@ -292,6 +305,71 @@ def test_curl_flink_endpoint_get_job_checkpoints(
     }
 
 
+@mock.patch("paasta_tools.flink_tools.get_flink_session", autospec=True)
+@mock.patch("paasta_tools.flink_tools.get_cr", autospec=True)
+def test_curl_flink_endpoint_is_cached(mock_get_cr, mock_get_flink_session):
+    mock_get_cr.return_value = {
+        "metadata": {
+            "labels": {"paasta.yelp.com/cluster": "mocked"},
+            "annotations": {
+                "flink.yelp.com/dashboard_url": "http://flink.k8s.test_cluster.paasta:31080/kurupt-7f5cfd8ffc"
+            },
+        }
+    }
+    mock_get = mock_get_flink_session.return_value.get
+    mock_get.return_value.json.return_value = {"jobs": []}
+
+    for _ in range(3):
+        assert flink_tools.curl_flink_endpoint(
+            flink_tools.cr_id("kurupt", "main"), "jobs"
+        ) == {"jobs": []}
+    assert mock_get.call_count == 1
+    assert mock_get_cr.call_count == 1
+
+    flink_tools.curl_flink_endpoint(flink_tools.cr_id("kurupt", "canary"), "jobs")
+    flink_tools.curl_flink_endpoint(flink_tools.cr_id("kurupt", "main"), "overview")
+    assert mock_get.call_count == 3
+
+
+def test_get_flink_session():
+    session = flink_tools.get_flink_session("http://flink.eks.a.paasta:31080/x/jobs")
+    assert (
+        flink_tools.get_flink_session("http://flink.eks.a.paasta:31080/y/overview")
+        is session
+    )
+    assert (
+        flink_tools.get_flink_session("http://flink.eks.b.paasta:31080/x/jobs")
+        is not session
+    )
+
+
+def test_fetch_flink_job_details_concurrently():
+    max_concurrency = 3
+    # every call waits for two others to be in flight too, so this only
+    # completes if the jobs are actually fetched concurrently
+    barrier = threading.Barrier(max_concurrency, timeout=5)
+    mock_client = mock.Mock()
+
+    def get_job_details(service, instance, job_id):
+        barrier.wait()
+        return job_id
+
+    mock_client.service.get_flink_cluster_job_details.side_effect = get_job_details
+    job_ids = [f"job{i}" for i in range(6)]
+
+    assert (
+        run_sync(
+            flink_tools.fetch_flink_job_details,
+            "kurupt",
+            "main",
+            job_ids,
+            mock_client,
+            max_concurrency=max_concurrency,
+        )
+        == job_ids
+    )
+
+
 @mock.patch("paasta_tools.flink_tools.get_cr", autospec=True)
 def test_curl_flink_endpoint_kube_api_exception(mock_get_cr):
     mock_get_cr.side_effect = KubeApiException(status=503, reason="Service Unavailable")
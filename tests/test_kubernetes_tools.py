@@ -1,4 +1,6 @@
+import asyncio
 import functools
+import threading
 from base64 import b64encode
 from copy import deepcopy
 from typing import Any
@@ -9,6 +11,7 @@ from unittest import mock
 from unittest.mock import AsyncMock
 
 import pytest
+import requests
 from hypothesis import given
 from hypothesis.strategies import floats
 from hypothesis.strategies import integers
@@ -98,6 +101,7 @@ from paasta_tools.kubernetes_tools import KubernetesDeployStatus
 from paasta_tools.kubernetes_tools import KubernetesServiceRegistration
 from paasta_tools.kubernetes_tools import add_volumes_for_authenticating_services
 from paasta_tools.kubernetes_tools import allowlist_denylist_to_requirements
+from paasta_tools.kubernetes_tools import async_fan_out_over_namespaces
 from paasta_tools.kubernetes_tools import create_custom_resource
 from paasta_tools.kubernetes_tools import create_deployment
 from paasta_tools.kubernetes_tools import create_pod_disruption_budget
@@ -108,15 +112,18 @@ from paasta_tools.kubernetes_tools import ensure_namespace
 from paasta_tools.kubernetes_tools import ensure_paasta_api_rolebinding
 from paasta_tools.kubernetes_tools import ensure_paasta_namespace_limits
 from paasta_tools.kubernetes_tools import ensure_service_account
+from paasta_tools.kubernetes_tools import fan_out_over_namespaces
 from paasta_tools.kubernetes_tools import filter_nodes_by_blacklist
 from paasta_tools.kubernetes_tools import filter_pods_by_service_instance
 from paasta_tools.kubernetes_tools import force_delete_pods
 from paasta_tools.kubernetes_tools import get_active_versions_for_service
+from paasta_tools.kubernetes_tools import get_all_kubernetes_services_running_here
 from paasta_tools.kubernetes_tools import get_all_managed_namespaces
 from paasta_tools.kubernetes_tools import get_all_namespaces
 from paasta_tools.kubernetes_tools import get_all_nodes
 from paasta_tools.kubernetes_tools import get_all_pods
 from paasta_tools.kubernetes_tools import get_annotations_for_kubernetes_service
+from paasta_tools.kubernetes_tools import get_kubelet_pods
 from paasta_tools.kubernetes_tools import get_kubernetes_app_by_name
 from paasta_tools.kubernetes_tools import get_kubernetes_app_deploy_status
 from paasta_tools.kubernetes_tools import get_kubernetes_secret_env_variables
@@ -134,9 +141,12 @@ from paasta_tools.kubernetes_tools import get_service_account_name
 from paasta_tools.kubernetes_tools import group_pods_by_service_instance
 from paasta_tools.kubernetes_tools import is_node_ready
 from paasta_tools.kubernetes_tools import is_pod_ready
+from paasta_tools.kubernetes_tools import kubelet_pods_cache
 from paasta_tools.kubernetes_tools import list_all_deployments
 from paasta_tools.kubernetes_tools import list_all_paasta_deployments
 from paasta_tools.kubernetes_tools import list_custom_resources
+from paasta_tools.kubernetes_tools import list_deployments_in_managed_namespaces
+from paasta_tools.kubernetes_tools import list_in_namespaces
 from paasta_tools.kubernetes_tools import load_kubernetes_service_config
 from paasta_tools.kubernetes_tools import load_kubernetes_service_config_no_cache
 from paasta_tools.kubernetes_tools import max_unavailable
@@ -3634,6 +3644,7 @@ class TestKubernetesDeploymentConfig:
 
 
 def test_get_kubernetes_services_running_here():
+    kubelet_pods_cache.clear()
     with mock.patch(
         "paasta_tools.kubernetes_tools.requests.get", autospec=True
     ) as mock_requests_get:
@@ -3720,6 +3731,7 @@ def test_get_kubernetes_services_running_here():
             ]
         }
         mock_requests_get.return_value.json.return_value = mock_pod_results
+        kubelet_pods_cache.clear()
 
         assert get_kubernetes_services_running_here() == [
             KubernetesServiceRegistration(
@@ -3735,15 +3747,95 @@ def test_get_kubernetes_services_running_here():
         # mock a terminating pod
         mock_pod_results["items"][0]["metadata"]["deletionTimestamp"] = "now"
         mock_requests_get.return_value.json.return_value = mock_pod_results
+        kubelet_pods_cache.clear()
         assert get_kubernetes_services_running_here(exclude_terminating=True) == []
 
         # if the kubelet is down we don't want to reconfigure nerve until it comes back
         # and we can be sure what is running or not
         mock_requests_get.side_effect = ConnectionError
+        kubelet_pods_cache.clear()
         with pytest.raises(ConnectionError):
             get_kubernetes_services_running_here()
 
 
+def test_get_kubelet_pods_fetches_once():
+    pod = {
+        "metadata": {
+            "name": "kurupt-fm-abc",
+            "namespace": "paasta",
+            "labels": {
+                "paasta.yelp.com/service": "kurupt",
+                "paasta.yelp.com/instance": "fm",
+            },
+            "annotations": {
+                "smartstack_registrations": '["kurupt.fm"]',
+                "kubectl.kubernetes.io/last-applied-configuration": "{...}",
+            },
+            "managedFields": [{"manager": "kubelet"}],
+        },
+        "status": {
+            "phase": "Running",
+            "podIP": "10.1.1.3",
+            "containerStatuses": [{"name": "kurupt-fm"}],
+        },
+        "spec": {
+            "containers": [
+                {
+                    "name": "kurupt-fm",
+                    "image": "kurupt:fm",
+                    "env": [{"name": "FOO", "value": "bar"}],
+                    "ports": [{"containerPort": 8888}],
+                }
+            ],
+            "volumes": [{"name": "some-volume"}],
+        },
+    }
+    kubelet_pods_cache.clear()
+    with mock.patch(
+        "paasta_tools.kubernetes_tools.requests.get", autospec=True
+    ) as mock_requests_get:
+        mock_requests_get.return_value.json.return_value = {"items": [pod]}
+        assert get_all_kubernetes_services_running_here() == [("kurupt", "fm", 0)]
+        assert len(get_kubernetes_services_running_here()) == 1
+        pods = get_kubelet_pods()
+
+    assert mock_requests_get.call_count == 1
+    assert pods == {
+        "items": [
+            {
+                "metadata": {
+                    "name": "kurupt-fm-abc",
+                    "namespace": "paasta",
+                    "labels": pod["metadata"]["labels"],
+                    "annotations": {"smartstack_registrations": '["kurupt.fm"]'},
+                },
+                "status": {"phase": "Running", "podIP": "10.1.1.3"},
+                "spec": {
+                    "containers": [
+                        {"name": "kurupt-fm", "ports": [{"containerPort": 8888}]}
+                    ]
+                },
+            }
+        ]
+    }
+    kubelet_pods_cache.clear()
+
+
+def test_get_kubelet_pods_doesnt_cache_failures():
+    kubelet_pods_cache.clear()
+    with mock.patch(
+        "paasta_tools.kubernetes_tools.requests.get", autospec=True
+    ) as mock_requests_get:
+        mock_requests_get.side_effect = [
+            requests.exceptions.ConnectionError,
+            mock.Mock(json=mock.Mock(return_value={"items": []})),
+        ]
+        assert get_all_kubernetes_services_running_here() == []
+        assert get_kubelet_pods() == {"items": []}
+    assert mock_requests_get.call_count == 2
+    kubelet_pods_cache.clear()
+
+
 class MockNerveDict(dict):
     def is_in_smartstack(self):
         return False if self["name"] == "garage" else True
@@ -4766,6 +4858,196 @@ def test_get_all_managed_namespaces_with_request_timeout():
     )
 
 
+def test_fan_out_over_namespaces_runs_concurrently():
+    namespaces = [f"ns{i}" for i in range(4)]
+    # every call has to be running at once for any of them to get through
+    barrier = threading.Barrier(len(namespaces), timeout=5)
+
+    def fetch(namespace):
+        barrier.wait()
+        return namespace.upper()
+
+    assert fan_out_over_namespaces(fetch, namespaces, max_concurrency=4) == {
+        namespace: namespace.upper() for namespace in namespaces
+    }
+
+
+def test_fan_out_over_namespaces_errors():
+    def fetch(namespace):
+        if namespace == "bad":
+            raise ApiException(status=500, reason="oops")
+        return namespace
+
+    with pytest.raises(ApiException):
+        fan_out_over_namespaces(fetch, ["good", "bad"])
+    assert fan_out_over_namespaces(
+        fetch, ["good", "bad"], skip_failed_namespaces=True
+    ) == {"good": "good"}
+
+
+def test_fan_out_over_namespaces_times_out():
+    release = threading.Event()
+
+    def fetch(namespace):
+        if namespace == "slow":
+            release.wait(timeout=5)
+        return namespace
+
+    try:
+        with pytest.raises(TimeoutError):
+            fan_out_over_namespaces(fetch, ["fast", "slow"], timeout_s=0.1)
+        assert fan_out_over_namespaces(
+            fetch, ["fast", "slow"], timeout_s=0.1, skip_failed_namespaces=True
+        ) == {"fast": "fast"}
+    finally:
+        release.set()
+
+
+@pytest.mark.asyncio
+async def test_async_fan_out_over_namespaces():
+    running = 0
+    max_running = 0
+
+    async def fetch(namespace):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0)
+        running -= 1
+        return [namespace]
+
+    assert await async_fan_out_over_namespaces(
+        fetch, ["a", "b", "c"], max_concurrency=2
+    ) == {"a": ["a"], "b": ["b"], "c": ["c"]}
+    assert max_running == 2
+
+
+def _fake_item(namespace):
+    return mock.Mock(metadata=mock.Mock(namespace=namespace))
+
+
+def test_list_in_namespaces_uses_cluster_wide_list():
+    in_a, in_b, elsewhere = _fake_item("a"), _fake_item("b"), _fake_item("other")
+    mock_namespaced_list = mock.Mock()
+    mock_cluster_wide_list = mock.Mock(
+        __qualname__="FakeApi.list_thing_for_all_namespaces"
+    )
+    mock_cluster_wide_list.return_value.items = [in_a, in_b, elsewhere]
+
+    assert list_in_namespaces(
+        mock_namespaced_list, mock_cluster_wide_list, ["a", "b"], "foo=bar"
+    ) == [in_a, in_b]
+    mock_cluster_wide_list.assert_called_once_with(
+        label_selector="foo=bar", _request_timeout=30.0
+    )
+    assert mock_namespaced_list.call_count == 0
+
+
+def test_list_in_namespaces_falls_back_when_forbidden():
+    mock_namespaced_list = mock.Mock(
+        side_effect=lambda namespace, **kwargs: mock.Mock(items=[_fake_item(namespace)])
+    )
+    mock_cluster_wide_list = mock.Mock(
+        __qualname__="FakeApi.list_forbidden_thing_for_all_namespaces",
+        side_effect=ApiException(status=403),
+    )
+
+    with mock.patch(
+        "paasta_tools.kubernetes_tools._forbidden_cluster_wide_lists",
+        set(),
+        autospec=None,
+    ):
+        for _ in range(2):
+            items = list_in_namespaces(
+                mock_namespaced_list, mock_cluster_wide_list, ["a", "b"]
+            )
+            assert sorted(item.metadata.namespace for item in items) == ["a", "b"]
+
+    # we only needed to be told once
+    assert mock_cluster_wide_list.call_count == 1
+    assert mock_namespaced_list.call_count == 4
+
+
+def test_list_in_namespaces_falls_back_on_errors_when_skipping():
+    mock_namespaced_list = mock.Mock(
+        side_effect=lambda namespace, **kwargs: mock.Mock(items=[_fake_item(namespace)])
+    )
+    mock_cluster_wide_list = mock.Mock(
+        __qualname__="FakeApi.list_broken_thing_for_all_namespaces",
+        side_effect=ApiException(status=500),
+    )
+
+    with pytest.raises(ApiException):
+        list_in_namespaces(mock_namespaced_list, mock_cluster_wide_list, ["a", "b"])
+    assert mock_namespaced_list.call_count == 0
+
+    items = list_in_namespaces(
+        mock_namespaced_list,
+        mock_cluster_wide_list,
+        ["a", "b"],
+        skip_failed_namespaces=True,
+    )
+    assert sorted(item.metadata.namespace for item in items) == ["a", "b"]
+    # unlike a 403, this might not happen next time
+    assert mock_cluster_wide_list.call_count == 2
+
+
+def test_list_in_namespaces_single_namespace():
+    mock_namespaced_list = mock.Mock()
+    mock_namespaced_list.return_value.items = [_fake_item("a")]
+    mock_cluster_wide_list = mock.Mock()
+
+    assert (
+        len(list_in_namespaces(mock_namespaced_list, mock_cluster_wide_list, ["a"]))
+        == 1
+    )
+    assert mock_cluster_wide_list.call_count == 0
+
+
+def test_list_deployments_in_managed_namespaces():
+    def fake_item(namespace, instance):
+        item = mock.Mock(
+            metadata=mock.Mock(
+                namespace=namespace,
+                labels={
+                    "paasta.yelp.com/service": "svc",
+                    "paasta.yelp.com/instance": instance,
+                    "paasta.yelp.com/config_sha": "config123",
+                },
+            ),
+        )
+        # can't be passed to Mock(), which takes its own spec argument
+        item.spec.replicas = 1
+        return item
+
+    mock_client = mock.Mock()
+    mock_client.deployments.list_deployment_for_all_namespaces.return_value.items = [
+        fake_item("paastasvc-svc", "main"),
+        fake_item("unmanaged", "main"),
+    ]
+    mock_client.deployments.list_stateful_set_for_all_namespaces.return_value.items = [
+        fake_item("paasta", "canary"),
+    ]
+    with mock.patch(
+        "paasta_tools.kubernetes_tools.get_all_managed_namespaces",
+        autospec=True,
+        return_value=["paasta", "paastasvc-svc"],
+    ), mock.patch(
+        "paasta_tools.kubernetes_tools._forbidden_cluster_wide_lists",
+        set(),
+        autospec=None,
+    ):
+        deployments = list_deployments_in_managed_namespaces(
+            mock_client, label_selector="paasta.yelp.com/service=svc"
+        )
+
+    assert [(d.namespace, d.instance) for d in deployments] == [
+        ("paastasvc-svc", "main"),
+        ("paasta", "canary"),
+    ]
+    assert mock_client.deployments.list_namespaced_deployment.call_count == 0
+
+
 def test_filter_pods_for_service_instance():
     mock_pod_1 = mock.MagicMock(
         metadata=mock.MagicMock(
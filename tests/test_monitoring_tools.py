@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import threading
 from unittest import mock
 
 import pysensu_yelp
@@ -21,6 +22,13 @@ from paasta_tools import monitoring_tools
 from paasta_tools.utils import compose_job_id
 
 
+@pytest.fixture(autouse=True)
+def clear_monitoring_settings_cache():
+    monitoring_tools.get_service_monitoring_settings.cache_clear()
+    yield
+    monitoring_tools.get_service_monitoring_settings.cache_clear()
+
+
 class TestMonitoring_Tools:
 
     general_page = True
@@ -324,51 +332,25 @@ class TestMonitoring_Tools:
             "component": None,
             "description": None,
         }
+        fake_monitoring_settings = {
+            "team": fake_team,
+            "page": True,
+            "tip": fake_tip,
+            "notification_email": fake_notification_email,
+            "irc_channels": fake_irc,
+            "slack_channels": fake_slack,
+            "ticket": False,
+            "project": None,
+            "priority": None,
+            "tags": [],
+            "component": None,
+            "description": None,
+        }
         with mock.patch(
-            "paasta_tools.monitoring_tools.get_team",
-            return_value=fake_team,
-            autospec=True,
-        ) as get_team_patch, mock.patch(
-            "paasta_tools.monitoring_tools.get_tip",
-            return_value=fake_tip,
-            autospec=True,
-        ) as get_tip_patch, mock.patch(
-            "paasta_tools.monitoring_tools.get_notification_email",
-            return_value=fake_notification_email,
-            autospec=True,
-        ) as get_notification_email_patch, mock.patch(
-            "paasta_tools.monitoring_tools.get_irc_channels",
-            return_value=fake_irc,
-            autospec=True,
-        ) as get_irc_patch, mock.patch(
-            "paasta_tools.monitoring_tools.get_slack_channels",
-            return_value=fake_slack,
+            "paasta_tools.monitoring_tools.get_service_monitoring_settings",
+            return_value=fake_monitoring_settings,
             autospec=True,
-        ) as get_slack_patch, mock.patch(
-            "paasta_tools.monitoring_tools.get_ticket",
-            return_value=False,
-            autospec=True,
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_project",
-            return_value=None,
-            autospec=True,
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_page", return_value=True, autospec=True
-        ) as get_page_patch, mock.patch(
-            "paasta_tools.monitoring_tools.get_priority",
-            return_value=None,
-            autospec=True,
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_tags", return_value=[], autospec=True
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_component",
-            return_value=None,
-            autospec=True,
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_description",
-            return_value=None,
-            autospec=True,
-        ), mock.patch(
+        ) as get_service_monitoring_settings_patch, mock.patch(
             "pysensu_yelp.send_event", autospec=True
         ) as pysensu_yelp_send_event_patch, mock.patch(
             "paasta_tools.monitoring_tools.load_system_paasta_config", autospec=True
@@ -391,28 +373,42 @@ class TestMonitoring_Tools:
                 fake_output,
                 fake_soa_dir,
             )
+            monitoring_tools.flush_events()
 
-            get_team_patch.assert_called_once_with(
-                fake_monitoring_overrides, fake_service, fake_soa_dir
-            )
-            get_tip_patch.assert_called_once_with(
-                fake_monitoring_overrides, fake_service, fake_soa_dir
-            )
-            get_notification_email_patch.assert_called_once_with(
-                fake_monitoring_overrides, fake_service, fake_soa_dir
-            )
-            get_irc_patch.assert_called_once_with(
-                fake_monitoring_overrides, fake_service, fake_soa_dir
-            )
-            get_slack_patch.assert_called_once_with(
-                fake_monitoring_overrides, fake_service, fake_soa_dir
-            )
-            get_page_patch.assert_called_once_with(
-                fake_monitoring_overrides, fake_service, fake_soa_dir
+            get_service_monitoring_settings_patch.assert_called_once_with(
+                fake_service, fake_soa_dir
             )
             pysensu_yelp_send_event_patch.assert_called_once_with(**expected_kwargs)
             load_system_paasta_config_patch.return_value.get_cluster.assert_called_once_with()
 
+    def test_send_event_overrides(self):
+        with mock.patch(
+            "paasta_tools.monitoring_tools.get_service_monitoring_settings",
+            return_value={
+                key: f"service_{key}" for key in monitoring_tools.EVENT_MONITORING_KEYS
+            },
+            autospec=True,
+        ), mock.patch(
+            "pysensu_yelp.send_event", autospec=True
+        ) as pysensu_yelp_send_event_patch, mock.patch(
+            "paasta_tools.monitoring_tools.load_system_paasta_config", autospec=True
+        ):
+            monitoring_tools.send_event(
+                "fake_service",
+                "fake_check_name",
+                {"team": "override_team", "page": False},
+                0,
+                "output",
+                "/fake/soa/dir",
+                cluster="fake_cluster",
+            )
+            monitoring_tools.flush_events()
+
+        _, kwargs = pysensu_yelp_send_event_patch.call_args
+        assert kwargs["team"] == "override_team"
+        assert kwargs["page"] is False
+        assert kwargs["tip"] == "service_tip"
+
     def test_send_event_sensu_host_is_None(self):
         fake_service = "fake_service"
         fake_monitoring_overrides = {}
@@ -424,19 +420,11 @@ class TestMonitoring_Tools:
         fake_sensu_port = 12345
 
         with mock.patch(
-            "paasta_tools.monitoring_tools.get_team", autospec=True
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_tip", autospec=True
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_notification_email", autospec=True
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_irc_channels", autospec=True
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_ticket", autospec=True
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_project", autospec=True
-        ), mock.patch(
-            "paasta_tools.monitoring_tools.get_page", autospec=True
+            "paasta_tools.monitoring_tools.get_service_monitoring_settings",
+            return_value={
+                key: mock.Mock() for key in monitoring_tools.EVENT_MONITORING_KEYS
+            },
+            autospec=True,
         ), mock.patch(
             "pysensu_yelp.send_event", autospec=True
         ) as pysensu_yelp_send_event_patch, mock.patch(
@@ -457,6 +445,7 @@ class TestMonitoring_Tools:
                 fake_output,
                 fake_soa_dir,
             )
+            monitoring_tools.flush_events()
 
             assert pysensu_yelp_send_event_patch.call_count == 0
 
@@ -1216,3 +1205,92 @@ def test_send_replication_event_if_under_replication_critical(instance_config):
                 instance_config.cluster,
             )
         ) in send_event_kwargs["description"]
+
+
+def test_get_service_monitoring_settings_is_memoized():
+    with mock.patch(
+        "paasta_tools.monitoring_tools.cached_read_service_configuration",
+        autospec=True,
+        return_value={"monitoring": {"team": "service_team"}},
+    ) as mock_read_service_configuration, mock.patch(
+        "paasta_tools.monitoring_tools.read_monitoring_config",
+        autospec=True,
+        return_value={"tip": "a_tip"},
+    ) as mock_read_monitoring_config:
+        for _ in range(10):
+            settings = monitoring_tools.get_service_monitoring_settings(
+                "fake_service", "/fake/soa/dir"
+            )
+
+    assert settings["team"] == "service_team"
+    assert settings["tip"] == "a_tip"
+    assert settings["tags"] == []
+    assert set(settings) == set(monitoring_tools.EVENT_MONITORING_KEYS)
+    assert mock_read_service_configuration.call_count == len(
+        monitoring_tools.EVENT_MONITORING_KEYS
+    )
+    assert mock_read_monitoring_config.call_count == len(
+        monitoring_tools.EVENT_MONITORING_KEYS
+    )
+
+
+def test_sensu_event_sender():
+    sender = monitoring_tools.SensuEventSender(max_workers=2, max_queue_size=5)
+    events = [
+        {
+            "name": f"check_{i}",
+            "runbook": "y/runbook",
+            "status": 0,
+            "output": "ok",
+            "team": "a_team",
+        }
+        for i in range(20)
+    ]
+    with mock.patch(
+        "pysensu_yelp.send_event", autospec=True
+    ) as pysensu_yelp_send_event_patch:
+        pysensu_yelp_send_event_patch.side_effect = lambda name, **kwargs: (
+            None if name != "check_3" else 1 / 0
+        )
+        for event in events:
+            sender.send(event)
+        sender.flush()
+
+    assert len(sender.workers) == 2
+    assert sorted(
+        call[1]["name"] for call in pysensu_yelp_send_event_patch.call_args_list
+    ) == sorted(event["name"] for event in events)
+    assert sender.sent == 19
+    assert sender.failed == 1
+
+
+def test_sensu_event_sender_flush_gives_up_at_deadline():
+    sender = monitoring_tools.SensuEventSender(max_workers=1, max_queue_size=5)
+    release = threading.Event()
+    with mock.patch(
+        "pysensu_yelp.send_event", autospec=True
+    ) as pysensu_yelp_send_event_patch, mock.patch.object(
+        monitoring_tools.log, "warning", autospec=True
+    ) as mock_warning:
+        pysensu_yelp_send_event_patch.side_effect = lambda **kwargs: release.wait(5)
+        for i in range(3):
+            sender.send(
+                {
+                    "name": f"check_{i}",
+                    "runbook": "y/runbook",
+                    "status": 0,
+                    "output": "ok",
+                    "team": "a_team",
+                }
+            )
+        assert sender.flush(timeout_s=0.01) is False
+        assert "3 events were not sent" in mock_warning.call_args[0][0]
+
+        release.set()
+        assert sender.flush() is True
+    assert sender.sent == 3
+
+
+def test_flush_events_without_sender():
+    with mock.patch.object(monitoring_tools, "_event_sender", None):
+        monitoring_tools.flush_events()
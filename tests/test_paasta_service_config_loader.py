@@ -11,13 +11,19 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
 from unittest.mock import patch
 
+import yaml
+
 from paasta_tools.adhoc_tools import AdhocJobConfig
 from paasta_tools.adhoc_tools import load_adhoc_job_config
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
+from paasta_tools.paasta_service_config_loader import _merge_with_shared_defaults
 from paasta_tools.utils import DeploymentsJsonV2
+from paasta_tools.utils import SystemPaastaConfig
+from paasta_tools.utils import load_v2_deployments_json
 
 TEST_SERVICE_NAME = "example_happyhour"
 TEST_SOA_DIR = "fake_soa_dir"
@@ -333,3 +339,108 @@ def test_old_and_new_ways_load_the_same_adhoc_configs(
         ),
     ]
     assert list(s.instance_configs(TEST_CLUSTER_NAME, AdhocJobConfig)) == expected
+
+
+def test_merge_with_shared_defaults():
+    defaults = {
+        "env": {"A": "1", "B": "2"},
+        "monitoring": {"team": "foo"},
+        "deploy_group": "prod.everything",
+    }
+    overrides = {"env": {"B": "3"}, "deploy_group": "{cluster}.canary"}
+
+    merged = _merge_with_shared_defaults(overrides=overrides, defaults=defaults)
+
+    assert merged == {
+        "env": {"A": "1", "B": "3"},
+        "monitoring": {"team": "foo"},
+        "deploy_group": "{cluster}.canary",
+    }
+    # untouched subtrees are shared rather than copied...
+    assert merged["monitoring"] is defaults["monitoring"]
+    # ...while anything on an overridden path leaves the defaults alone
+    assert merged is not defaults
+    assert defaults["env"] == {"A": "1", "B": "2"}
+    assert defaults["deploy_group"] == "prod.everything"
+
+
+def test_instance_configs_constructs_each_config_once(tmp_path):
+    """Loads a synthetic service with a few thousand instances and checks that
+    each config is only constructed once (and deployments.json only parsed
+    once)."""
+    num_instances = 3000
+    service_dir = tmp_path / TEST_SERVICE_NAME
+    service_dir.mkdir()
+    (service_dir / "service.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "description": "synthetic service",
+                "env": {f"VAR_{i}": str(i) for i in range(50)},
+                "monitoring": {"team": "perf", "page": False},
+            }
+        )
+    )
+    (service_dir / f"kubernetes-{TEST_CLUSTER_NAME}.yaml").write_text(
+        yaml.safe_dump(
+            {
+                f"instance{i}": {
+                    "deploy_group": "{cluster}.everything",
+                    "cpus": 0.1,
+                    "env": {"INSTANCE_NUM": str(i)},
+                }
+                for i in range(num_instances)
+            }
+        )
+    )
+    (service_dir / "deployments.json").write_text(
+        json.dumps(
+            {
+                "v2": {
+                    "deployments": {
+                        f"{TEST_CLUSTER_NAME}.everything": {
+                            "docker_image": "some_image",
+                            "git_sha": "some_sha",
+                            "image_version": None,
+                        },
+                    },
+                    "controls": {
+                        f"{TEST_SERVICE_NAME}:{TEST_CLUSTER_NAME}.instance{i}": {
+                            "desired_state": "start",
+                            "force_bounce": None,
+                        }
+                        for i in range(num_instances)
+                    },
+                }
+            }
+        )
+    )
+
+    loader = PaastaServiceConfigLoader(service=TEST_SERVICE_NAME, soa_dir=str(tmp_path))
+    with patch.object(
+        KubernetesDeploymentConfig,
+        "__init__",
+        side_effect=KubernetesDeploymentConfig.__init__,
+        autospec=True,
+    ) as mock_init, patch(
+        "paasta_tools.paasta_service_config_loader.load_v2_deployments_json",
+        autospec=True,
+        side_effect=load_v2_deployments_json,
+    ) as mock_load_deployments_json, patch(
+        "paasta_tools.utils.load_system_paasta_config",
+        autospec=True,
+        return_value=SystemPaastaConfig({}, "/fake/dir"),
+    ):
+        configs = list(
+            loader.instance_configs(TEST_CLUSTER_NAME, KubernetesDeploymentConfig)
+        )
+
+    assert len(configs) == num_instances
+    assert mock_init.call_count == num_instances
+    assert mock_load_deployments_json.call_count == 1
+
+    config = next(c for c in configs if c.get_instance() == "instance123")
+    assert config.get_deploy_group() == f"{TEST_CLUSTER_NAME}.everything"
+    assert config.get_docker_image() == "some_image"
+    assert config.config_dict["env"]["VAR_7"] == "7"
+    assert config.config_dict["env"]["INSTANCE_NUM"] == "123"
+    assert config.config_dict["monitoring"] is configs[0].config_dict["monitoring"]
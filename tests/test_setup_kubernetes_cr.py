@@ -226,11 +226,16 @@ def test_setup_custom_resources():
     with mock.patch(
         "paasta_tools.setup_kubernetes_cr.list_custom_resources", autospec=True
     ) as mock_list_cr, mock.patch(
-        "paasta_tools.setup_kubernetes_cr.reconcile_kubernetes_resource", autospec=True
-    ) as mock_reconcile_kubernetes_resource:
+        "paasta_tools.setup_kubernetes_cr.get_custom_resource_changes", autospec=True
+    ) as mock_get_custom_resource_changes, mock.patch(
+        "paasta_tools.setup_kubernetes_cr.apply_custom_resource_changes",
+        autospec=True,
+    ) as mock_apply_custom_resource_changes:
         mock_client = mock.Mock()
         mock_kind = mock.Mock()
         mock_crd = mock.Mock()
+        mock_list_cr.return_value = []
+        mock_apply_custom_resource_changes.return_value = True
         assert setup_kubernetes_cr.setup_custom_resources(
             kube_client=mock_client,
             kind=mock_kind,
@@ -240,8 +245,12 @@ def test_setup_custom_resources():
             cluster="mycluster",
             crd=mock_crd,
         )
+        assert not mock_list_cr.called
 
-        mock_reconcile_kubernetes_resource.side_effect = [True, False]
+        mock_get_custom_resource_changes.side_effect = [
+            (["kurupt_change"], True),
+            ([], False),
+        ]
         assert not setup_kubernetes_cr.setup_custom_resources(
             kube_client=mock_client,
             kind=mock_kind,
@@ -252,7 +261,11 @@ def test_setup_custom_resources():
             crd=mock_crd,
         )
 
-        mock_reconcile_kubernetes_resource.side_effect = [True, True]
+        mock_get_custom_resource_changes.reset_mock()
+        mock_get_custom_resource_changes.side_effect = [
+            (["kurupt_change"], True),
+            (["mc_change"], True),
+        ]
         assert setup_kubernetes_cr.setup_custom_resources(
             kube_client=mock_client,
             kind=mock_kind,
@@ -262,29 +275,27 @@ def test_setup_custom_resources():
             cluster="mycluster",
             crd=mock_crd,
         )
-        mock_reconcile_kubernetes_resource.assert_has_calls(
+        mock_get_custom_resource_changes.assert_has_calls(
             [
                 mock.call(
-                    kube_client=mock_client,
                     service="kurupt",
                     instance_configs="something",
                     cluster="mycluster",
                     instance=None,
                     kind=mock_kind,
-                    custom_resources=mock_list_cr.return_value,
+                    custom_resources=mock.ANY,
                     version="v1",
                     group="yelp.com",
                     crd=mock_crd,
                     soa_dir="/nail/etc/services",
                 ),
                 mock.call(
-                    kube_client=mock_client,
                     service="mc",
                     instance_configs="another",
                     cluster="mycluster",
                     instance=None,
                     kind=mock_kind,
-                    custom_resources=mock_list_cr.return_value,
+                    custom_resources=mock.ANY,
                     version="v1",
                     group="yelp.com",
                     crd=mock_crd,
@@ -292,6 +303,112 @@ def test_setup_custom_resources():
                 ),
             ]
         )
+        # the existing resources are listed and indexed once per kind
+        first_index = mock_get_custom_resource_changes.call_args_list[0][1][
+            "custom_resources"
+        ]
+        second_index = mock_get_custom_resource_changes.call_args_list[1][1][
+            "custom_resources"
+        ]
+        assert first_index is second_index
+        assert isinstance(first_index, setup_kubernetes_cr.CustomResourceIndex)
+        mock_apply_custom_resource_changes.assert_called_with(
+            kube_client=mock_client,
+            changes=["kurupt_change", "mc_change"],
+            kind=mock_kind,
+            version="v1",
+            group="yelp.com",
+            max_workers=setup_kubernetes_cr.DEFAULT_MAX_WORKERS,
+        )
+
+        mock_apply_custom_resource_changes.return_value = False
+        mock_get_custom_resource_changes.side_effect = [
+            (["kurupt_change"], True),
+        ]
+        assert not setup_kubernetes_cr.setup_custom_resources(
+            kube_client=mock_client,
+            kind=mock_kind,
+            version="v1",
+            config_dicts={"kurupt": "something"},
+            group="yelp.com",
+            cluster="mycluster",
+            crd=mock_crd,
+        )
+
+
+def test_custom_resource_index():
+    existing = KubeCustomResource(
+        service="kurupt",
+        instance="fm",
+        config_sha="conf123",
+        git_sha="git123",
+        kind="flink",
+        name="kurupt-fm",
+        namespace="paasta-flinks",
+    )
+    index = setup_kubernetes_cr.CustomResourceIndex([existing])
+    assert index.exists("kurupt", "fm", "flink")
+    assert not index.exists("kurupt", "other", "flink")
+    assert existing in index
+    assert existing._replace(config_sha="conf456") not in index
+
+
+def test_apply_custom_resource_changes():
+    def make_change(action, instance):
+        return setup_kubernetes_cr.CustomResourceChange(
+            action=action,
+            desired_resource=KubeCustomResource(
+                service="kurupt",
+                instance=instance,
+                config_sha="conf123",
+                git_sha="git123",
+                kind="flink",
+                name=f"kurupt-{instance}",
+                namespace="paasta-flinks",
+            ),
+            formatted_resource={"instance": instance},
+        )
+
+    with mock.patch(
+        "paasta_tools.setup_kubernetes_cr.create_custom_resource", autospec=True
+    ) as mock_create_custom_resource, mock.patch(
+        "paasta_tools.setup_kubernetes_cr.update_custom_resource", autospec=True
+    ) as mock_update_custom_resource:
+        mock_client = mock.Mock()
+        mock_kind = mock.Mock(singular="flink", plural="flinks")
+        assert setup_kubernetes_cr.apply_custom_resource_changes(
+            kube_client=mock_client,
+            changes=[make_change("create", "new"), make_change("update", "old")],
+            kind=mock_kind,
+            version="v1",
+            group="yelp.com",
+            max_workers=2,
+        )
+        mock_create_custom_resource.assert_called_once_with(
+            kube_client=mock_client,
+            version="v1",
+            kind=mock_kind,
+            formatted_resource={"instance": "new"},
+            group="yelp.com",
+        )
+        mock_update_custom_resource.assert_called_once_with(
+            kube_client=mock_client,
+            name="kurupt-old",
+            version="v1",
+            kind=mock_kind,
+            formatted_resource={"instance": "old"},
+            group="yelp.com",
+        )
+
+        mock_update_custom_resource.side_effect = Exception
+        assert not setup_kubernetes_cr.apply_custom_resource_changes(
+            kube_client=mock_client,
+            changes=[make_change("create", "new"), make_change("update", "old")],
+            kind=mock_kind,
+            version="v1",
+            group="yelp.com",
+        )
+        assert mock_create_custom_resource.call_count == 2
 
 
 def test_format_custom_resource():
@@ -49,7 +49,10 @@ from paasta_tools.setup_prometheus_adapter_config import (
 from paasta_tools.setup_prometheus_adapter_config import (
     create_shared_worker_load_scaling_rule,
 )
+from paasta_tools.setup_prometheus_adapter_config import diff_prometheus_adapter_configs
 from paasta_tools.setup_prometheus_adapter_config import get_rules_for_service_instance
+from paasta_tools.setup_prometheus_adapter_config import load_rule_cache
+from paasta_tools.setup_prometheus_adapter_config import save_rule_cache
 
 LABEL_MATCHERS = "<<.LabelMatchers>>"
 
@@ -557,6 +560,105 @@ def test_create_prometheus_adapter_config_shared_rules_multiple_windows() -> Non
     assert names == {"worker-load-prom-1800", "worker-load-prom-300"}
 
 
+def test_create_prometheus_adapter_config_rule_cache() -> None:
+    active_requests = _make_instance_config(
+        METRICS_PROVIDER_ACTIVE_REQUESTS, 300, instance="inst1"
+    )
+    with mock.patch(
+        "paasta_tools.setup_prometheus_adapter_config.get_services_for_cluster",
+        autospec=True,
+        return_value=[("svc_a", "inst1")],
+    ), mock.patch(
+        "paasta_tools.setup_prometheus_adapter_config.PaastaServiceConfigLoader",
+        autospec=True,
+    ) as mock_loader_cls, mock.patch(
+        "paasta_tools.setup_prometheus_adapter_config.load_system_paasta_config",
+        autospec=True,
+    ) as mock_load_system_paasta_config, mock.patch(
+        "paasta_tools.setup_prometheus_adapter_config.get_rules_for_service_instance",
+        autospec=True,
+        return_value=[{"name": {"as": "svc_a-inst1-active-requests-prom"}}],
+    ) as mock_get_rules_for_service_instance:
+        mock_system_paasta_config = mock_load_system_paasta_config.return_value
+        mock_system_paasta_config.get_use_raw_ksm_queries.return_value = False
+        # only return the instance for one of the k8s instance types
+        mock_loader_cls.return_value.instance_configs.side_effect = lambda **kwargs: (
+            [active_requests]
+            if kwargs["instance_type_class"] is KubernetesDeploymentConfig
+            else []
+        )
+        rule_cache = {"svc_gone.main": {"hash": "confignope", "rules": []}}
+
+        uncached_config = create_prometheus_adapter_config(
+            "test_cluster", Path("/fake/soa")
+        )
+        assert mock_get_rules_for_service_instance.call_count == 1
+
+        config = create_prometheus_adapter_config(
+            "test_cluster", Path("/fake/soa"), rule_cache=rule_cache
+        )
+        assert config == uncached_config
+        assert mock_get_rules_for_service_instance.call_count == 2
+        assert set(rule_cache) == {"svc_a.inst1"}
+
+        # nothing changed: the cached rules get reused
+        assert (
+            create_prometheus_adapter_config(
+                "test_cluster", Path("/fake/soa"), rule_cache=rule_cache
+            )
+            == config
+        )
+        assert mock_get_rules_for_service_instance.call_count == 2
+
+        # the autoscaling config changed: the rules get re-rendered
+        active_requests.get_registrations.return_value = ["svc_a.other"]
+        create_prometheus_adapter_config(
+            "test_cluster", Path("/fake/soa"), rule_cache=rule_cache
+        )
+        assert mock_get_rules_for_service_instance.call_count == 3
+
+
+def test_load_and_save_rule_cache(tmp_path: Path) -> None:
+    cache_path = tmp_path / "rule_cache.json"
+    assert load_rule_cache(None) == {}
+    assert load_rule_cache(cache_path) == {}
+
+    rule_cache = {
+        "svc.inst": {
+            "hash": "config1234",
+            "rules": [{"name": {"as": "svc-inst-active-requests-prom"}}],
+        }
+    }
+    save_rule_cache(cache_path, rule_cache)
+    assert load_rule_cache(cache_path) == rule_cache
+
+    cache_path.write_text("{not json")
+    assert load_rule_cache(cache_path) == {}
+
+
+def test_diff_prometheus_adapter_configs() -> None:
+    existing = {
+        "rules": [
+            {"name": {"as": "same"}, "metricsQuery": "a"},
+            {"name": {"as": "changed"}, "metricsQuery": "b"},
+            {"name": {"as": "removed"}, "metricsQuery": "c"},
+        ]
+    }
+    desired = {
+        "rules": [
+            {"name": {"as": "added"}, "metricsQuery": "d"},
+            {"name": {"as": "same"}, "metricsQuery": "a"},
+            {"name": {"as": "changed"}, "metricsQuery": "B"},
+        ]
+    }
+    assert diff_prometheus_adapter_configs(existing, desired) == (
+        {"added"},
+        {"removed"},
+        {"changed"},
+    )
+    assert diff_prometheus_adapter_configs(existing, existing) == (set(), set(), set())
+
+
 @pytest.mark.parametrize(
     "query,expected",
     [
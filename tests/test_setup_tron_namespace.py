@@ -4,6 +4,8 @@ from unittest import mock
 from paasta_tools import setup_tron_namespace
 from paasta_tools import spark_tools
 from paasta_tools.kubernetes_tools import KubeClient
+from paasta_tools.tron.client import TronClient
+from paasta_tools.tron.client import TronRequestError
 from paasta_tools.tron_tools import KUBERNETES_NAMESPACE
 from paasta_tools.tron_tools import TronActionConfig
 from paasta_tools.tron_tools import TronJobConfig
@@ -140,3 +142,36 @@ def test_ensure_service_accounts_no_spark_actions_does_not_create_spark_kube_cli
             ],
             any_order=True,
         )
+
+
+def test_update_namespaces_concurrently():
+    mock_client = mock.Mock(spec_set=TronClient)
+
+    def fake_update_namespace(namespace, new_config, current_config=None):
+        if namespace == "broken":
+            raise TronRequestError("config was invalid")
+        if current_config and current_config["hash"] == "unchanged":
+            return None
+        return {"status": "Configuration updated"}
+
+    mock_client.update_namespace.side_effect = fake_update_namespace
+
+    updated, skipped, failed = setup_tron_namespace.update_namespaces_concurrently(
+        client=mock_client,
+        new_configs={
+            "zebra": "a: 1",
+            "broken": "b: 2",
+            "steady": "c: 3",
+            "aardvark": "d: 4",
+        },
+        current_configs={"steady": {"config": "c: 3", "hash": "unchanged"}},
+        max_workers=2,
+    )
+
+    assert updated == ["aardvark", "zebra"]
+    assert skipped == ["steady"]
+    assert failed == ["broken"]
+    mock_client.update_namespace.assert_any_call(
+        "steady", "c: 3", current_config={"config": "c: 3", "hash": "unchanged"}
+    )
+    mock_client.update_namespace.assert_any_call("zebra", "a: 1", current_config=None)
@@ -11,11 +11,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import concurrent.futures
 import datetime
+import io
 import json
 import os
 import stat
 import sys
+import threading
 import time
 import warnings
 from typing import Any
@@ -389,6 +392,137 @@ def test_load_system_paasta_config_duplicate_keys_errors():
             utils.load_system_paasta_config(path="/some/fake/dir")
 
 
+def _write_json(path, value):
+    path.write_text(json.dumps(value))
+
+
+@pytest.fixture(params=["poll", "inotify"])
+def system_paasta_config_watcher(request):
+    watcher = utils.ConfigChangeWatcher(
+        poll_interval_s=60, use_inotify=request.param == "inotify"
+    )
+    with mock.patch.object(utils, "system_paasta_config_watcher", watcher):
+        yield watcher
+
+
+@pytest.fixture
+def inotify_watcher():
+    watcher = utils.ConfigChangeWatcher()
+    with mock.patch.object(utils, "system_paasta_config_watcher", watcher):
+        utils.watch_system_paasta_config()
+        yield watcher
+
+
+def test_load_system_paasta_config_polls_by_default(tmp_path):
+    _write_json(tmp_path / "cluster.json", {"cluster": "a"})
+    watcher = utils.ConfigChangeWatcher(poll_interval_s=10)
+
+    with mock.patch.object(
+        utils, "system_paasta_config_watcher", watcher
+    ), mock.patch.object(utils.time, "monotonic", autospec=True) as mock_monotonic:
+        mock_monotonic.return_value = 100
+        assert utils.load_system_paasta_config(str(tmp_path)).get_cluster() == "a"
+        _write_json(tmp_path / "cluster.json", {"cluster": "b"})
+        mock_monotonic.return_value = 109
+        with mock.patch.object(utils.os, "stat", autospec=True) as mock_stat:
+            assert utils.load_system_paasta_config(str(tmp_path)).get_cluster() == "a"
+        assert mock_stat.call_count == 0
+        mock_monotonic.return_value = 111
+        assert utils.load_system_paasta_config(str(tmp_path)).get_cluster() == "b"
+
+    # no inotify instance is used up by one-off commands
+    assert watcher.fd is None
+
+
+def test_load_system_paasta_config_reloads_on_change(tmp_path, inotify_watcher):
+    config_dir = tmp_path / "paasta"
+    config_dir.mkdir()
+    _write_json(config_dir / "cluster.json", {"cluster": "a"})
+    # config files are often symlinks to files managed elsewhere
+    elsewhere = tmp_path / "elsewhere.json"
+    _write_json(elsewhere, {"sensu_host": "a"})
+    (config_dir / "sensu.json").symlink_to(elsewhere)
+
+    def load():
+        return utils.load_system_paasta_config(path=str(config_dir))
+
+    assert load().get_cluster() == "a"
+    assert inotify_watcher.fd is not None
+    with mock.patch(
+        "paasta_tools.utils.get_readable_files_in_glob", autospec=True
+    ) as mock_get_readable_files_in_glob:
+        assert load().get_cluster() == "a"
+    assert mock_get_readable_files_in_glob.call_count == 0
+
+    _write_json(config_dir / "cluster.json", {"cluster": "b"})
+    assert load().get_cluster() == "b"
+
+    _write_json(elsewhere, {"sensu_host": "b"})
+    assert load().get_sensu_host() == "b"
+
+    _write_json(config_dir / "registry.json", {"docker_registry": "c"})
+    assert load().get_system_docker_registry() == "c"
+
+    (config_dir / "registry.json").unlink()
+    with raises(utils.PaastaNotConfiguredError):
+        load().get_system_docker_registry()
+
+
+def test_load_system_paasta_config_polls_without_inotify(tmp_path):
+    _write_json(tmp_path / "cluster.json", {"cluster": "a"})
+    watcher = utils.ConfigChangeWatcher(poll_interval_s=10, use_inotify=True)
+    # as if inotify_init() had failed
+    watcher.pid = os.getpid()
+
+    with mock.patch.object(
+        utils, "system_paasta_config_watcher", watcher
+    ), mock.patch.object(utils.time, "monotonic", autospec=True) as mock_monotonic:
+        mock_monotonic.return_value = 100
+        assert utils.load_system_paasta_config(str(tmp_path)).get_cluster() == "a"
+        _write_json(tmp_path / "cluster.json", {"cluster": "b"})
+        mock_monotonic.return_value = 109
+        assert utils.load_system_paasta_config(str(tmp_path)).get_cluster() == "a"
+        mock_monotonic.return_value = 111
+        assert utils.load_system_paasta_config(str(tmp_path)).get_cluster() == "b"
+
+
+def test_config_change_watcher_starts_over_after_fork(tmp_path):
+    watcher = utils.ConfigChangeWatcher(use_inotify=True)
+    assert watcher.watch("key", [str(tmp_path)])
+    assert watcher.is_fresh("key")
+    with mock.patch.object(utils.os, "getpid", autospec=True, return_value=-1):
+        assert not watcher.is_fresh("key")
+
+
+def test_load_system_paasta_config_benchmark(tmp_path, system_paasta_config_watcher):
+    """Benchmark-ish: once loaded, an unchanged config shouldn't cost any
+    filesystem access, let alone the stat()s of every file we used to do."""
+    for i in range(10):
+        _write_json(tmp_path / f"{i}.json", {f"key_{i}": i})
+    path = str(tmp_path)
+    runs = 1000
+
+    def load_uncached():
+        system_paasta_config_watcher.forget(path)
+        utils.load_system_paasta_config(path=path)
+
+    utils.load_system_paasta_config(path=path)
+    with mock.patch.object(utils.os, "stat", autospec=True) as mock_stat:
+        start = time.perf_counter()
+        for _ in range(runs):
+            utils.load_system_paasta_config(path=path)
+        cached = (time.perf_counter() - start) / runs
+    assert mock_stat.call_count == 0
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        load_uncached()
+    uncached = (time.perf_counter() - start) / runs
+
+    # generous, to avoid flakiness - this is ~30x on a laptop
+    assert cached * 5 < uncached, f"cached: {cached:.6f}s, uncached: {uncached:.6f}s"
+
+
 def test_SystemPaastaConfig_get_cluster():
     fake_config = utils.SystemPaastaConfig({"cluster": "peanut"}, "/some/fake/dir")
     expected = "peanut"
@@ -593,7 +727,7 @@ def test_SystemPaastaConfig_get_cluster_fqdn_format():
 
 def test_SystemPaastaConfig_get_ecosystem_for_cluster():
     with mock.patch(
-        "paasta_tools.utils.convert_location_type", autospec=True
+        "environment_tools.type_utils.convert_location_type", autospec=True
     ) as mock_convert_location_type:
         # Mock convert_location_type to return the expected ecosystem
         mock_convert_location_type.return_value = ["devc"]
@@ -2545,15 +2679,12 @@ class TestFileLogWriter:
     def test_log_makes_exactly_one_write_call(self):
         """We want to make sure that log() makes exactly one call to write, since that's how we ensure atomicity."""
         fake_file = mock.Mock()
-        fake_contextmgr = mock.Mock(
-            __enter__=lambda _self: fake_file, __exit__=lambda _self, t, v, tb: None
-        )
 
         fake_line = "text" * 1000000
 
         with mock.patch(
-            "paasta_tools.utils.io.FileIO", return_value=fake_contextmgr, autospec=True
-        ) as mock_FileIO:
+            "paasta_tools.utils.io.FileIO", return_value=fake_file, autospec=True
+        ) as mock_FileIO, mock.patch("paasta_tools.utils.os.fstat", autospec=True):
             fw = utils.FileLogWriter("/dev/null", flock=False)
 
             with mock.patch(
@@ -2581,15 +2712,13 @@ class TestFileLogWriter:
         fake_file = mock.Mock()
         fake_file.write.side_effect = IOError("hurp durp")
 
-        fake_contextmgr = mock.Mock(
-            __enter__=lambda _self: fake_file, __exit__=lambda _self, t, v, tb: None
-        )
-
         fake_line = "line"
 
         with mock.patch(
-            "paasta_tools.utils.io.FileIO", return_value=fake_contextmgr, autospec=True
-        ), mock.patch("builtins.print", autospec=True) as mock_print, mock.patch(
+            "paasta_tools.utils.io.FileIO", return_value=fake_file, autospec=True
+        ), mock.patch("paasta_tools.utils.os.fstat", autospec=True), mock.patch(
+            "builtins.print", autospec=True
+        ) as mock_print, mock.patch(
             "paasta_tools.utils.format_log_line", return_value=fake_line, autospec=True
         ):
             fw = utils.FileLogWriter("/dev/null", flock=False)
@@ -2610,6 +2739,115 @@ class TestFileLogWriter:
             "Could not log to /dev/null: IOError: hurp durp -- would have logged: line\n",
             "Could not log to /dev/null: OSError: hurp durp -- would have logged: line\n",
         }
+        # the broken file gets closed, so that the next write reopens it
+        assert fake_file.close.call_count == 1
+        assert fw.files == {}
+
+    def test_log_keeps_files_open(self, tmp_path):
+        fw = utils.FileLogWriter(str(tmp_path / "{service}.log"))
+        with mock.patch(
+            "paasta_tools.utils.io.FileIO", wraps=io.FileIO, autospec=False
+        ) as mock_FileIO:
+            for i in range(10):
+                fw.log("service_a", f"line{i}", "build")
+            fw.log("service_b", "line", "build")
+
+        assert mock_FileIO.call_count == 2
+        assert len((tmp_path / "service_a.log").read_text().splitlines()) == 10
+        assert len((tmp_path / "service_b.log").read_text().splitlines()) == 1
+        fw.close()
+        assert fw.files == {}
+
+    def test_log_reopens_rotated_files(self, tmp_path):
+        log_path = tmp_path / "service.log"
+        fw = utils.FileLogWriter(str(log_path))
+        fw.log("service", "before", "build")
+        os.rename(log_path, tmp_path / "service.log.1")
+        fw.log("service", "after rotation", "build")
+        os.remove(log_path)
+        fw.log("service", "after removal", "build")
+        fw.close()
+
+        assert "before" in (tmp_path / "service.log.1").read_text()
+        assert "after rotation" not in (tmp_path / "service.log.1").read_text()
+        assert "after removal" in log_path.read_text()
+
+    def test_log_buffers_up_to_max_bytes(self, tmp_path):
+        log_path = tmp_path / "service.log"
+        fw = utils.FileLogWriter(str(log_path), line_delimiter="", buffer_max_bytes=10)
+        with mock.patch(
+            "paasta_tools.utils.format_log_line",
+            side_effect=lambda level, cluster, service, instance, component, line: line,
+            autospec=True,
+        ):
+            fw.log("service", "12345", "build")
+            fw.log("service", "6789", "build")
+            assert not log_path.exists()
+            fw.log("service", "0", "build")
+            assert log_path.read_text() == "1234567890"
+            fw.log("service", "abc", "build")
+        assert log_path.read_text() == "1234567890"
+
+        fw.close()
+        assert log_path.read_text() == "1234567890abc"
+
+    def test_log_buffers_up_to_max_seconds(self, tmp_path):
+        log_path = tmp_path / "service.log"
+        fw = utils.FileLogWriter(str(log_path), buffer_max_seconds=5)
+        with mock.patch(
+            "paasta_tools.utils.time.monotonic", autospec=True, side_effect=[0, 3, 5]
+        ):
+            fw.log("service", "line1", "build")
+            fw.log("service", "line2", "build")
+            assert not log_path.exists()
+            fw.log("service", "line3", "build")
+        assert len(log_path.read_text().splitlines()) == 3
+        assert fw.buffers == {}
+
+    def test_log_flushes_buffer_on_timer(self, tmp_path):
+        log_path = tmp_path / "service.log"
+        fw = utils.FileLogWriter(str(log_path), buffer_max_seconds=0.01)
+        fw.log("service", "line1", "build")
+        timer = fw.flush_timer
+        assert timer is not None
+        # a second line shouldn't start another timer
+        fw.log("service", "line2", "build")
+        assert fw.flush_timer is timer
+
+        timer.join(timeout=5)
+        assert len(log_path.read_text().splitlines()) == 2
+        assert fw.buffers == {}
+        assert fw.flush_timer is None
+        fw.close()
+
+    def test_log_closes_least_recently_used_files(self, tmp_path):
+        fw = utils.FileLogWriter(str(tmp_path / "{service}.log"), max_open_files=2)
+        for service in ("service_a", "service_b", "service_a", "service_c"):
+            fw.log(service, "line", "build")
+        # service_b's file was the least recently used one, so it got closed
+        assert list(fw.files) == [
+            str(tmp_path / "service_a.log"),
+            str(tmp_path / "service_c.log"),
+        ]
+        fw.log("service_b", "line", "build")
+        assert list(fw.files) == [
+            str(tmp_path / "service_c.log"),
+            str(tmp_path / "service_b.log"),
+        ]
+        fw.close()
+
+        assert len((tmp_path / "service_a.log").read_text().splitlines()) == 2
+        assert len((tmp_path / "service_b.log").read_text().splitlines()) == 2
+        assert len((tmp_path / "service_c.log").read_text().splitlines()) == 1
+
+    def test_forked_child_drops_parents_buffer(self, tmp_path):
+        log_path = tmp_path / "service.log"
+        fw = utils.FileLogWriter(str(log_path), buffer_max_bytes=1024 * 1024)
+        fw.log("service", "from parent", "build")
+        with mock.patch("paasta_tools.utils.os.getpid", autospec=True) as mock_getpid:
+            mock_getpid.return_value = fw.pid + 1
+            fw.flush()
+        assert log_path.exists() is False
 
 
 def test_deep_merge_dictionaries():
@@ -2998,6 +3236,68 @@ class TestGetRollbackTagsForSha:
         assert results == []
 
 
+class TestDeploymentRefIndex:
+    refs = {
+        "refs/heads/master": "f" * 40,
+        "refs/tags/paasta-prod.main-20260420T120000-deploy": "a" * 40,
+        "refs/tags/paasta-prod.main+extra-info-20260421T120000-deploy": "b" * 40,
+        "refs/tags/paasta-prod.main-20260419T120000-deploy": "c" * 40,
+        "refs/tags/paasta-prod.main-20260421T130000-rollback": "b" * 40,
+        "refs/tags/paasta-canary-20260422T120000-deploy": "d" * 40,
+        "refs/tags/paasta-prod.main-20260421T130000-stop": "b" * 40,
+    }
+
+    def test_get_latest_tag(self):
+        index = utils.DeploymentRefIndex(self.refs)
+        assert index.get_latest_tag("prod.main") == utils.DeploymentTag(
+            ref="refs/tags/paasta-prod.main+extra-info-20260421T120000-deploy",
+            sha="b" * 40,
+            deploy_group="prod.main",
+            kind="deploy",
+            timestamp="20260421T120000",
+            image_version="extra-info",
+        )
+        assert index.get_latest_tag("prod.main", kind="rollback").sha == "b" * 40
+        assert index.get_latest_tag("prod") is None
+
+    def test_get_tag_history(self):
+        index = utils.DeploymentRefIndex(self.refs)
+        assert [tag.sha for tag in index.get_tag_history("prod.main")] == [
+            "c" * 40,
+            "a" * 40,
+            "b" * 40,
+        ]
+        assert index.get_tag_history("nope") == []
+
+    def test_contains(self):
+        index = utils.DeploymentRefIndex(self.refs)
+        assert "refs/heads/master" in index
+        assert None not in index
+
+    def test_get_latest_deployment_tag_matches_index(self):
+        index = utils.DeploymentRefIndex(self.refs)
+        expected = (
+            "refs/tags/paasta-prod.main+extra-info-20260421T120000-deploy",
+            "b" * 40,
+            "extra-info",
+        )
+        assert utils.get_latest_deployment_tag(self.refs, "prod.main") == expected
+        assert utils.get_latest_deployment_tag(index, "prod.main") == expected
+        assert utils.get_latest_deployment_tag(index, "other") == (None, None, None)
+
+    def test_get_rollback_tags_for_sha_matches_index(self):
+        index = utils.DeploymentRefIndex(self.refs)
+        expected = [
+            ("refs/tags/paasta-prod.main-20260421T130000-rollback", "20260421T130000")
+        ]
+        assert (
+            utils.get_rollback_tags_for_sha(self.refs, "prod.main", "b" * 40)
+            == expected
+        )
+        assert utils.get_rollback_tags_for_sha(index, "prod.main", "b" * 40) == expected
+        assert utils.get_rollback_tags_for_sha(index, "prod.main", "a" * 40) == []
+
+
 class TestGetDefaultBounceOverprovisionFactor:
     def test_returns_configured_value_with_percent(self):
         config = SystemPaastaConfig(
@@ -3024,3 +3324,128 @@ def test_SystemPaastaConfig_get_enable_cost_owner_label_enabled():
         {"enable_cost_owner_label": True}, "/some/fake/dir"
     )
     assert fake_config.get_enable_cost_owner_label() is True
+
+
+def test_single_flight_ttl_cache_single_flight():
+    cache = utils.SingleFlightTTLCache(ttl=60)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "snapshot"
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(cache.get, "key", fetch) for _ in range(8)]
+        assert started.wait(timeout=5)
+        assert not cache.is_cached("key")
+        release.set()
+        results = [f.result(timeout=5) for f in futures]
+
+    assert results == ["snapshot"] * 8
+    assert len(calls) == 1
+    assert cache.is_cached("key")
+
+
+def test_single_flight_ttl_cache_does_not_cache_errors():
+    cache = utils.SingleFlightTTLCache(ttl=60)
+    fetch = mock.Mock(side_effect=[ValueError("nope"), "snapshot"])
+
+    with pytest.raises(ValueError):
+        cache.get("key", fetch)
+    assert not cache.is_cached("key")
+    assert cache.get("key", fetch) == "snapshot"
+    assert cache.get("key", fetch) == "snapshot"
+    assert fetch.call_count == 2
+
+
+def test_time_cache_computes_once_under_contention():
+    num_threads = 16
+    barrier = threading.Barrier(num_threads, timeout=5)
+    release = threading.Event()
+    calls = []
+
+    @utils.time_cache(ttl=60)
+    def slow(x):
+        calls.append(x)
+        release.wait(timeout=5)
+        return x * 2
+
+    def call():
+        barrier.wait()
+        return slow(21)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+        futures = [executor.submit(call) for _ in range(num_threads)]
+        # give everyone a chance to pile up behind the first caller
+        barrier_passed = concurrent.futures.wait(futures, timeout=0.2)
+        assert not barrier_passed.done
+        release.set()
+        results = [f.result(timeout=5) for f in futures]
+
+    assert results == [42] * num_threads
+    assert calls == [21]
+    stats = slow.cache_stats()
+    assert stats.misses == 1
+    assert stats.hits == num_threads - 1
+
+
+def test_time_cache_ttl():
+    mock_f = mock.Mock(side_effect=lambda x: object())
+    cached = utils.time_cache(ttl=5)(mock_f)
+
+    with freeze_time("2026-01-01 00:00:00") as frozen:
+        first = cached(1)
+        assert cached(1) is first
+        frozen.tick(6)
+        assert cached(1) is not first
+        # per-call ttl overrides the decorator's
+        assert cached(1, ttl=0) is not cached(1)
+    assert mock_f.call_count == 3
+
+
+def test_time_cache_lru_eviction():
+    mock_f = mock.Mock(side_effect=lambda x: x)
+    cached = utils.time_cache(ttl=60, maxsize=2)(mock_f)
+
+    cached(1)
+    cached(2)
+    cached(1)  # 1 is now more recently used than 2
+    cached(3)  # so 2 gets evicted
+    cached(1)
+    assert mock_f.call_count == 3
+    cached(2)
+    assert mock_f.call_count == 4
+
+    assert cached.cache_stats() == utils.TimeCacheStats(
+        hits=2, misses=4, evictions=2, currsize=2, maxsize=2
+    )
+
+
+def test_time_cache_invalidate():
+    mock_f = mock.Mock(side_effect=lambda x, y=None: object())
+    cached = utils.time_cache(ttl=60)(mock_f)
+
+    a = cached(1, y=2)
+    b = cached(3)
+    cached.invalidate(1, y=2)
+    assert cached(1, y=2) is not a
+    assert cached(3) is b
+
+    cached.cache_clear()
+    assert cached(3) is not b
+    assert mock_f.call_count == 4
+
+
+def test_time_cache_does_not_cache_exceptions():
+    mock_f = mock.Mock(side_effect=[ValueError("nope"), "value"])
+    cached = utils.time_cache(ttl=60)(mock_f)
+
+    with raises(ValueError):
+        cached()
+    assert cached() == "value"
+    assert cached() == "value"
+    assert mock_f.call_count == 2
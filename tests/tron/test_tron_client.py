@@ -5,14 +5,15 @@ import pytest
 
 from paasta_tools.tron.client import TronClient
 from paasta_tools.tron.client import TronRequestError
+from paasta_tools.tron.client import get_config_content_hash
 
 
 @pytest.fixture
-def mock_requests():
-    with mock.patch(
-        "paasta_tools.tron.client.requests", autospec=True
-    ) as mock_requests:
-        yield mock_requests
+def mock_session():
+    with mock.patch.object(
+        TestTronClient.client, "session", autospec=True
+    ) as mock_session:
+        yield mock_session
 
 
 class TestTronClient:
@@ -20,21 +21,21 @@ class TestTronClient:
     tron_url = "http://tron.test:9000"
     client = TronClient(tron_url)
 
-    def test_get(self, mock_requests):
+    def test_get(self, mock_session):
         response = self.client._get("/some/thing", {"check": 1})
-        assert response == mock_requests.get.return_value.json.return_value
-        mock_requests.get.assert_called_once_with(
+        assert response == mock_session.get.return_value.json.return_value
+        mock_session.get.assert_called_once_with(
             headers=mock.ANY, url=self.tron_url + "/some/thing", params={"check": 1}
         )
 
-    def test_post(self, mock_requests):
+    def test_post(self, mock_session):
         response = self.client._post("/some/thing", {"check": 1})
-        assert response == mock_requests.post.return_value.json.return_value
-        mock_requests.post.assert_called_once_with(
+        assert response == mock_session.post.return_value.json.return_value
+        mock_session.post.assert_called_once_with(
             headers=mock.ANY, url=self.tron_url + "/some/thing", data={"check": 1}
         )
 
-    def test_post_auth(self, mock_requests):
+    def test_post_auth(self, mock_session):
         with mock.patch(
             "paasta_tools.tron.client.get_service_auth_token",
             autospec=True,
@@ -47,9 +48,9 @@ class TestTronClient:
         ):
             mock_get_token.return_value = "sup3rs3cr3t"
             response = self.client._post("/some/auth/thing", {"foo": "bar"})
-            assert response == mock_requests.post.return_value.json.return_value
+            assert response == mock_session.post.return_value.json.return_value
             mock_get_token.assert_called_once_with()
-            mock_requests.post.assert_called_once_with(
+            mock_session.post.assert_called_once_with(
                 headers={
                     "User-Agent": mock_get_ua.return_value,
                     "Authorization": "Bearer sup3rs3cr3t",
@@ -59,42 +60,42 @@ class TestTronClient:
             )
 
     @pytest.mark.parametrize("okay_status", [True, False])
-    def test_returned_error_message(self, mock_requests, okay_status):
-        mock_requests.post.return_value.ok = okay_status
-        mock_requests.post.return_value.json.return_value = {
+    def test_returned_error_message(self, mock_session, okay_status):
+        mock_session.post.return_value.ok = okay_status
+        mock_session.post.return_value.json.return_value = {
             "error": "config was invalid"
         }
         with pytest.raises(TronRequestError, match="config was invalid"):
             self.client._post("/api/test")
 
-    def test_unexpected_error(self, mock_requests):
-        mock_requests.get.return_value.ok = False
-        mock_requests.get.return_value.text = "Server error"
-        mock_requests.get.return_value.json.side_effect = ValueError
+    def test_unexpected_error(self, mock_session):
+        mock_session.get.return_value.ok = False
+        mock_session.get.return_value.text = "Server error"
+        mock_session.get.return_value.json.side_effect = ValueError
         with pytest.raises(TronRequestError):
             self.client._get("/some/thing")
 
-    def test_okay_not_json(self, mock_requests):
-        mock_requests.get.return_value.ok = True
-        mock_requests.get.return_value.text = "Hi, you have reached Tron."
-        mock_requests.get.return_value.json.side_effect = ValueError
+    def test_okay_not_json(self, mock_session):
+        mock_session.get.return_value.ok = True
+        mock_session.get.return_value.text = "Hi, you have reached Tron."
+        mock_session.get.return_value.json.side_effect = ValueError
         assert self.client._get("/some/thing") == "Hi, you have reached Tron."
 
-    def test_update_namespace(self, mock_requests):
+    def test_update_namespace(self, mock_session):
         new_config = "yaml: stuff"
-        mock_requests.get.return_value.json.return_value = {
+        mock_session.get.return_value.json.return_value = {
             "config": "old: things",
             "hash": "01abcd",
         }
         self.client.update_namespace("some_service", new_config)
 
-        assert mock_requests.get.call_count == 1
-        _, kwargs = mock_requests.get.call_args
+        assert mock_session.get.call_count == 1
+        _, kwargs = mock_session.get.call_args
         assert kwargs["url"] == self.tron_url + "/api/config"
         assert kwargs["params"] == {"name": "some_service", "no_header": 1}
 
-        assert mock_requests.post.call_count == 1
-        _, kwargs = mock_requests.post.call_args
+        assert mock_session.post.call_count == 1
+        _, kwargs = mock_session.post.call_args
         assert kwargs["url"] == self.tron_url + "/api/config"
         assert kwargs["data"] == {
             "name": "some_service",
@@ -104,22 +105,71 @@ class TestTronClient:
         }
 
     @pytest.mark.parametrize("skip_if_unchanged", [True, False])
-    def test_update_namespace_unchanged(self, mock_requests, skip_if_unchanged):
+    def test_update_namespace_unchanged(self, mock_session, skip_if_unchanged):
         new_config = "yaml: stuff"
-        mock_requests.get.return_value.json.return_value = {
+        mock_session.get.return_value.json.return_value = {
             "config": new_config,
             "hash": "01abcd",
         }
         self.client.update_namespace("some_service", new_config, skip_if_unchanged)
-        assert mock_requests.post.call_count == int(not skip_if_unchanged)
+        assert mock_session.post.call_count == int(not skip_if_unchanged)
 
-    def test_list_namespaces(self, mock_requests):
-        mock_requests.get.return_value.json.return_value = {
+    def test_list_namespaces(self, mock_session):
+        mock_session.get.return_value.json.return_value = {
             "jobs": {},
             "namespaces": ["a", "b"],
         }
         assert self.client.list_namespaces() == ["a", "b"]
-        assert mock_requests.get.call_count == 1
-        _, kwargs = mock_requests.get.call_args
+        assert mock_session.get.call_count == 1
+        _, kwargs = mock_session.get.call_args
         assert kwargs["url"] == self.tron_url + "/api"
         assert kwargs["params"] is None
+
+    def test_update_namespace_unchanged_hash(self, mock_session):
+        new_config = "yaml: stuff"
+        current_config = {
+            "config": "this is not even yaml: [",
+            "hash": get_config_content_hash(new_config),
+        }
+        assert (
+            self.client.update_namespace(
+                "some_service", new_config, current_config=current_config
+            )
+            is None
+        )
+        assert mock_session.get.call_count == 0
+        assert mock_session.post.call_count == 0
+
+    def test_update_namespace_equivalent_yaml(self, mock_session):
+        mock_session.get.return_value.json.return_value = {
+            "config": "a: 1\nb: 2\n",
+            "hash": "01abcd",
+        }
+        self.client.update_namespace("some_service", "b: 2\na: 1\n")
+        assert mock_session.post.call_count == 0
+
+    def test_update_namespaces(self, mock_session):
+        unchanged_config = "yaml: stuff"
+        mock_session.get.return_value.json.return_value = {
+            "unchanged": {
+                "config": unchanged_config,
+                "hash": get_config_content_hash(unchanged_config),
+            },
+            "changed": {"config": "old: things", "hash": "01abcd"},
+        }
+        responses = self.client.update_namespaces(
+            {"unchanged": unchanged_config, "changed": "new: things"}
+        )
+
+        assert responses == {
+            "changed": mock_session.post.return_value.json.return_value
+        }
+        assert mock_session.get.call_count == 1
+        assert mock_session.post.call_count == 1
+        _, kwargs = mock_session.post.call_args
+        assert kwargs["data"] == {
+            "name": "changed",
+            "config": "new: things",
+            "hash": "01abcd",
+            "check": 0,
+        }